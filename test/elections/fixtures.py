@@ -25,25 +25,25 @@ EXPECTED_RESPONSE_GET_ELECTION_DETAIL = {
         }
     ],
     "created_at": "2020-02-25T23:21:34+00:00",
+    "closed_at": None,
     "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
     "title": "Movie night in Brooklyn!",
-    "id": "abc123",
 }
 
 EXPECTED_RESPONSE_CREATE_ELECTION = {
     "candidates": [],
     "created_at": "2020-02-25T23:21:34+00:00",
+    "closed_at": None,
     "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
     "title": "Movie night in Brooklyn!",
-    "id": ANY,
 }
 
 EXPECTED_RESPONSE_UPDATE_ELECTION = {
     "candidates": [],
     "created_at": "2020-02-25T23:21:34+00:00",
+    "closed_at": None,
     "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
     "title": "This is an updated test title.",
-    "id": "abc123",
 }
 
 EXPECTED_RESPONSE_GET_ELECTIONS = {
@@ -51,29 +51,30 @@ EXPECTED_RESPONSE_GET_ELECTIONS = {
         {
             "candidates": [],
             "created_at": "2020-02-25T23:21:34+00:00",
+            "closed_at": None,
             "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
             "title": "Movie night in Brooklyn!",
-            "id": "abc123",
         },
         {
             "candidates": [],
             "created_at": "2020-02-25T23:21:34+00:00",
+            "closed_at": None,
             "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
             "title": "Movie night in Brooklyn!",
-            "id": "def456",
         },
-    ]
+    ],
+    "next_cursor": None,
 }
 
 EXPECTED_RESPONSE_CREATE_PARTICIPANT = {
     "candidates": [],
     "created_at": "2020-02-25T23:21:34+00:00",
+    "closed_at": None,
     "participants": [
         {"id": ANY, "is_initiator": False, "name": "Jane"},
         {"id": ANY, "is_initiator": True, "name": "John"},
     ],
     "title": "Movie night in Brooklyn!",
-    "id": "abc123",
 }
 
 EXPECTED_RESPONSE_CREATE_CANDIDATE = {
@@ -87,9 +88,9 @@ EXPECTED_RESPONSE_CREATE_CANDIDATE = {
         }
     ],
     "created_at": "2020-02-25T23:21:34+00:00",
+    "closed_at": None,
     "participants": [{"id": ANY, "is_initiator": True, "name": "John"}],
     "title": "Movie night in Brooklyn!",
-    "id": "abc123",
 }
 
 EXPECTED_RESPONSE_CREATE_VOTE = {
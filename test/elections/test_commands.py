@@ -0,0 +1,194 @@
+import datetime
+from contextlib import contextmanager
+from io import StringIO
+from typing import Callable, Iterator
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from whichflix.elections import builders, manager
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    Election,
+    Participant,
+    Vote,
+)
+from whichflix.users.models import Device
+from test import factories
+
+
+@contextmanager
+def run_after_picking_ids(model: type, callback: Callable[[], None]) -> Iterator:
+    """
+    Runs `callback` once the first ids of `model` have been read, to simulate writes
+    racing with compaction.
+    """
+    fetch_all = QuerySet._fetch_all
+    calls = []
+
+    def fetch_all_then_run(queryset):
+        fetch_all(queryset)
+
+        if queryset.model is model and queryset._fields == ("id",) and not calls:
+            calls.append(queryset)
+            callback()
+
+    with patch.object(QuerySet, "_fetch_all", fetch_all_then_run):
+        yield
+
+
+class TestCompactDeletedRowsCommand(APITestCase):
+    databases = "__all__"
+
+    def tearDown(self):
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    def test_compacts_rows_deleted_before_grace_period(self):
+        now = datetime.datetime.now(tz=timezone.utc)
+        long_ago = now - datetime.timedelta(days=30)
+
+        # Set up election.
+        election = factories.create_election()
+        initiator = election.participants.first()
+        candidate = factories.create_candidate(election, initiator)
+        second_candidate = factories.create_candidate(election, initiator, "604")
+
+        # Set up votes.
+        active_vote = Vote.objects.create(participant=initiator, candidate=candidate)
+        recent_vote = Vote.objects.create(
+            participant=initiator, candidate=second_candidate, deleted_at=now
+        )
+
+        # Set up a participant who left long ago.
+        device = factories.create_device(device_token="def456")
+        departed = factories.create_participant(election, device)
+        Vote.objects.create(participant=departed, candidate=candidate)
+        departed.deleted_at = long_ago
+        departed.save()
+
+        # Set up an old deleted vote.
+        device = factories.create_device(device_token="ghi789")
+        participant = factories.create_participant(election, device)
+        old_vote = Vote.objects.create(
+            participant=participant, candidate=candidate, deleted_at=long_ago
+        )
+
+        stdout = StringIO()
+        call_command(
+            "compact_deleted_rows", "--grace-days=7", "--pause=0", stdout=stdout
+        )
+
+        # Verify output.
+        # The departed participant's vote counts towards the reclaimed votes.
+        self.assertIn("Reclaimed 2 votes.", stdout.getvalue())
+        self.assertIn("Reclaimed 1 participants.", stdout.getvalue())
+
+        # Verify rows in database.
+        self.assertTrue(Vote.objects.filter(id=active_vote.id).exists())
+        self.assertTrue(Vote.objects.filter(id=recent_vote.id).exists())
+        self.assertFalse(Vote.objects.filter(id=old_vote.id).exists())
+        self.assertFalse(Participant.objects.filter(id=departed.id).exists())
+        self.assertTrue(Participant.objects.filter(id=participant.id).exists())
+
+    def test_keeps_participants_who_rejoined_after_being_picked(self):
+        long_ago = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(days=30)
+
+        # Set up a participant who left long ago.
+        election = factories.create_election()
+        initiator = election.participants.first()
+        candidate = factories.create_candidate(election, initiator)
+        device = factories.create_device(device_token="def456")
+        departed = factories.create_participant(election, device)
+        vote = Vote.objects.create(participant=departed, candidate=candidate)
+        departed.deleted_at = long_ago
+        departed.save()
+
+        # The participant rejoins and suggests a movie once they have been picked.
+        def rejoin():
+            Participant.objects.filter(id=departed.id).update(deleted_at=None)
+            factories.create_candidate(election, departed, "604")
+
+        with run_after_picking_ids(Participant, rejoin):
+            reclaimed = manager.compact_deleted_participants(
+                datetime.datetime.now(tz=timezone.utc), 500
+            )
+
+        # Verify the participant and their vote were kept.
+        self.assertEqual(reclaimed, (0, 0))
+        # Verify rows in database.
+        self.assertTrue(Participant.objects.filter(id=departed.id).exists())
+        self.assertTrue(Vote.objects.filter(id=vote.id).exists())
+
+    def test_keeps_votes_cast_again_after_being_picked(self):
+        long_ago = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(days=30)
+
+        # Set up an old deleted vote.
+        election = factories.create_election()
+        initiator = election.participants.first()
+        candidate = factories.create_candidate(election, initiator)
+        vote = Vote.objects.create(
+            participant=initiator, candidate=candidate, deleted_at=long_ago
+        )
+
+        # The vote is cast again once it has been picked.
+        def vote_again():
+            Vote.objects.filter(id=vote.id).update(deleted_at=None)
+
+        with run_after_picking_ids(Vote, vote_again):
+            reclaimed = manager.compact_deleted_votes(
+                datetime.datetime.now(tz=timezone.utc), 500
+            )
+
+        # Verify the vote was kept.
+        self.assertEqual(reclaimed, 0)
+        self.assertTrue(Vote.objects.filter(id=vote.id).exists())
+
+
+class TestArchiveClosedElectionsCommand(APITestCase):
+    databases = "__all__"
+
+    def test_skips_elections_that_fail_to_archive(self):
+        long_ago = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(days=60)
+
+        # Set up closed elections.
+        elections = [
+            factories.create_election(factories.create_device(device_token=token))
+            for token in ["abc123", "def456", "ghi789"]
+        ]
+        Election.objects.update(closed_at=long_ago)
+        failing_election = elections[0]
+        original_build_election_document = builders.build_election_document
+
+        def build_election_document(election, *args):
+            if election.id == failing_election.id:
+                raise ConnectionError()
+
+            return original_build_election_document(election, *args)
+
+        stdout = StringIO()
+
+        with patch(
+            "whichflix.elections.manager.builders.build_election_document",
+            side_effect=build_election_document,
+        ), self.assertLogs("whichflix.elections.manager", level="ERROR"):
+            call_command(
+                "archive_closed_elections", "--batch-size=1", "--pause=0", stdout=stdout
+            )
+
+        # Verify output.
+        self.assertIn("Archived 2 elections.", stdout.getvalue())
+
+        # Verify the failing election was skipped and the rest archived.
+        self.assertTrue(Election.objects.filter(id=failing_election.id).exists())
+        self.assertEqual(
+            set(ArchivedElection.objects.values_list("id", flat=True)),
+            {elections[1].id, elections[2].id},
+        )
@@ -0,0 +1,198 @@
+import json
+from unittest import skipUnless
+from unittest.mock import patch
+
+import fakeredis
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from whichflix.elections import constants, sharding
+from whichflix.elections.models import Candidate, Election, Participant, Vote
+from whichflix.movies import constants as movie_constants
+from whichflix.utils import decode_external_id
+from test.movies import fixtures as movie_fixtures
+
+SHARDS = ["default", "election_shard_1"]
+
+
+@skipUnless(
+    "election_shard_1" in settings.DATABASES, "Requires a second election shard."
+)
+@override_settings(
+    ELECTION_LOGICAL_SHARD_MAP={
+        logical_shard: SHARDS[logical_shard % len(SHARDS)]
+        for logical_shard in range(constants.ELECTION_LOGICAL_SHARD_COUNT)
+    }
+)
+@patch("whichflix.elections.manager.send_event")
+class TestElectionSharding(APITestCase):
+    databases = set(SHARDS)
+
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+        self.redis_mock.set(
+            movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id="603"),
+            json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+        )
+
+    def tearDown(self):
+        # Redis
+        self.redis_patcher.stop()
+
+    def _create_elections(self, count: int, device_token: str) -> list:
+        headers = {"HTTP_X_DEVICE_ID": device_token}
+        data = {"title": "Movie night in Brooklyn!", "initiator_name": "John"}
+
+        return [
+            self.client.post(
+                reverse("elections"), data=data, format="json", **headers
+            ).json()["id"]
+            for _ in range(count)
+        ]
+
+    def test_elections_are_spread_across_shards(self, send_event_mock):
+        external_ids = self._create_elections(6, "abc123")
+
+        # Verify each election and its initiator live on its shard only.
+        election_ids = [decode_external_id(external_id) for external_id in external_ids]
+        shards = {
+            sharding.get_shard_for_id(election_id) for election_id in election_ids
+        }
+        self.assertEqual(shards, set(SHARDS))
+
+        for election_id in election_ids:
+            shard = sharding.get_shard_for_id(election_id)
+            other_shard = next(alias for alias in SHARDS if alias != shard)
+            self.assertTrue(
+                Election.objects.using(shard).filter(id=election_id).exists()
+            )
+            self.assertTrue(
+                Participant.objects.using(shard)
+                .filter(election_id=election_id)
+                .exists()
+            )
+            self.assertFalse(
+                Election.objects.using(other_shard).filter(id=election_id).exists()
+            )
+
+        # Verify listing merges shards in id order.
+        response = self.client.get(
+            reverse("elections"), {"limit": 4}, HTTP_X_DEVICE_ID="abc123"
+        )
+        response_json = response.json()
+        self.assertEqual(
+            [election["id"] for election in response_json["results"]],
+            [external_id for _, external_id in sorted(zip(election_ids, external_ids))][
+                :4
+            ],
+        )
+        self.assertIsNotNone(response_json["next_cursor"])
+
+        response = self.client.get(
+            reverse("elections"), {"view": "summary"}, HTTP_X_DEVICE_ID="abc123"
+        )
+        self.assertEqual(len(response.json()["results"]), 6)
+
+    def test_vote_on_election_in_second_shard(self, send_event_mock):
+        external_ids = self._create_elections(6, "abc123")
+        external_id = next(
+            external_id
+            for external_id in external_ids
+            if sharding.get_shard_for_id(decode_external_id(external_id))
+            == "election_shard_1"
+        )
+        headers = {"HTTP_X_DEVICE_ID": "def456"}
+
+        # Join election.
+        url = reverse("participants", kwargs={"election_id": external_id})
+        response = self.client.post(
+            url, data={"name": "Jane"}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, 201)
+
+        # Add candidate.
+        url = reverse("candidates", kwargs={"election_id": external_id})
+        response = self.client.post(
+            url, data={"movie_id": "603"}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, 201)
+        candidate_id = int(response.json()["candidates"][0]["id"])
+        self.assertEqual(sharding.get_shard_for_id(candidate_id), "election_shard_1")
+
+        # Vote for candidate.
+        url = reverse("votes", kwargs={"candidate_id": candidate_id})
+        response = self.client.post(url, data={}, format="json", **headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["vote_count"], 1)
+
+        # Verify rows in second shard.
+        self.assertTrue(
+            Candidate.objects.using("election_shard_1").filter(id=candidate_id).exists()
+        )
+        self.assertEqual(
+            Vote.objects.using("election_shard_1")
+            .filter(candidate_id=candidate_id)
+            .count(),
+            1,
+        )
+        self.assertFalse(Vote.objects.using("default").exists())
+
+        # Verify the joined election is listed for the device.
+        response = self.client.get(reverse("elections"), **headers)
+        self.assertEqual(
+            [election["id"] for election in response.json()["results"]], [external_id]
+        )
+
+    def test_participant_ids_are_unique_across_shards(self, send_event_mock):
+        external_ids = self._create_elections(6, "abc123")
+
+        for external_id in external_ids:
+            url = reverse("participants", kwargs={"election_id": external_id})
+            self.client.post(
+                url, data={"name": "Jane"}, format="json", HTTP_X_DEVICE_ID="def456"
+            )
+
+        # Verify participants share the logical shard of their election.
+        participants = [
+            participant
+            for shard in SHARDS
+            for participant in Participant.objects.using(shard).all()
+        ]
+        self.assertEqual(len(participants), 12)
+        self.assertEqual(len({participant.id for participant in participants}), 12)
+
+        for participant in participants:
+            self.assertEqual(
+                sharding.get_shard_for_id(participant.id),
+                sharding.get_shard_for_id(participant.election_id),
+            )
+
+
+class TestLogicalShardMap(SimpleTestCase):
+    @override_settings(ELECTION_LOGICAL_SHARD_MAP={5: "election_shard_1"})
+    def test_ids_are_routed_by_their_assigned_logical_shard(self):
+        count = constants.ELECTION_LOGICAL_SHARD_COUNT
+
+        # Verify only ids in the assigned logical shard leave the default database.
+        self.assertEqual(sharding.get_shard_for_id(3 * count + 5), "election_shard_1")
+        self.assertEqual(sharding.get_shard_for_id(3 * count + 6), "default")
+        self.assertEqual(
+            sharding.get_election_shards(), ["default", "election_shard_1"]
+        )
+        self.assertTrue(sharding.is_sharded())
+
+    def test_ids_stay_on_default_database_without_assigned_logical_shards(self):
+        self.assertEqual(sharding.get_shard_for_id(5), "default")
+        self.assertEqual(sharding.get_election_shards(), ["default"])
+        self.assertFalse(sharding.is_sharded())
+        self.assertEqual(sharding.allocate_ids_for_election(5, 2), [None, None])
@@ -2,22 +2,35 @@ import datetime
 import json
 from unittest.mock import patch
 
+import brotli
 import fakeredis
+import requests
 import responses
 from django.urls import reverse
 from django.utils import timezone
 from freezegun import freeze_time
 from rest_framework.test import APITestCase
 
-from whichflix.elections.models import Candidate, Election, Participant, Vote
+from whichflix.elections import constants, manager
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    Election,
+    Participant,
+    Vote,
+    VoteEvent,
+)
 from whichflix.movies import constants as movie_constants
 from whichflix.users.models import Device
+from whichflix.utils import decode_external_id, generate_external_id
 from test import factories
 from test.elections import fixtures
 from test.movies import fixtures as movie_fixtures
 
 
 class TestGetElectionDetailView(APITestCase):
+    databases = "__all__"
+
     def setUp(self):
         # Redis
         self.redis_patcher = patch(
@@ -34,6 +47,7 @@ class TestGetElectionDetailView(APITestCase):
         self.redis_patcher.stop()
 
         # Clean up database.
+        ArchivedElection.objects.all().delete()
         Vote.objects.all().delete()
         Candidate.objects.all().delete()
         Participant.objects.all().delete()
@@ -67,11 +81,138 @@ class TestGetElectionDetailView(APITestCase):
         # Verify response.
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(
-            response.json(), fixtures.EXPECTED_RESPONSE_GET_ELECTION_DETAIL
+            response.json(),
+            {
+                **fixtures.EXPECTED_RESPONSE_GET_ELECTION_DETAIL,
+                "id": generate_external_id(election.id),
+            },
+        )
+
+    def test_get_election_rejects_malformed_id_without_querying(self):
+        url = reverse("election_detail", kwargs={"election_id": "invalid_election_id"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 404)
+
+    @responses.activate
+    def test_get_archived_election(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+
+        # Set up closed election.
+        election = factories.create_election()
+        candidate = factories.create_candidate(election, election.participants.first())
+        Vote.objects.create(
+            participant=election.participants.first(), candidate=candidate
+        )
+        election.closed_at = datetime.datetime.now(tz=timezone.utc)
+        election.save()
+
+        archived_count, _ = manager.archive_closed_elections(
+            datetime.datetime.now(tz=timezone.utc) + datetime.timedelta(days=1), 10
+        )
+
+        # Verify live rows were moved into cold storage.
+        self.assertEqual(archived_count, 1)
+        self.assertFalse(Election.objects.filter(id=election.id).exists())
+        self.assertFalse(Vote.objects.filter(candidate_id=candidate.id).exists())
+        self.assertTrue(ArchivedElection.objects.filter(id=election.id).exists())
+
+        url = reverse("election_detail", kwargs={"election_id": election.external_id})
+        response = self.client.get(url)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(response_json["id"], election.external_id)
+        self.assertEqual(response_json["closed_at"], election.closed_at.isoformat())
+        self.assertEqual(response_json["candidates"][0]["vote_count"], 1)
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="br")
+
+        # Verify the document compressed when archived is served.
+        archived_election = ArchivedElection.objects.get(id=election.id)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response.content, bytes(archived_election.document_br))
+        self.assertEqual(json.loads(brotli.decompress(response.content)), response_json)
+
+
+class TestCloseElectionView(APITestCase):
+    databases = "__all__"
+
+    def tearDown(self):
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    def test_post_closes_election(self):
+        # Set up device.
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up election.
+        election = factories.create_election(device=device)
+
+        url = reverse("election_close", kwargs={"election_id": election.external_id})
+        response = self.client.post(url, **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 200)
+
+        # Verify election in database.
+        election.refresh_from_db()
+        self.assertIsNotNone(election.closed_at)
+        self.assertEqual(response.json()["closed_at"], election.closed_at.isoformat())
+
+    def test_post_returns_error_when_participant_is_not_initiator_of_election(self):
+        # Set up election.
+        election = factories.create_election()
+        device = factories.create_device(device_token="def456")
+        factories.create_participant(election, device)
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        url = reverse("election_close", kwargs={"election_id": election.external_id})
+        response = self.client.post(url, **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(
+            response_json["error"],
+            "The participant is not the initiator of the election.",
         )
 
+    def test_closed_election_rejects_votes(self):
+        # Set up closed election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        election.closed_at = datetime.datetime.now(tz=timezone.utc)
+        election.save()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("votes", kwargs={"candidate_id": candidate.id})
+        response = self.client.post(url, data={}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "The election is closed.")
+        self.assertFalse(candidate.votes.exists())
+
 
 class TestPutElectionDetailView(APITestCase):
+    databases = "__all__"
+
     def tearDown(self):
         Participant.objects.all().delete()
         Election.objects.all().delete()
@@ -95,7 +236,11 @@ class TestPutElectionDetailView(APITestCase):
         # Verify response.
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(
-            response.json(), fixtures.EXPECTED_RESPONSE_UPDATE_ELECTION
+            response.json(),
+            {
+                **fixtures.EXPECTED_RESPONSE_UPDATE_ELECTION,
+                "id": generate_external_id(election.id),
+            },
         )
 
         # Verify election in database.
@@ -184,10 +329,14 @@ class TestPutElectionDetailView(APITestCase):
 
 
 class TestGetElectionsView(APITestCase):
+    databases = "__all__"
+
     def setUp(self):
         self.url = reverse("elections")
 
     def tearDown(self):
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
         Participant.objects.all().delete()
         Election.objects.all().delete()
         Device.objects.all().delete()
@@ -196,14 +345,25 @@ class TestGetElectionsView(APITestCase):
     def test_get_elections(self):
         device = Device.objects.create(device_token="some-device-token")
         headers = {"HTTP_X_DEVICE_ID": device.device_token}
-        factories.create_election(device=device, external_id="abc123")
-        factories.create_election(device=device, external_id="def456")
+        elections = [
+            factories.create_election(device=device),
+            factories.create_election(device=device),
+        ]
 
         response = self.client.get(self.url, **headers)
 
         # Verify response.
         self.assertEqual(response.status_code, 200)
-        self.assertDictEqual(response.json(), fixtures.EXPECTED_RESPONSE_GET_ELECTIONS)
+        expected_results = [
+            {**result, "id": generate_external_id(election.id)}
+            for result, election in zip(
+                fixtures.EXPECTED_RESPONSE_GET_ELECTIONS["results"], elections
+            )
+        ]
+        self.assertDictEqual(
+            response.json(),
+            {**fixtures.EXPECTED_RESPONSE_GET_ELECTIONS, "results": expected_results},
+        )
 
     def test_get_elections_when_device_id_has_no_elections(self):
         device = Device.objects.create(device_token="some-device-token")
@@ -213,21 +373,180 @@ class TestGetElectionsView(APITestCase):
 
         # Verify response.
         self.assertEqual(response.status_code, 200)
-        self.assertDictEqual(response.json(), {"results": []})
+        self.assertDictEqual(response.json(), {"results": [], "next_cursor": None})
 
     def test_get_elections_when_participant_is_deleted(self):
         device = Device.objects.create(device_token="some-device-token")
         headers = {"HTTP_X_DEVICE_ID": device.device_token}
-        election = factories.create_election(device=device, external_id="abc123")
-        participant = election.participants.first()
-        participant.deleted_at = datetime.datetime.now(tz=timezone.utc)
-        participant.save()
+        election = factories.create_election(device=device)
+        manager.delete_participant(election, election.participants.first())
 
         response = self.client.get(self.url, **headers)
 
         # Verify response.
         self.assertEqual(response.status_code, 200)
-        self.assertDictEqual(response.json(), {"results": []})
+        self.assertDictEqual(response.json(), {"results": [], "next_cursor": None})
+
+    def test_get_elections_paginates_with_cursor(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+        elections = [factories.create_election(device=device) for _ in range(3)]
+
+        response = self.client.get(self.url, {"limit": 2}, **headers)
+
+        # Verify first page.
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(
+            [election["id"] for election in response_json["results"]],
+            [elections[0].external_id, elections[1].external_id],
+        )
+        self.assertEqual(response_json["next_cursor"], elections[1].external_id)
+
+        response = self.client.get(
+            self.url, {"limit": 2, "cursor": response_json["next_cursor"]}, **headers
+        )
+
+        # Verify last page.
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(
+            [election["id"] for election in response_json["results"]],
+            [elections[2].external_id],
+        )
+        self.assertIsNone(response_json["next_cursor"])
+
+    @freeze_time("2020-02-25 23:21:34", tz_offset=-5)
+    def test_get_elections_summary(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up election with two candidates, where the second one is leading.
+        election = factories.create_election(device=device)
+        initiator = election.participants.first()
+        participant = factories.create_participant(
+            election, factories.create_device(device_token="def456")
+        )
+        factories.create_participant(
+            election, factories.create_device(device_token="ghi789"), is_deleted=True
+        )
+        first_candidate = factories.create_candidate(election, initiator, "603")
+        second_candidate = factories.create_candidate(election, initiator, "604")
+        Vote.objects.create(participant=initiator, candidate=first_candidate)
+        Vote.objects.create(participant=initiator, candidate=second_candidate)
+        Vote.objects.create(participant=participant, candidate=second_candidate)
+
+        # The listing is a single query regardless of election size, plus one for
+        # archived elections since this is the last page.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"view": "summary"}, **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "results": [
+                    {
+                        "id": election.external_id,
+                        "title": "Movie night in Brooklyn!",
+                        "created_at": "2020-02-25T23:21:34+00:00",
+                        "closed_at": None,
+                        "participant_count": 2,
+                        "candidate_count": 2,
+                        "leading_candidate": {
+                            "id": str(second_candidate.id),
+                            "movie_id": "604",
+                            "vote_count": 2,
+                        },
+                    }
+                ],
+                "next_cursor": None,
+            },
+        )
+
+    @freeze_time("2020-02-25 23:21:34", tz_offset=-5)
+    def test_get_elections_includes_archived_elections(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up an archived election and a live one.
+        archived_election = factories.create_election(device=device)
+        archived_election.closed_at = timezone.now()
+        archived_election.save()
+        manager.archive_closed_elections(
+            datetime.datetime.now(tz=timezone.utc) + datetime.timedelta(days=1), 10
+        )
+        election = factories.create_election(device=device)
+
+        full_response = self.client.get(self.url, **headers)
+        summary_response = self.client.get(self.url, {"view": "summary"}, **headers)
+
+        # Verify responses.
+        self.assertEqual(full_response.status_code, 200)
+        self.assertEqual(
+            [result["id"] for result in full_response.json()["results"]],
+            [archived_election.external_id, election.external_id],
+        )
+        self.assertEqual(
+            full_response.json()["results"][0]["closed_at"], "2020-02-25T23:21:34+00:00"
+        )
+        self.assertEqual(summary_response.status_code, 200)
+        self.assertDictEqual(
+            summary_response.json()["results"][0],
+            {
+                "id": archived_election.external_id,
+                "title": "Movie night in Brooklyn!",
+                "created_at": "2020-02-25T23:21:34+00:00",
+                "closed_at": "2020-02-25T23:21:34+00:00",
+                "participant_count": 1,
+                "candidate_count": 0,
+                "leading_candidate": None,
+            },
+        )
+
+    def test_get_elections_returns_error_when_limit_is_invalid(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        for limit in ["²", "0", "-1", "1.5", "2\n"]:
+            response = self.client.get(self.url, {"limit": limit}, **headers)
+
+            # Verify response.
+            self.assertEqual(response.status_code, 400)
+            response_json = response.json()
+            self.assertEqual(response_json["error"], "Invalid parameter: `limit`.")
+
+    def test_get_elections_clamps_limit_to_max_page_size(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+        elections = [
+            factories.create_election(device=device)
+            for _ in range(constants.ELECTIONS_MAX_PAGE_SIZE + 1)
+        ]
+
+        response = self.client.get(
+            self.url, {"limit": "1000", "view": "summary"}, **headers
+        )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 200)
+        response_json = response.json()
+        self.assertEqual(
+            len(response_json["results"]), constants.ELECTIONS_MAX_PAGE_SIZE
+        )
+        self.assertEqual(response_json["next_cursor"], elections[-2].external_id)
+
+    def test_get_elections_returns_error_when_cursor_is_invalid(self):
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        response = self.client.get(self.url, {"cursor": "invalid"}, **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Invalid parameter: `cursor`.")
 
     def test_get_elections_returns_error_when_device_header_is_missing(self):
         response = self.client.get(self.url)
@@ -239,6 +558,8 @@ class TestGetElectionsView(APITestCase):
 
 
 class TestCreateElectionsView(APITestCase):
+    databases = "__all__"
+
     def setUp(self):
         self.url = reverse("elections")
 
@@ -262,12 +583,18 @@ class TestCreateElectionsView(APITestCase):
         # Verify response.
         self.assertEqual(response.status_code, 201)
         response_json = response.json()
-        self.assertDictEqual(response_json, fixtures.EXPECTED_RESPONSE_CREATE_ELECTION)
-        external_id = response_json["id"]
+        election = Election.objects.get()
+        self.assertDictEqual(
+            response_json,
+            {
+                **fixtures.EXPECTED_RESPONSE_CREATE_ELECTION,
+                "id": generate_external_id(election.id),
+            },
+        )
+        self.assertEqual(decode_external_id(response_json["id"]), election.id)
 
         # Verify election in database.
-        election = Election.objects.filter(external_id=external_id).first()
-        self.assertIsNotNone(election)
+        self.assertEqual(election.external_id, response_json["id"])
         self.assertEqual(election.title, title)
 
         # Verify participant in database.
@@ -344,6 +671,8 @@ class TestCreateElectionsView(APITestCase):
 
 
 class TestCandidatesView(APITestCase):
+    databases = "__all__"
+
     def setUp(self):
         # Redis
         self.redis_patcher = patch(
@@ -390,7 +719,11 @@ class TestCandidatesView(APITestCase):
         # Verify response.
         self.assertEqual(response.status_code, 201)
         self.assertDictEqual(
-            response.json(), fixtures.EXPECTED_RESPONSE_CREATE_CANDIDATE
+            response.json(),
+            {
+                **fixtures.EXPECTED_RESPONSE_CREATE_CANDIDATE,
+                "id": generate_external_id(election.id),
+            },
         )
 
         # Verify candidate in database.
@@ -486,8 +819,8 @@ class TestCandidatesView(APITestCase):
         headers = {"HTTP_X_DEVICE_ID": second_device.device_token}
 
         # Set up elections.
-        first_election = factories.create_election(first_device, external_id="abc123")
-        factories.create_election(second_device, external_id="def456")
+        first_election = factories.create_election(first_device)
+        factories.create_election(second_device)
 
         url = reverse("candidates", kwargs={"election_id": first_election.external_id})
         response = self.client.post(
@@ -524,82 +857,329 @@ class TestCandidatesView(APITestCase):
         )
 
 
-class TestParticipantsView(APITestCase):
+class TestBulkCandidatesView(APITestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
     def tearDown(self):
+        # Redis
+        self.redis_patcher.stop()
+
+        # Clean up database.
+        Candidate.objects.all().delete()
         Participant.objects.all().delete()
         Election.objects.all().delete()
         Device.objects.all().delete()
 
-    @freeze_time("2020-02-25 23:21:34", tz_offset=-5)
-    def test_post_creates_participant(self):
-        # Set up device.
-        device = Device.objects.create(device_token="some-device-token")
-        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+    @responses.activate
+    @patch("whichflix.elections.manager.send_event")
+    def test_post_creates_candidates(self, send_event_mock):
+        for movie_id in ["604", "605"]:
+            responses.add(
+                responses.GET,
+                "https://api.themoviedb.org/3/movie/{}".format(movie_id),
+                json=movie_fixtures.MOVIE_INFO_RESPONSE,
+                status=200,
+            )
+        self.redis_mock.set(
+            movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id="603"),
+            json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+        )
 
-        # Set up election.
+        # Set up election with an existing candidate.
         election = factories.create_election()
-        name = "Jane"
+        participant = election.participants.first()
+        factories.create_candidate(election, participant, "603")
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
 
-        url = reverse("participants", kwargs={"election_id": election.external_id})
-        response = self.client.post(url, data={"name": name}, format="json", **headers)
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+        data = {"movie_ids": ["603", "604", "605", "604"]}
+        response = self.client.post(url, data=data, format="json", **headers)
 
         # Verify response.
         self.assertEqual(response.status_code, 201)
-        self.assertDictEqual(
-            response.json(), fixtures.EXPECTED_RESPONSE_CREATE_PARTICIPANT
+        self.assertEqual(len(response.json()["candidates"]), 3)
+        send_event_mock.assert_called_once()
+
+        # Verify candidates in database.
+        self.assertEqual(
+            sorted(election.candidates.values_list("movie_id", flat=True)),
+            ["603", "604", "605"],
         )
 
-        # Verify participant in database.
-        participant = election.participants.filter(device=device).first()
-        self.assertIsNotNone(participant)
-        self.assertEqual(participant.name, name)
-        self.assertEqual(participant.device_id, device.id)
-        self.assertFalse(participant.is_initiator)
+        # Verify fetched movies were cached.
+        self.assertIsNotNone(
+            self.redis_mock.get(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id="605")
+            )
+        )
+
+    @responses.activate
+    def test_post_returns_error_when_movie_does_not_exist(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/999",
+            json=movie_fixtures.MOVIE_NOT_FOUND_RESPONSE,
+            status=404,
+        )
 
-    def test_post_reactivates_deleted_participant(self):
         # Set up election.
         election = factories.create_election()
-        name = "Jill"
-
-        # Set up participant.
-        device = Device.objects.create(device_token="some-device-token")
-        participant = factories.create_participant(election, device, is_deleted=True)
-        headers = {"HTTP_X_DEVICE_ID": device.device_token}
-
-        url = reverse("participants", kwargs={"election_id": election.external_id})
-        response = self.client.post(url, data={"name": name}, format="json", **headers)
-
-        # Verify response.
-        self.assertEqual(response.status_code, 201)
-
-        # Verify participant in database.
-        participant = election.participants.filter(device=device).first()
-        self.assertIsNotNone(participant)
-        self.assertIsNone(participant.deleted_at)
-        self.assertEqual(participant.name, name)
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
 
-    def test_post_returns_error_when_election_does_not_exist(self):
-        url = reverse("participants", kwargs={"election_id": "invalid_election_id"})
-        response = self.client.post(url, data={"name": "Jane"}, format="json")
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+        data = {"movie_ids": ["603", "999"]}
+        response = self.client.post(url, data=data, format="json", **headers)
 
         # Verify response.
-        self.assertEqual(response.status_code, 404)
-
-    def test_post_returns_error_when_name_is_missing(self):
-        # Set up device.
-        device = Device.objects.create(device_token="some-device-token")
-        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Movie does not exist.")
+        self.assertFalse(election.candidates.exists())
 
+    @responses.activate
+    def test_post_returns_error_when_movie_id_is_not_an_integer(self):
         # Set up election.
         election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
 
-        url = reverse("participants", kwargs={"election_id": election.external_id})
-        response = self.client.post(url, data={}, format="json", **headers)
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+        data = {"movie_ids": ["²"]}
+        response = self.client.post(url, data=data, format="json", **headers)
 
-        # Verify response.
+        # Verify response, without a request to TMDB.
         self.assertEqual(response.status_code, 400)
         response_json = response.json()
-        self.assertEqual(response_json["error"], "Missing parameter: `name`.")
+        self.assertEqual(response_json["error"], "Movie does not exist.")
+        self.assertEqual(len(responses.calls), 0)
+
+    def test_post_returns_error_when_there_are_too_many_movies(self):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+        movie_ids = [str(movie_id) for movie_id in range(51)]
+        response = self.client.post(
+            url, data={"movie_ids": movie_ids}, format="json", **headers
+        )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Invalid parameter: `movie_ids`.")
+
+    @responses.activate
+    def test_post_returns_error_when_tmdb_times_out(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            body=requests.exceptions.ConnectTimeout(),
+        )
+
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+        data = {"movie_ids": ["603"]}
+        response = self.client.post(url, data=data, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 503)
+        response_json = response.json()
+        self.assertEqual(
+            response_json["error"],
+            "Movies cannot be looked up right now. Please try again.",
+        )
+        self.assertFalse(election.candidates.exists())
+
+    @responses.activate
+    def test_post_skips_movies_added_concurrently(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        # Another request adds the same movie after it was checked.
+        validate_movies_exist = manager._validate_movies_exist
+
+        def add_movie_concurrently(movie_ids):
+            validate_movies_exist(movie_ids)
+            factories.create_candidate(election, participant, "603")
+
+        url = reverse("bulk_candidates", kwargs={"election_id": election.external_id})
+
+        with patch(
+            "whichflix.elections.manager._validate_movies_exist",
+            side_effect=add_movie_concurrently,
+        ):
+            response = self.client.post(
+                url, data={"movie_ids": ["603"]}, format="json", **headers
+            )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["candidates"]), 1)
+        self.assertEqual(election.candidates.count(), 1)
+
+
+class TestParticipantsView(APITestCase):
+    databases = "__all__"
+
+    def tearDown(self):
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    @freeze_time("2020-02-25 23:21:34", tz_offset=-5)
+    def test_post_creates_participant(self):
+        # Set up device.
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up election.
+        election = factories.create_election()
+        name = "Jane"
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.post(url, data={"name": name}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+        self.assertDictEqual(
+            response.json(),
+            {
+                **fixtures.EXPECTED_RESPONSE_CREATE_PARTICIPANT,
+                "id": generate_external_id(election.id),
+            },
+        )
+
+        # Verify participant in database.
+        participant = election.participants.filter(device=device).first()
+        self.assertIsNotNone(participant)
+        self.assertEqual(participant.name, name)
+        self.assertEqual(participant.device_id, device.id)
+        self.assertFalse(participant.is_initiator)
+
+    def test_post_reactivates_deleted_participant(self):
+        # Set up election.
+        election = factories.create_election()
+        name = "Jill"
+
+        # Set up participant.
+        device = Device.objects.create(device_token="some-device-token")
+        participant = factories.create_participant(election, device, is_deleted=True)
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.post(url, data={"name": name}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+
+        # Verify participant in database.
+        participant = election.participants.filter(device=device).first()
+        self.assertIsNotNone(participant)
+        self.assertIsNone(participant.deleted_at)
+        self.assertEqual(participant.name, name)
+
+    def test_post_is_idempotent_for_active_participant(self):
+        # Set up election.
+        election = factories.create_election()
+
+        # Set up participant.
+        device = Device.objects.create(device_token="some-device-token")
+        factories.create_participant(election, device)
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.post(
+            url, data={"name": "Jill"}, format="json", **headers
+        )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+
+        # Verify participant in database.
+        participants = election.participants.filter(device=device)
+        self.assertEqual(participants.count(), 1)
+        self.assertEqual(participants.first().name, "Jill")
+        self.assertEqual(
+            Device.objects.filter(device_token="some-device-token").count(), 1
+        )
+
+    def test_post_returns_error_when_election_is_closed(self):
+        # Set up device.
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up closed election.
+        election = factories.create_election()
+        election.closed_at = datetime.datetime.now(tz=timezone.utc)
+        election.save()
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.post(
+            url, data={"name": "Jane"}, format="json", **headers
+        )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "The election is closed.")
+
+        # Verify no participant in database.
+        self.assertFalse(election.participants.filter(device=device).exists())
+
+    def test_post_returns_error_when_election_does_not_exist(self):
+        url = reverse("participants", kwargs={"election_id": "invalid_election_id"})
+        response = self.client.post(url, data={"name": "Jane"}, format="json")
+
+        # Verify response.
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_returns_error_when_name_is_missing(self):
+        # Set up device.
+        device = Device.objects.create(device_token="some-device-token")
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        # Set up election.
+        election = factories.create_election()
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.post(url, data={}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Missing parameter: `name`.")
 
     def test_post_returns_error_when_device_header_is_missing(self):
         # Set up election
@@ -629,13 +1209,37 @@ class TestParticipantsView(APITestCase):
         # Verify response.
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(
-            response.json(), fixtures.EXPECTED_RESPONSE_CREATE_ELECTION
+            response.json(),
+            {
+                **fixtures.EXPECTED_RESPONSE_CREATE_ELECTION,
+                "id": generate_external_id(election.id),
+            },
         )
 
         # Verify participant in database.
         participant = election.participants.filter(device=device).first()
         self.assertIsNotNone(participant.deleted_at)
 
+    def test_delete_returns_error_when_election_is_closed(self):
+        # Set up closed election.
+        election = factories.create_election()
+        device = Device.objects.create(device_token="some-device-token")
+        participant = factories.create_participant(election, device)
+        election.closed_at = datetime.datetime.now(tz=timezone.utc)
+        election.save()
+        headers = {"HTTP_X_DEVICE_ID": device.device_token}
+
+        url = reverse("participants", kwargs={"election_id": election.external_id})
+        response = self.client.delete(url, **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "The election is closed.")
+
+        # Verify participant in database.
+        participant.refresh_from_db()
+        self.assertIsNone(participant.deleted_at)
+
     def test_delete_returns_error_when_election_does_not_exist(self):
         device = Device.objects.create(device_token="some-device-token")
         headers = {"HTTP_X_DEVICE_ID": device.device_token}
@@ -667,12 +1271,19 @@ class TestParticipantsView(APITestCase):
 
 
 class TestVotesView(APITestCase):
+    databases = "__all__"
+
     def setUp(self):
         # Redis
+        redis_client = fakeredis.FakeStrictRedis()
         self.redis_patcher = patch(
-            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+            "whichflix.movies.manager.redis_client", redis_client
+        )
+        self.elections_redis_patcher = patch(
+            "whichflix.elections.manager.redis_client", redis_client
         )
         self.redis_mock = self.redis_patcher.start()
+        self.elections_redis_patcher.start()
         self.redis_mock.set(
             movie_constants.TMDB_CONFIGURATION_KEY,
             json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
@@ -681,6 +1292,7 @@ class TestVotesView(APITestCase):
     def tearDown(self):
         # Redis
         self.redis_patcher.stop()
+        self.elections_redis_patcher.stop()
 
         # Clean up database.
         Vote.objects.all().delete()
@@ -690,7 +1302,8 @@ class TestVotesView(APITestCase):
         Device.objects.all().delete()
 
     @responses.activate
-    def test_post_create_vote(self):
+    @patch("whichflix.elections.manager.send_event")
+    def test_post_create_vote(self, send_event_mock):
         responses.add(
             responses.GET,
             "https://api.themoviedb.org/3/movie/603",
@@ -719,6 +1332,14 @@ class TestVotesView(APITestCase):
             candidate.votes.first().participant, election.participants.first()
         )
 
+        # Verify tally event.
+        send_event_mock.assert_called_once_with(
+            "election-{}".format(election.external_id),
+            "tally",
+            {"candidate_id": str(candidate.id), "vote_count": 1, "version": 1},
+            state_key="tally-{}".format(candidate.id),
+        )
+
     @responses.activate
     def test_post_reactivates_deleted_vote(self):
         responses.add(
@@ -749,6 +1370,77 @@ class TestVotesView(APITestCase):
         vote.refresh_from_db()
         self.assertIsNone(vote.deleted_at)
 
+    @responses.activate
+    def test_post_reactivates_vote_deleted_through_api(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("votes", kwargs={"candidate_id": candidate.id})
+        self.client.post(url, data={}, format="json", **headers)
+        self.client.delete(url, **headers)
+        response = self.client.post(url, data={}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["vote_count"], 1)
+
+        # Verify the deleted vote was reactivated rather than duplicated.
+        vote = Vote.objects.get(participant=participant, candidate=candidate)
+        self.assertIsNone(vote.deleted_at)
+        self.assertEqual(
+            list(
+                VoteEvent.objects.filter(candidate_id=candidate.id)
+                .order_by("id")
+                .values_list("kind", flat=True)
+            ),
+            [VoteEvent.CAST, VoteEvent.RETRACT, VoteEvent.CAST],
+        )
+
+    def test_post_returns_error_when_concurrent_vote_wins_conflict(self):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        # Another request casts the same vote right before the upsert runs.
+        get_database_now = manager._get_database_now
+
+        def cast_concurrent_vote(*args):
+            Vote.objects.create(participant=participant, candidate=candidate)
+
+            return get_database_now(*args)
+
+        url = reverse("votes", kwargs={"candidate_id": candidate.id})
+
+        with patch(
+            "whichflix.elections.manager._get_database_now",
+            side_effect=cast_concurrent_vote,
+        ):
+            response = self.client.post(url, data={}, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            "The participant has already voted for the candidate.",
+        )
+
+        # Verify the concurrent vote is untouched and no cast was logged.
+        vote = Vote.objects.get(participant=participant, candidate=candidate)
+        self.assertIsNone(vote.deleted_at)
+        self.assertFalse(VoteEvent.objects.filter(candidate_id=candidate.id).exists())
+
     def test_post_returns_error_when_candidate_does_not_exist(self):
         url = reverse("votes", kwargs={"candidate_id": "123"})
         response = self.client.post(url, data={}, format="json")
@@ -763,11 +1455,11 @@ class TestVotesView(APITestCase):
         headers = {"HTTP_X_DEVICE_ID": second_device.device_token}
 
         # Set up elections.
-        first_election = factories.create_election(first_device, external_id="abc123")
+        first_election = factories.create_election(first_device)
         candidate = factories.create_candidate(
             first_election, first_election.participants.first()
         )
-        factories.create_election(second_device, external_id="def456")
+        factories.create_election(second_device)
 
         url = reverse("votes", kwargs={"candidate_id": candidate.id})
         response = self.client.post(url, data={}, format="json", **headers)
@@ -805,7 +1497,8 @@ class TestVotesView(APITestCase):
 
     @responses.activate
     @freeze_time("2020-02-25 23:21:34", tz_offset=-5)
-    def test_delete_removes_vote(self):
+    @patch("whichflix.elections.manager.send_event")
+    def test_delete_removes_vote(self, send_event_mock):
         responses.add(
             responses.GET,
             "https://api.themoviedb.org/3/movie/603",
@@ -831,6 +1524,43 @@ class TestVotesView(APITestCase):
         vote.refresh_from_db()
         self.assertIsNotNone(vote.deleted_at)
 
+        # Verify tally event.
+        send_event_mock.assert_called_once_with(
+            "election-{}".format(election.external_id),
+            "tally",
+            {"candidate_id": str(candidate.id), "vote_count": 0, "version": 1},
+            state_key="tally-{}".format(candidate.id),
+        )
+
+    @responses.activate
+    @patch("whichflix.elections.manager.send_event")
+    def test_tally_versions_increase_with_each_vote(self, send_event_mock):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("votes", kwargs={"candidate_id": candidate.id})
+        self.client.post(url, data={}, format="json", **headers)
+        self.client.delete(url, **headers)
+
+        # Verify tally events.
+        self.assertEqual(
+            [
+                (call.args[2]["vote_count"], call.args[2]["version"])
+                for call in send_event_mock.call_args_list
+            ],
+            [(1, 1), (0, 2)],
+        )
+
     def test_delete_returns_error_when_candidate_does_not_exist(self):
         # Set up election.
         election = factories.create_election()
@@ -884,3 +1614,200 @@ class TestVotesView(APITestCase):
             response_json["error"],
             "Vote with the provided device ID does not exist for the candidate.",
         )
+
+    @responses.activate
+    def test_delete_twice_returns_error(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/movie/603",
+            json=movie_fixtures.MOVIE_INFO_RESPONSE,
+            status=200,
+        )
+
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        Vote.objects.create(participant=participant, candidate=candidate)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("votes", kwargs={"candidate_id": candidate.id})
+        first_response = self.client.delete(url, **headers)
+        second_response = self.client.delete(url, **headers)
+
+        # Verify responses.
+        self.assertEqual(first_response.status_code, 200)
+        self.assertEqual(second_response.status_code, 400)
+        self.assertEqual(
+            second_response.json()["error"],
+            "Vote with the provided device ID does not exist for the candidate.",
+        )
+
+        # Verify only the first delete was logged.
+        self.assertEqual(
+            list(
+                VoteEvent.objects.filter(candidate_id=candidate.id).values_list(
+                    "kind", flat=True
+                )
+            ),
+            [VoteEvent.RETRACT],
+        )
+
+
+class TestElectionVotesView(APITestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        for movie_id in ["603", "604", "605"]:
+            self.redis_mock.set(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id=movie_id),
+                json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+            )
+
+    def tearDown(self):
+        # Redis
+        self.redis_patcher.stop()
+
+        # Clean up database.
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    @patch("whichflix.elections.manager.send_event")
+    def test_post_updates_votes(self, send_event_mock):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        first_candidate = factories.create_candidate(election, participant, "603")
+        second_candidate = factories.create_candidate(election, participant, "604")
+        third_candidate = factories.create_candidate(election, participant, "605")
+        Vote.objects.create(
+            participant=participant,
+            candidate=second_candidate,
+            deleted_at=datetime.datetime.now(tz=timezone.utc),
+        )
+        Vote.objects.create(participant=participant, candidate=third_candidate)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("election_votes", kwargs={"election_id": election.external_id})
+        data = {
+            "operations": [
+                {"candidate_id": str(first_candidate.id), "action": "vote"},
+                {"candidate_id": str(second_candidate.id), "action": "vote"},
+                {"candidate_id": str(third_candidate.id), "action": "remove_vote"},
+            ]
+        }
+        response = self.client.post(url, data=data, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 200)
+        vote_counts = {
+            candidate["id"]: candidate["vote_count"]
+            for candidate in response.json()["candidates"]
+        }
+        self.assertEqual(
+            vote_counts,
+            {
+                str(first_candidate.id): 1,
+                str(second_candidate.id): 1,
+                str(third_candidate.id): 0,
+            },
+        )
+        send_event_mock.assert_called_once()
+
+        # Verify votes in database.
+        active_votes = Vote.objects.filter(participant=participant, deleted_at=None)
+        self.assertEqual(
+            set(active_votes.values_list("candidate_id", flat=True)),
+            {first_candidate.id, second_candidate.id},
+        )
+
+    def test_post_returns_error_when_candidate_not_part_of_election(self):
+        # Set up elections.
+        election = factories.create_election()
+        participant = election.participants.first()
+        other_election = factories.create_election(
+            factories.create_device(device_token="def456")
+        )
+        other_candidate = factories.create_candidate(
+            other_election, other_election.participants.first()
+        )
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("election_votes", kwargs={"election_id": election.external_id})
+        data = {
+            "operations": [{"candidate_id": str(other_candidate.id), "action": "vote"}]
+        }
+        response = self.client.post(url, data=data, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(
+            response_json["error"], "The candidate is not part of the election."
+        )
+        self.assertFalse(Vote.objects.exists())
+
+    def test_post_returns_error_when_operations_are_invalid(self):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("election_votes", kwargs={"election_id": election.external_id})
+        data = {"operations": [{"candidate_id": "1", "action": "veto"}]}
+        response = self.client.post(url, data=data, format="json", **headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Invalid parameter: `operations`.")
+
+    def test_post_returns_error_when_candidate_id_is_not_an_integer(self):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("election_votes", kwargs={"election_id": election.external_id})
+
+        for candidate_id in ["²", "1\n", "-1", "abc", None]:
+            data = {"operations": [{"candidate_id": candidate_id, "action": "vote"}]}
+            response = self.client.post(url, data=data, format="json", **headers)
+
+            # Verify response.
+            self.assertEqual(response.status_code, 400)
+            response_json = response.json()
+            self.assertEqual(response_json["error"], "Invalid parameter: `operations`.")
+
+    def test_post_returns_error_when_there_are_too_many_operations(self):
+        # Set up election.
+        election = factories.create_election()
+        participant = election.participants.first()
+        candidate = factories.create_candidate(election, participant)
+        headers = {"HTTP_X_DEVICE_ID": participant.device.device_token}
+
+        url = reverse("election_votes", kwargs={"election_id": election.external_id})
+        operations = [{"candidate_id": str(candidate.id), "action": "vote"}] * (
+            constants.VOTE_OPERATIONS_MAX_COUNT + 1
+        )
+        response = self.client.post(
+            url, data={"operations": operations}, format="json", **headers
+        )
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        response_json = response.json()
+        self.assertEqual(response_json["error"], "Invalid parameter: `operations`.")
@@ -0,0 +1,336 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import fakeredis
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from whichflix.elections import constants, manager
+from whichflix.elections.models import Candidate, Election, Participant, Vote
+from whichflix.movies import constants as movie_constants
+from whichflix.users.models import Device
+from test import factories
+from test.movies import fixtures as movie_fixtures
+
+
+@override_settings(VOTE_BUFFER_ENABLED=True)
+class TestVoteBuffer(APITestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # Redis
+        redis_client = fakeredis.FakeStrictRedis()
+        self.movies_redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", redis_client
+        )
+        self.elections_redis_patcher = patch(
+            "whichflix.elections.manager.redis_client", redis_client
+        )
+        self.redis_mock = self.movies_redis_patcher.start()
+        self.elections_redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        for movie_id in ["603", "604"]:
+            self.redis_mock.set(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id=movie_id),
+                json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+            )
+
+        # Set up election.
+        self.election = factories.create_election()
+        self.participant = self.election.participants.first()
+        self.candidate = factories.create_candidate(self.election, self.participant)
+        self.headers = {"HTTP_X_DEVICE_ID": self.participant.device.device_token}
+
+    def tearDown(self):
+        # Redis
+        self.movies_redis_patcher.stop()
+        self.elections_redis_patcher.stop()
+
+        # Clean up database.
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    def test_buffered_vote_is_visible_before_flush(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        response = self.client.post(url, data={}, format="json", **self.headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["vote_count"], 1)
+        self.assertTrue(response.json()["actions"]["can_remove_vote"])
+
+        # Verify vote is not in database yet.
+        self.assertFalse(Vote.objects.exists())
+
+        # Verify election document reflects buffered vote.
+        url = reverse(
+            "election_detail", kwargs={"election_id": self.election.external_id}
+        )
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.json()["candidates"][0]["vote_count"], 1)
+
+    def test_post_returns_error_when_vote_already_buffered(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        response = self.client.post(url, data={}, format="json", **self.headers)
+
+        # Verify response.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"error": "The participant has already voted for the candidate."},
+        )
+
+    def test_flush_writes_latest_vote_states(self):
+        second_candidate = factories.create_candidate(
+            self.election, self.participant, "604"
+        )
+        Vote.objects.create(participant=self.participant, candidate=second_candidate)
+
+        # Vote, unvote and vote again, and remove the existing vote.
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        self.client.delete(url, **self.headers)
+        self.client.post(url, data={}, format="json", **self.headers)
+        url = reverse("votes", kwargs={"candidate_id": second_candidate.id})
+        response = self.client.delete(url, **self.headers)
+        self.assertEqual(response.json()["vote_count"], 0)
+
+        flushed = manager.flush_buffered_votes()
+
+        # Verify votes in database.
+        self.assertEqual(flushed, 2)
+        active_votes = Vote.objects.filter(deleted_at=None)
+        self.assertEqual(
+            list(active_votes.values_list("candidate_id", flat=True)),
+            [self.candidate.id],
+        )
+        self.assertEqual(Vote.objects.count(), 2)
+
+        # Verify buffer is empty.
+        self.assertEqual(manager.get_buffered_vote_states(self.election.id), {})
+        self.assertFalse(
+            self.redis_mock.smembers(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY)
+        )
+
+        # Verify reads are unchanged after flush.
+        url = reverse(
+            "election_detail", kwargs={"election_id": self.election.external_id}
+        )
+        response = self.client.get(url, **self.headers)
+        vote_counts = [
+            candidate["vote_count"] for candidate in response.json()["candidates"]
+        ]
+        self.assertEqual(vote_counts, [1, 0])
+
+    def test_worker_replays_interrupted_flush(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+
+        # Simulate a worker that stopped after claiming the buffer.
+        self.redis_mock.rename(
+            constants.VOTE_BUFFER_KEY.format(election_id=self.election.id),
+            constants.VOTE_BUFFER_FLUSHING_KEY.format(election_id=self.election.id),
+        )
+        self.redis_mock.delete(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY)
+
+        # Verify claimed votes remain visible.
+        url = reverse(
+            "election_detail", kwargs={"election_id": self.election.external_id}
+        )
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.json()["candidates"][0]["vote_count"], 1)
+
+        stdout = StringIO()
+        call_command("flush_vote_buffer", "--once", stdout=stdout)
+
+        # Verify output.
+        self.assertIn("Recovered buffered votes for 1 elections.", stdout.getvalue())
+        self.assertIn("Flushed 1 votes.", stdout.getvalue())
+
+        # Verify vote in database.
+        self.assertEqual(
+            Vote.objects.filter(
+                participant=self.participant, candidate=self.candidate, deleted_at=None
+            ).count(),
+            1,
+        )
+        self.assertEqual(manager.get_buffered_vote_states(self.election.id), {})
+
+    def test_flush_sets_aside_votes_that_cannot_be_written(self):
+        second_candidate = factories.create_candidate(
+            self.election, self.participant, "604"
+        )
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        url = reverse("votes", kwargs={"candidate_id": second_candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+
+        # Simulate the second vote violating a foreign key, as it would once its
+        # participant or candidate has been deleted.
+        bad_vote_key = (self.participant.id, second_candidate.id)
+        original_write_vote_states = manager._write_vote_states
+
+        def write_vote_states(election_id, vote_states):
+            if bad_vote_key in vote_states:
+                raise IntegrityError("violates foreign key constraint")
+
+            original_write_vote_states(election_id, vote_states)
+
+        with patch(
+            "whichflix.elections.manager._write_vote_states",
+            side_effect=write_vote_states,
+        ), self.assertLogs("whichflix.elections.manager", "ERROR"):
+            flushed = manager.flush_buffered_votes()
+
+        # Verify writable vote is in database.
+        self.assertEqual(flushed, 1)
+        self.assertEqual(
+            list(Vote.objects.values_list("candidate_id", flat=True)),
+            [self.candidate.id],
+        )
+
+        # Verify failed vote is set aside and not replayed.
+        self.assertEqual(
+            self.redis_mock.hgetall(
+                constants.VOTE_BUFFER_FAILED_KEY.format(election_id=self.election.id)
+            ),
+            {"{}:{}".format(*bad_vote_key).encode(): b"1"},
+        )
+        self.assertEqual(manager.get_buffered_vote_states(self.election.id), {})
+        self.assertEqual(manager.recover_buffered_votes(), 0)
+
+    def test_flush_continues_when_an_election_fails(self):
+        other_election = factories.create_election(factories.create_device("def456"))
+        other_participant = other_election.participants.first()
+        other_candidate = factories.create_candidate(other_election, other_participant)
+
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        url = reverse("votes", kwargs={"candidate_id": other_candidate.id})
+        self.client.post(
+            url,
+            data={},
+            format="json",
+            HTTP_X_DEVICE_ID=other_participant.device.device_token,
+        )
+
+        original_write_vote_states = manager._write_vote_states
+
+        def write_vote_states(election_id, vote_states):
+            if election_id == self.election.id:
+                raise OperationalError("server closed the connection unexpectedly")
+
+            original_write_vote_states(election_id, vote_states)
+
+        with patch(
+            "whichflix.elections.manager._write_vote_states",
+            side_effect=write_vote_states,
+        ), self.assertLogs("whichflix.elections.manager", "ERROR"):
+            flushed = manager.flush_buffered_votes()
+
+        # Verify other election is flushed.
+        self.assertEqual(flushed, 1)
+        self.assertEqual(
+            list(Vote.objects.values_list("candidate_id", flat=True)),
+            [other_candidate.id],
+        )
+
+        # Verify failed election keeps its votes for the next flush.
+        self.assertEqual(
+            manager.get_buffered_vote_states(self.election.id),
+            {(self.participant.id, self.candidate.id): True},
+        )
+        self.assertTrue(
+            self.redis_mock.sismember(
+                constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, self.election.id
+            )
+        )
+        self.assertEqual(manager.recover_buffered_votes(), 1)
+        self.assertEqual(manager.flush_buffered_votes(), 1)
+        self.assertEqual(Vote.objects.count(), 2)
+
+    def test_failed_flush_is_retried_without_a_new_vote(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+
+        with patch(
+            "whichflix.elections.manager._write_vote_states",
+            side_effect=OperationalError("server closed the connection unexpectedly"),
+        ), self.assertLogs("whichflix.elections.manager", "ERROR"):
+            flushed = manager.flush_buffered_votes()
+
+        self.assertEqual(flushed, 0)
+
+        # Verify next flush writes the vote.
+        self.assertEqual(manager.flush_buffered_votes(), 1)
+        self.assertEqual(Vote.objects.filter(deleted_at=None).count(), 1)
+        self.assertEqual(manager.get_buffered_vote_states(self.election.id), {})
+
+    def test_flush_skips_election_locked_by_another_worker(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        lock_key = constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(
+            election_id=self.election.id
+        )
+        self.redis_mock.set(lock_key, b"other-worker")
+
+        # Verify votes stay buffered and pending.
+        self.assertEqual(manager.flush_buffered_votes(), 0)
+        self.assertEqual(Vote.objects.count(), 0)
+        self.assertEqual(
+            manager.get_buffered_vote_states(self.election.id),
+            {(self.participant.id, self.candidate.id): True},
+        )
+        self.assertEqual(self.redis_mock.get(lock_key), b"other-worker")
+
+        self.redis_mock.delete(lock_key)
+
+        # Verify votes are flushed once the lock is released.
+        self.assertEqual(manager.flush_buffered_votes(), 1)
+        self.assertEqual(Vote.objects.count(), 1)
+        self.assertIsNone(self.redis_mock.get(lock_key))
+
+    def test_flush_keeps_votes_when_another_worker_takes_over(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        lock_key = constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(
+            election_id=self.election.id
+        )
+        original_write_vote_states = manager._write_vote_states
+
+        def write_vote_states(election_id, vote_states):
+            # Simulate the lock expiring and another worker taking it mid-flush.
+            self.redis_mock.set(lock_key, b"other-worker")
+            original_write_vote_states(election_id, vote_states)
+
+        with patch(
+            "whichflix.elections.manager._write_vote_states",
+            side_effect=write_vote_states,
+        ), self.assertLogs("whichflix.elections.manager", "ERROR"):
+            flushed = manager.flush_buffered_votes()
+
+        # Verify flushing hash is left for the other worker, and the lock is kept.
+        self.assertEqual(flushed, 0)
+        self.assertTrue(
+            self.redis_mock.exists(
+                constants.VOTE_BUFFER_FLUSHING_KEY.format(election_id=self.election.id)
+            )
+        )
+        self.assertTrue(
+            self.redis_mock.sismember(
+                constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, self.election.id
+            )
+        )
+        self.assertEqual(self.redis_mock.get(lock_key), b"other-worker")
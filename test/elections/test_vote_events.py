@@ -0,0 +1,327 @@
+import datetime
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import fakeredis
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework.test import APITestCase
+
+from whichflix.elections import builders, manager
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    CandidateTallySnapshot,
+    Election,
+    Participant,
+    Vote,
+    VoteEvent,
+)
+from whichflix.movies import constants as movie_constants
+from whichflix.users.models import Device
+from test import factories
+from test.movies import fixtures as movie_fixtures
+
+
+class TestVoteEvents(APITestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        for movie_id in ["603", "604"]:
+            self.redis_mock.set(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id=movie_id),
+                json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+            )
+
+        # Set up election.
+        self.election = factories.create_election()
+        self.participant = self.election.participants.first()
+        self.candidate = factories.create_candidate(self.election, self.participant)
+        self.second_candidate = factories.create_candidate(
+            self.election, self.participant, "604"
+        )
+        self.headers = {"HTTP_X_DEVICE_ID": self.participant.device.device_token}
+
+    def tearDown(self):
+        # Redis
+        self.redis_patcher.stop()
+
+        # Clean up database.
+        ArchivedElection.objects.all().delete()
+        CandidateTallySnapshot.objects.all().delete()
+        VoteEvent.objects.all().delete()
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    def test_vote_changes_are_logged(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        self.client.post(url, data={}, format="json", **self.headers)
+        self.client.post(url, data={}, format="json", **self.headers)
+        self.client.delete(url, **self.headers)
+
+        url = reverse(
+            "election_votes", kwargs={"election_id": self.election.external_id}
+        )
+        data = {
+            "operations": [
+                {"candidate_id": str(self.candidate.id), "action": "remove_vote"},
+                {"candidate_id": str(self.second_candidate.id), "action": "vote"},
+            ]
+        }
+        self.client.post(url, data=data, format="json", **self.headers)
+
+        # Verify only changes are logged.
+        self.assertEqual(
+            list(
+                VoteEvent.objects.order_by("id").values_list(
+                    "election_id", "participant_id", "candidate_id", "kind"
+                )
+            ),
+            [
+                (
+                    self.election.id,
+                    self.participant.id,
+                    self.candidate.id,
+                    VoteEvent.CAST,
+                ),
+                (
+                    self.election.id,
+                    self.participant.id,
+                    self.candidate.id,
+                    VoteEvent.RETRACT,
+                ),
+                (
+                    self.election.id,
+                    self.participant.id,
+                    self.second_candidate.id,
+                    VoteEvent.CAST,
+                ),
+            ],
+        )
+
+    def test_tallies_combine_snapshot_and_tail(self):
+        device = factories.create_device(device_token="def456")
+        second_participant = factories.create_participant(self.election, device)
+
+        with freeze_time("2020-02-25 20:00:00"):
+            manager.create_or_activate_vote_for_candidate(
+                self.participant, self.candidate
+            )
+            manager.create_or_activate_vote_for_candidate(
+                second_participant, self.candidate
+            )
+
+        snapshotted = manager.snapshot_candidate_tallies(
+            datetime.datetime(2020, 2, 25, 21, tzinfo=timezone.utc)
+        )
+
+        with freeze_time("2020-02-25 22:00:00"):
+            manager.delete_vote_for_candidate(second_participant, self.candidate)
+            manager.create_or_activate_vote_for_candidate(
+                second_participant, self.second_candidate
+            )
+
+        # Verify snapshot.
+        self.assertEqual(snapshotted, 1)
+        self.assertEqual(
+            list(
+                CandidateTallySnapshot.objects.values_list("candidate_id", "vote_count")
+            ),
+            [(self.candidate.id, 2)],
+        )
+
+        # Verify current tallies.
+        self.assertEqual(
+            manager.get_candidate_tallies(self.election.id),
+            {self.candidate.id: 1, self.second_candidate.id: 1},
+        )
+
+        # Verify tallies at a point in time.
+        self.assertEqual(
+            manager.get_candidate_tallies(
+                self.election.id,
+                at=datetime.datetime(2020, 2, 25, 21, tzinfo=timezone.utc),
+            ),
+            {self.candidate.id: 2},
+        )
+
+        # Verify elections without new events are not snapshotted again.
+        self.assertEqual(
+            manager.snapshot_candidate_tallies(
+                datetime.datetime(2020, 2, 25, 21, tzinfo=timezone.utc)
+            ),
+            0,
+        )
+
+    def test_tallies_match_documents_when_participants_leave_and_rejoin(self):
+        device = factories.create_device(device_token="def456")
+        second_headers = {"HTTP_X_DEVICE_ID": device.device_token}
+        participants_url = reverse(
+            "participants", kwargs={"election_id": self.election.external_id}
+        )
+        self.client.post(
+            participants_url, data={"name": "Jim"}, format="json", **second_headers
+        )
+
+        for candidate in [self.candidate, self.second_candidate]:
+            url = reverse("votes", kwargs={"candidate_id": candidate.id})
+            self.client.post(url, data={}, format="json", **self.headers)
+            self.client.post(url, data={}, format="json", **second_headers)
+
+        self.client.delete(participants_url, **second_headers)
+
+        # Verify votes of the participant who left are not counted.
+        self.assertEqual(
+            self._get_tallies(), {self.candidate.id: 1, self.second_candidate.id: 1}
+        )
+        self.assertEqual(self._get_tallies(), self._get_document_vote_counts())
+
+        # Simulate a buffered vote of the participant being flushed after they left.
+        second_participant = Participant.objects.get(device=device)
+        manager._write_vote_states(
+            self.election.id, {(second_participant.id, self.candidate.id): False}
+        )
+        self.client.post(
+            participants_url, data={"name": "Jim"}, format="json", **second_headers
+        )
+
+        # Verify their remaining votes count again once they rejoin.
+        self.assertEqual(
+            self._get_tallies(), {self.candidate.id: 1, self.second_candidate.id: 2}
+        )
+        self.assertEqual(self._get_tallies(), self._get_document_vote_counts())
+
+    def test_tallies_match_documents_after_compaction_and_archival(self):
+        device = factories.create_device(device_token="def456")
+        second_participant = factories.create_participant(self.election, device)
+        manager.create_or_activate_vote_for_candidate(self.participant, self.candidate)
+        manager.create_or_activate_vote_for_candidate(
+            second_participant, self.candidate
+        )
+        manager.create_or_activate_vote_for_candidate(
+            second_participant, self.second_candidate
+        )
+        manager.delete_vote_for_candidate(self.participant, self.candidate)
+        manager.delete_participant(self.election, second_participant)
+        now = datetime.datetime.now(tz=timezone.utc)
+        manager.compact_deleted_participants(now, 10)
+        manager.compact_deleted_votes(now, 10)
+
+        # Verify compaction keeps tallies in line with the document.
+        self.assertEqual(Vote.objects.count(), 0)
+        self.assertEqual(self._get_tallies(), {})
+        self.assertEqual(self._get_document_vote_counts(), {})
+
+        manager.create_or_activate_vote_for_candidate(self.participant, self.candidate)
+        election = manager.close_election(self.election, self.participant)
+        manager.archive_closed_elections(
+            election.closed_at + datetime.timedelta(seconds=1), 10
+        )
+
+        # Verify tallies keep the counts of the archived document.
+        archived_document = builders.build_archived_election_document(
+            manager.get_archived_election(self.election.external_id)
+        )
+        self.assertEqual(
+            {
+                int(candidate["id"]): candidate["vote_count"]
+                for candidate in archived_document["candidates"]
+                if candidate["vote_count"]
+            },
+            {self.candidate.id: 1},
+        )
+        self.assertEqual(self._get_tallies(), {self.candidate.id: 1})
+
+    def test_snapshots_replace_earlier_snapshots(self):
+        with freeze_time("2020-02-25 20:00:00"):
+            manager.create_or_activate_vote_for_candidate(
+                self.participant, self.candidate
+            )
+
+        manager.snapshot_candidate_tallies(
+            datetime.datetime(2020, 2, 25, 21, tzinfo=timezone.utc)
+        )
+
+        with freeze_time("2020-02-25 22:00:00"):
+            manager.create_or_activate_vote_for_candidate(
+                self.participant, self.second_candidate
+            )
+
+        manager.snapshot_candidate_tallies(
+            datetime.datetime(2020, 2, 25, 23, tzinfo=timezone.utc)
+        )
+
+        # Verify only the latest snapshot is kept.
+        self.assertEqual(
+            list(
+                CandidateTallySnapshot.objects.order_by("candidate_id").values_list(
+                    "candidate_id", "vote_count"
+                )
+            ),
+            [(self.candidate.id, 1), (self.second_candidate.id, 1)],
+        )
+
+        # Verify tallies before the latest snapshot are replayed from vote events.
+        self.assertEqual(
+            manager.get_candidate_tallies(
+                self.election.id,
+                at=datetime.datetime(2020, 2, 25, 21, tzinfo=timezone.utc),
+            ),
+            {self.candidate.id: 1},
+        )
+
+    def test_stream_vote_events_command(self):
+        manager.create_or_activate_vote_for_candidate(self.participant, self.candidate)
+        manager.delete_vote_for_candidate(self.participant, self.candidate)
+        first_vote_event = VoteEvent.objects.order_by("id").first()
+
+        stdout = StringIO()
+        call_command(
+            "stream_vote_events",
+            "--after-id={}".format(first_vote_event.id),
+            "--batch-size=1",
+            stdout=stdout,
+        )
+
+        # Verify output.
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["candidate_id"], self.candidate.id)
+        self.assertEqual(lines[0]["kind"], VoteEvent.RETRACT)
+
+    def _get_tallies(self) -> dict:
+        return {
+            candidate_id: vote_count
+            for candidate_id, vote_count in manager.get_candidate_tallies(
+                self.election.id
+            ).items()
+            if vote_count
+        }
+
+    def _get_document_vote_counts(self) -> dict:
+        url = reverse(
+            "election_detail", kwargs={"election_id": self.election.external_id}
+        )
+        response = self.client.get(url, **self.headers)
+
+        return {
+            int(candidate["id"]): candidate["vote_count"]
+            for candidate in response.json()["candidates"]
+            if candidate["vote_count"]
+        }
@@ -0,0 +1,256 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import fakeredis
+import redis
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from whichflix.events import constants, get_event_backend
+from whichflix.events.backends import QueuedEventBackend
+
+
+@override_settings(EVENT_COALESCING_WINDOW_IN_SECONDS=0)
+class TestQueuedEventBackend(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = fakeredis.FakeStrictRedis()
+        self.redis_patcher = patch(
+            "whichflix.events.backends.redis_client", self.redis_client
+        )
+        self.redis_patcher.start()
+
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.psubscribe(constants.EVENT_CHANNEL_KEY.format(channel="*"))
+        self.pubsub.get_message()
+
+        self.backend = QueuedEventBackend()
+
+    def tearDown(self):
+        self.redis_patcher.stop()
+
+    def get_published_events(self):
+        events = []
+
+        while True:
+            message = self.pubsub.get_message()
+
+            if message is None:
+                return events
+
+            events.append((message["channel"], json.loads(message["data"])))
+
+    def test_publish_queues_event(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+
+        self.assertEqual(self.redis_client.llen(constants.EVENT_QUEUE_KEY), 1)
+        self.assertEqual(self.get_published_events(), [])
+
+    def test_dispatch_publishes_events_in_order(self):
+        for title in ["First", "Second", "Third"]:
+            self.backend.publish("election-abc", "message", {"title": title})
+
+        self.assertEqual(self.backend.dispatch(batch_size=2), 2)
+        self.assertEqual(self.backend.dispatch(batch_size=2), 1)
+        self.assertEqual(self.backend.dispatch(batch_size=2), 0)
+
+        self.assertEqual(
+            self.get_published_events(),
+            [
+                (
+                    b"events:channel:election-abc",
+                    {"event": "message", "data": {"title": title}, "id": event_id},
+                )
+                for event_id, title in enumerate(["First", "Second", "Third"], 1)
+            ],
+        )
+        self.assertEqual(self.redis_client.llen(constants.EVENT_QUEUE_KEY), 0)
+
+    def test_failed_dispatch_keeps_events_queued(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+
+        with patch.object(
+            self.redis_client, "pipeline", side_effect=redis.ConnectionError
+        ):
+            with self.assertRaises(redis.ConnectionError):
+                self.backend.dispatch()
+
+        self.assertEqual(self.redis_client.llen(constants.EVENT_QUEUE_KEY), 1)
+
+        self.assertEqual(self.backend.dispatch(), 1)
+        self.assertEqual(len(self.get_published_events()), 1)
+
+    @override_settings(EVENT_BACKEND="whichflix.events.backends.QueuedEventBackend")
+    def test_dispatch_events_command(self):
+        get_event_backend.cache_clear()
+
+        for title in ["First", "Second", "Third"]:
+            get_event_backend().publish("election-abc", "message", {"title": title})
+
+        out = StringIO()
+        call_command("dispatch_events", "--once", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Dispatched 3 events.", out.getvalue())
+        self.assertEqual(len(self.get_published_events()), 3)
+
+    def test_only_one_dispatcher_publishes_at_a_time(self):
+        other_backend = QueuedEventBackend()
+
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        self.assertEqual(self.backend.dispatch(), 1)
+        self.backend.publish("election-abc", "message", {"title": "Second"})
+
+        # Verify other dispatcher waits while the lock is held.
+        self.assertEqual(other_backend.dispatch(), 0)
+        self.assertEqual(self.redis_client.llen(constants.EVENT_QUEUE_KEY), 1)
+
+        # Verify other dispatcher takes over once the lock expires.
+        self.redis_client.delete(constants.EVENT_DISPATCHER_LOCK_KEY)
+        self.assertEqual(other_backend.dispatch(), 1)
+        self.assertEqual(self.backend.dispatch(), 0)
+        self.assertEqual(
+            [event["data"]["title"] for _, event in self.get_published_events()],
+            ["First", "Second"],
+        )
+
+    def test_dispatch_does_not_trim_events_after_losing_lock(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        original_lrange = self.redis_client.lrange
+
+        def lrange(*args, **kwargs):
+            # Another dispatcher takes the lock while this one reads the queue.
+            self.redis_client.set(constants.EVENT_DISPATCHER_LOCK_KEY, b"other")
+            return original_lrange(*args, **kwargs)
+
+        with patch.object(redis.client.Pipeline, "lrange", side_effect=lrange):
+            self.assertEqual(self.backend.dispatch(), 0)
+
+        self.assertEqual(self.redis_client.llen(constants.EVENT_QUEUE_KEY), 1)
+        self.assertEqual(self.get_published_events(), [])
+
+    def test_dispatch_after_losing_lock_does_not_skip_event_ids(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        original_lrange = self.redis_client.lrange
+
+        def lrange(*args, **kwargs):
+            self.redis_client.set(constants.EVENT_DISPATCHER_LOCK_KEY, b"other")
+            return original_lrange(*args, **kwargs)
+
+        with patch.object(redis.client.Pipeline, "lrange", side_effect=lrange):
+            self.backend.dispatch()
+
+        self.redis_client.delete(constants.EVENT_DISPATCHER_LOCK_KEY)
+        self.backend.dispatch()
+
+        # Verify the failed dispatch did not use up an id.
+        self.assertEqual([event["id"] for _, event in self.get_published_events()], [1])
+
+
+@override_settings(EVENT_COALESCING_WINDOW_IN_SECONDS=0.2)
+class TestEventCoalescing(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = fakeredis.FakeStrictRedis()
+        self.redis_patcher = patch(
+            "whichflix.events.backends.redis_client", self.redis_client
+        )
+        self.redis_patcher.start()
+
+        self.monotonic_patcher = patch(
+            "whichflix.events.backends.time.monotonic", return_value=100.0
+        )
+        self.monotonic_mock = self.monotonic_patcher.start()
+
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.psubscribe(constants.EVENT_CHANNEL_KEY.format(channel="*"))
+        self.pubsub.get_message()
+
+        self.backend = QueuedEventBackend()
+
+    def tearDown(self):
+        self.monotonic_patcher.stop()
+        self.redis_patcher.stop()
+
+    def get_published_titles(self):
+        titles = []
+
+        while True:
+            message = self.pubsub.get_message()
+
+            if message is None:
+                return titles
+
+            titles.append(json.loads(message["data"])["data"]["title"])
+
+    def test_burst_collapses_into_leading_and_trailing_events(self):
+        for title in ["First", "Second", "Third"]:
+            self.backend.publish("election-abc", "message", {"title": title})
+
+        self.assertEqual(self.backend.dispatch(), 3)
+        self.assertEqual(self.get_published_titles(), ["First"])
+
+        self.monotonic_mock.return_value = 100.1
+        self.backend.publish("election-abc", "message", {"title": "Fourth"})
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), [])
+
+        self.monotonic_mock.return_value = 100.2
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), ["Fourth"])
+        self.assertFalse(self.redis_client.exists(constants.EVENT_PENDING_KEY))
+
+        self.monotonic_mock.return_value = 100.5
+        self.backend.publish("election-abc", "message", {"title": "Fifth"})
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), ["Fifth"])
+
+    def test_elections_are_coalesced_separately(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        self.backend.publish("election-def", "message", {"title": "Second"})
+        self.backend.publish("test", "message", {"title": "Third"})
+        self.backend.publish("test", "message", {"title": "Fourth"})
+
+        self.backend.dispatch()
+
+        self.assertEqual(
+            self.get_published_titles(), ["First", "Second", "Third", "Fourth"]
+        )
+
+    def test_burst_collapses_into_highest_version(self):
+        for title, version in [("First", 1), ("Third", 3), ("Second", 2)]:
+            self.backend.publish(
+                "election-abc",
+                "tally",
+                {"title": title, "version": version},
+                state_key="tally-1",
+            )
+
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), ["First"])
+
+        self.monotonic_mock.return_value = 100.2
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), ["Third"])
+
+    def test_coalesced_event_is_published_after_later_events(self):
+        self.backend.publish("election-abc", "tally", {"title": "First"}, "tally-1")
+        self.backend.publish("election-abc", "tally", {"title": "Second"}, "tally-1")
+        self.backend.publish("election-abc", "tally", {"title": "Third"}, "tally-2")
+
+        self.backend.dispatch()
+        self.monotonic_mock.return_value = 100.2
+        self.backend.dispatch()
+
+        # Verify the held back event follows the event queued after it.
+        self.assertEqual(self.get_published_titles(), ["First", "Third", "Second"])
+
+    def test_restarted_dispatcher_publishes_pending_events(self):
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        self.backend.publish("election-abc", "message", {"title": "Second"})
+        self.backend.dispatch()
+        self.assertEqual(self.get_published_titles(), ["First"])
+
+        # The lock of the stopped dispatcher expires.
+        self.redis_client.delete(constants.EVENT_DISPATCHER_LOCK_KEY)
+        QueuedEventBackend().dispatch()
+
+        self.assertEqual(self.get_published_titles(), ["Second"])
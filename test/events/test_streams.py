@@ -0,0 +1,278 @@
+import json
+from unittest.mock import patch
+
+import fakeredis
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase
+
+from whichflix.events import constants
+from whichflix.events.backends import LocalEventBackend, RedisEventBackend, encode_event
+from whichflix.events.hub import EventHub
+from whichflix.events.streams import EventStreamRouter
+
+
+def build_scope(path, headers=None):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"x-device-id", b"abc123")] if headers is None else headers,
+    }
+
+
+class TestRedisEventBackend(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = fakeredis.FakeStrictRedis()
+        self.redis_patcher = patch(
+            "whichflix.events.backends.redis_client", self.redis_client
+        )
+        self.redis_patcher.start()
+
+    def tearDown(self):
+        self.redis_patcher.stop()
+
+    def test_publish_sends_event_to_channel(self):
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(constants.EVENT_CHANNEL_KEY.format(channel="*"))
+        pubsub.get_message()
+
+        RedisEventBackend().publish("election-abc", "candidate_created", {"id": 1})
+
+        message = pubsub.get_message()
+        self.assertEqual(message["channel"], b"events:channel:election-abc")
+        self.assertEqual(
+            json.loads(message["data"]),
+            {"event": "candidate_created", "data": {"id": 1}, "id": 1},
+        )
+
+    def test_publish_numbers_events_per_channel(self):
+        backend = RedisEventBackend()
+
+        backend.publish("election-abc", "message", {"title": "First"})
+        backend.publish("election-def", "message", {"title": "Second"})
+        backend.publish("election-abc", "message", {"title": "Third"})
+        backend.publish("test", "message", {"title": "Fourth"})
+
+        history = [
+            json.loads(event)
+            for event in self.redis_client.zrange(
+                constants.EVENT_HISTORY_KEY.format(channel="election-abc"), 0, -1
+            )
+        ]
+        self.assertEqual([event["id"] for event in history], [1, 2])
+        self.assertFalse(
+            self.redis_client.exists(constants.EVENT_HISTORY_KEY.format(channel="test"))
+        )
+
+    def test_publish_expires_event_sequence_with_history(self):
+        RedisEventBackend().publish("election-abc", "message", {"title": "First"})
+
+        sequence_key = constants.EVENT_SEQUENCE_KEY.format(channel="election-abc")
+        self.assertEqual(
+            self.redis_client.ttl(sequence_key), constants.EVENT_HISTORY_TTL_IN_SECONDS
+        )
+
+    def test_get_history_returns_latest_events_when_sequence_restarted(self):
+        backend = RedisEventBackend()
+
+        for title in ["First", "Second"]:
+            backend.publish("election-abc", "message", {"title": title})
+
+        history = backend.get_history("election-abc", "5")
+
+        self.assertEqual(
+            [json.loads(event)["data"] for event in history], [{"title": "Second"}]
+        )
+
+    def test_get_history_returns_missed_events(self):
+        backend = RedisEventBackend()
+
+        for title in ["First", "Second", "Third"]:
+            backend.publish("election-abc", "message", {"title": title})
+
+        history = backend.get_history("election-abc", "1")
+
+        self.assertEqual(
+            [json.loads(event)["data"]["title"] for event in history],
+            ["Second", "Third"],
+        )
+        self.assertEqual(backend.get_history("election-abc", "3"), [])
+
+    @patch("whichflix.events.constants.EVENT_HISTORY_LENGTH", 2)
+    def test_get_history_returns_latest_events_when_gap_is_not_retained(self):
+        backend = RedisEventBackend()
+
+        for title in ["First", "Second", "Third", "Fourth"]:
+            backend.publish("election-abc", "message", {"title": title})
+
+        backend.publish("election-abc", "tally", {"count": 1})
+
+        history = backend.get_history("election-abc", "1")
+
+        self.assertEqual(
+            [json.loads(event)["data"] for event in history],
+            [{"title": "Fourth"}, {"count": 1}],
+        )
+        self.assertEqual(
+            [
+                json.loads(event)["data"]
+                for event in backend.get_history("election-abc", "3")
+            ],
+            [{"title": "Fourth"}, {"count": 1}],
+        )
+
+
+class TestEventStreamRouter(SimpleTestCase):
+    def setUp(self):
+        self.backend = LocalEventBackend()
+        self.hub = EventHub(self.backend)
+        self.hub_patcher = patch(
+            "whichflix.events.streams.get_event_hub", return_value=self.hub
+        )
+        self.hub_patcher.start()
+        self.membership_patcher = patch(
+            "whichflix.elections.manager.is_device_participating_in_election",
+            side_effect=lambda device_token, election_id: election_id != "xyz",
+        )
+        self.membership_mock = self.membership_patcher.start()
+
+    def tearDown(self):
+        self.membership_patcher.stop()
+        self.hub_patcher.stop()
+
+    def test_streams_events_for_election(self):
+        messages = async_to_sync(self._stream)("/v1/elections/abc/events/")
+
+        start, opening, event = messages
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertEqual(opening["body"], b":\n\n")
+        self.assertEqual(
+            event["body"], b'event: candidate_created\ndata: {"id": 1}\n\n'
+        )
+        self.assertEqual(self.hub.subscribers, {})
+
+    async def _stream(self, path):
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(self._fail), build_scope(path)
+        )
+        await communicator.send_input({"type": "http.request"})
+        messages = [
+            await communicator.receive_output(),
+            await communicator.receive_output(),
+        ]
+
+        self.backend.publish("election-other", "candidate_created", {"id": 2})
+        self.backend.publish("election-abc", "candidate_created", {"id": 1})
+        messages.append(await communicator.receive_output())
+
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait()
+
+        return messages
+
+    def test_passes_other_requests_through(self):
+        messages = async_to_sync(self._pass_through)("/v1/elections/")
+
+        self.assertEqual(messages, [{"type": "passed"}])
+        self.assertEqual(self.hub.subscribers, {})
+
+    def test_resumes_stream_from_last_event_id(self):
+        history = [
+            b'{"event": "message", "data": {"title": "Second"}, "id": 2}',
+            b'{"event": "message", "data": {"title": "Third"}, "id": 3}',
+        ]
+
+        with patch.object(
+            LocalEventBackend, "get_history", return_value=history
+        ) as get_history_mock:
+            messages = async_to_sync(self._resume)("/v1/elections/abc/events/")
+
+        get_history_mock.assert_called_once_with("election-abc", "1")
+        self.assertEqual(
+            [message["body"] for message in messages],
+            [
+                b'id: 2\nevent: message\ndata: {"title": "Second"}\n\n',
+                b'id: 3\nevent: message\ndata: {"title": "Third"}\n\n',
+                b'id: 4\nevent: message\ndata: {"title": "Fourth"}\n\n',
+            ],
+        )
+
+    async def _resume(self, path):
+        scope = build_scope(path)
+        scope["headers"].append((b"last-event-id", b"1"))
+        communicator = ApplicationCommunicator(EventStreamRouter(self._fail), scope)
+        await communicator.send_input({"type": "http.request"})
+        await communicator.receive_output()
+        await communicator.receive_output()
+        messages = [
+            await communicator.receive_output(),
+            await communicator.receive_output(),
+        ]
+
+        # Events published while the history was read are not sent twice.
+        for event_id, title in [(3, "Third"), (4, "Fourth")]:
+            self.hub._dispatch(
+                "election-abc", encode_event("message", {"title": title}, event_id)
+            )
+
+        messages.append(await communicator.receive_output())
+
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait()
+
+        return messages
+
+    def test_rejects_streams_without_device(self):
+        messages = async_to_sync(self._request)("/v1/elections/abc/events/", [])
+
+        start, body = messages
+        self.assertEqual(start["status"], 401)
+        self.assertEqual(
+            json.loads(body["body"]),
+            {"error": "Event streams must identify the device."},
+        )
+        self.membership_mock.assert_not_called()
+        self.assertEqual(self.hub.subscribers, {})
+
+    def test_rejects_elections_device_is_not_participating_in(self):
+        messages = async_to_sync(self._request)("/v1/elections/xyz/events/")
+
+        start, body = messages
+        self.membership_mock.assert_called_once_with("abc123", "xyz")
+        self.assertEqual(start["status"], 403)
+        self.assertEqual(
+            json.loads(body["body"]),
+            {"error": "The device is not participating in election `xyz`."},
+        )
+        self.assertEqual(self.hub.subscribers, {})
+
+    async def _request(self, path, headers=None):
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(self._fail), build_scope(path, headers)
+        )
+        await communicator.send_input({"type": "http.request"})
+        messages = [
+            await communicator.receive_output(),
+            await communicator.receive_output(),
+        ]
+        await communicator.wait()
+
+        return messages
+
+    async def _pass_through(self, path):
+        async def application(scope, receive, send):
+            await send({"type": "passed"})
+
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(application), build_scope(path)
+        )
+        messages = [await communicator.receive_output()]
+        await communicator.wait()
+
+        return messages
+
+    async def _fail(self, scope, receive, send):
+        raise AssertionError("The request should have been streamed.")
@@ -0,0 +1,272 @@
+import json
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase, TestCase
+
+from whichflix.elections import manager
+from whichflix.events.backends import LocalEventBackend
+from whichflix.events.hub import EventHub
+from whichflix.events.streams import EventStreamRouter
+from test import factories
+
+
+def build_scope(path, headers=None):
+    return {
+        "type": "websocket",
+        "path": path,
+        "query_string": b"",
+        "headers": headers or [(b"x-device-id", b"abc123")],
+    }
+
+
+class TestElectionWebSocket(SimpleTestCase):
+    def setUp(self):
+        self.backend = LocalEventBackend()
+        self.hub = EventHub(self.backend)
+        self.hub_patcher = patch(
+            "whichflix.events.websockets.get_event_hub", return_value=self.hub
+        )
+        self.hub_patcher.start()
+        self.membership_patcher = patch(
+            "whichflix.elections.manager.is_device_participating_in_election",
+            side_effect=lambda device_token, election_id: election_id != "xyz",
+        )
+        self.membership_mock = self.membership_patcher.start()
+
+    def tearDown(self):
+        self.membership_patcher.stop()
+        self.hub_patcher.stop()
+
+    async def connect(self, headers=None):
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(self._fail), build_scope("/v1/events/", headers)
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual(
+            await communicator.receive_output(), {"type": "websocket.accept"}
+        )
+
+        return communicator
+
+    async def send_json(self, communicator, message):
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": json.dumps(message)}
+        )
+
+    async def receive_json(self, communicator):
+        message = await communicator.receive_output()
+
+        return json.loads(message["text"])
+
+    async def disconnect(self, communicator):
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait()
+
+    def test_multiplexes_elections(self):
+        messages = async_to_sync(self._multiplex)()
+
+        self.assertEqual(
+            messages,
+            [
+                {
+                    "election_id": "abc",
+                    "id": None,
+                    "event": "message",
+                    "data": {"title": "First"},
+                },
+                {
+                    "election_id": "def",
+                    "id": None,
+                    "event": "message",
+                    "data": {"title": "Second"},
+                },
+                {
+                    "election_id": "def",
+                    "id": None,
+                    "event": "message",
+                    "data": {"title": "Fourth"},
+                },
+            ],
+        )
+        self.assertEqual(self.hub.subscribers, {})
+
+    async def _multiplex(self):
+        communicator = await self.connect()
+        await self.send_json(
+            communicator, {"action": "subscribe", "election_id": "abc"}
+        )
+        await self.send_json(
+            communicator, {"action": "subscribe", "election_id": "def"}
+        )
+        await communicator.receive_nothing()
+
+        self.backend.publish("election-abc", "message", {"title": "First"})
+        self.backend.publish("election-ghi", "message", {"title": "Ignored"})
+        messages = [await self.receive_json(communicator)]
+        self.backend.publish("election-def", "message", {"title": "Second"})
+        messages.append(await self.receive_json(communicator))
+
+        await self.send_json(
+            communicator, {"action": "unsubscribe", "election_id": "abc"}
+        )
+        await communicator.receive_nothing()
+        self.backend.publish("election-abc", "message", {"title": "Third"})
+        self.backend.publish("election-def", "message", {"title": "Fourth"})
+        messages.append(await self.receive_json(communicator))
+        self.assertTrue(await communicator.receive_nothing())
+
+        await self.disconnect(communicator)
+
+        return messages
+
+    def test_resumes_election_from_last_event_id(self):
+        history = [
+            b'{"event": "message", "data": {"title": "Second"}, "id": 2}',
+            b'{"event": "tally", "data": {"count": 1}, "id": 3}',
+        ]
+
+        with patch.object(
+            LocalEventBackend, "get_history", return_value=history
+        ) as get_history_mock:
+            messages = async_to_sync(self._resume)()
+
+        get_history_mock.assert_called_once_with("election-abc", "1")
+        self.assertEqual(
+            [(message["id"], message["data"]) for message in messages],
+            [(2, {"title": "Second"}), (3, {"count": 1})],
+        )
+
+    async def _resume(self):
+        communicator = await self.connect()
+        await self.send_json(
+            communicator,
+            {"action": "subscribe", "election_id": "abc", "last_event_id": 1},
+        )
+        messages = [
+            await self.receive_json(communicator),
+            await self.receive_json(communicator),
+        ]
+
+        # An event replayed from the history is not sent twice.
+        self.hub._dispatch(
+            "election-abc", b'{"event": "tally", "data": {"count": 1}, "id": 3}'
+        )
+        self.assertTrue(await communicator.receive_nothing())
+
+        await self.disconnect(communicator)
+
+        return messages
+
+    def test_rejects_invalid_messages(self):
+        message = async_to_sync(self._send_invalid_message)()
+
+        self.assertEqual(
+            message,
+            {
+                "error": "Messages must be JSON objects with an `action` and an `election_id`."
+            },
+        )
+
+    async def _send_invalid_message(self):
+        communicator = await self.connect()
+        await communicator.send_input({"type": "websocket.receive", "text": "hello"})
+        message = await self.receive_json(communicator)
+        await self.disconnect(communicator)
+
+        return message
+
+    def test_closes_connections_without_device(self):
+        message = async_to_sync(self._connect_without_device)()
+
+        self.assertEqual(message, {"type": "websocket.close", "code": 4401})
+
+    async def _connect_without_device(self):
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(self._fail),
+            build_scope("/v1/events/", [(b"origin", b"https://whichflix.app")]),
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+
+        return await communicator.receive_output()
+
+    def test_rejects_elections_device_is_not_participating_in(self):
+        message = async_to_sync(self._subscribe_to_other_election)()
+
+        self.membership_mock.assert_called_once_with("abc123", "xyz")
+        self.assertEqual(
+            message, {"error": "The device is not participating in election `xyz`."}
+        )
+
+    async def _subscribe_to_other_election(self):
+        communicator = await self.connect()
+        await self.send_json(
+            communicator, {"action": "subscribe", "election_id": "xyz"}
+        )
+        message = await self.receive_json(communicator)
+        self.backend.publish("election-xyz", "message", {"title": "Hidden"})
+        self.assertTrue(await communicator.receive_nothing())
+        await self.disconnect(communicator)
+
+        return message
+
+    def test_closes_old_database_connections_around_membership_check(self):
+        with patch(
+            "whichflix.events.websockets.close_old_connections"
+        ) as close_old_connections_mock:
+            async_to_sync(self._subscribe)("abc")
+
+        # Verify connections are recycled before and after the query.
+        self.membership_mock.assert_called_once_with("abc123", "abc")
+        self.assertEqual(close_old_connections_mock.call_count, 2)
+
+    async def _subscribe(self, election_id):
+        communicator = await self.connect()
+        await self.send_json(
+            communicator, {"action": "subscribe", "election_id": election_id}
+        )
+        await self.disconnect(communicator)
+
+    def test_closes_other_paths(self):
+        message = async_to_sync(self._connect_to_other_path)()
+
+        self.assertEqual(message, {"type": "websocket.close"})
+
+    async def _connect_to_other_path(self):
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(self._fail), build_scope("/v1/elections/")
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+
+        return await communicator.receive_output()
+
+    async def _fail(self, scope, receive, send):
+        raise AssertionError("The connection should have been handled.")
+
+
+class TestDeviceParticipation(TestCase):
+    databases = "__all__"
+
+    def test_is_device_participating_in_election(self):
+        election = factories.create_election()
+        device = factories.create_device("def456")
+        participant = factories.create_participant(election, device)
+
+        # Verify only active participants of existing elections are participating.
+        self.assertTrue(
+            manager.is_device_participating_in_election("abc123", election.external_id)
+        )
+        self.assertTrue(
+            manager.is_device_participating_in_election("def456", election.external_id)
+        )
+        self.assertFalse(
+            manager.is_device_participating_in_election("ghi789", election.external_id)
+        )
+        self.assertFalse(manager.is_device_participating_in_election("abc123", "xyz"))
+
+        manager.delete_participant(election, participant)
+
+        self.assertFalse(
+            manager.is_device_participating_in_election("def456", election.external_id)
+        )
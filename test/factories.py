@@ -3,8 +3,14 @@ from typing import Optional
 
 from django.utils import timezone
 
-from whichflix.elections.models import Candidate, Election, Participant
+from whichflix.elections.models import (
+    Candidate,
+    Election,
+    ElectionMembership,
+    Participant,
+)
 from whichflix.users.models import Device
+from whichflix.utils import generate_external_id
 
 
 def create_device(device_token: Optional[str] = None) -> Device:
@@ -14,17 +20,15 @@ def create_device(device_token: Optional[str] = None) -> Device:
     return device
 
 
-def create_election(
-    device: Optional[Device] = None, external_id: Optional[str] = None
-) -> Election:
+def create_election(device: Optional[Device] = None) -> Election:
     device = device or create_device()
-    external_id = external_id or "abc123"
-    election = Election.objects.create(
-        title="Movie night in Brooklyn!", external_id=external_id
-    )
+    election = Election.objects.create(title="Movie night in Brooklyn!")
+    election.external_id = generate_external_id(election.id)
+    election.save()
     Participant.objects.create(
         name="John", election=election, device=device, is_initiator=True
     )
+    ElectionMembership.objects.create(device=device, election_id=election.id)
 
     return election
 
@@ -43,6 +47,8 @@ def create_participant(
     if is_deleted:
         participant.deleted_at = datetime.datetime.now(tz=timezone.utc)
         participant.save()
+    else:
+        ElectionMembership.objects.create(device=device, election_id=election.id)
 
     return participant
 
@@ -0,0 +1,40 @@
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from django.conf import settings
+from django.db import connections
+
+from whichflix.query_budget import QueryRecorder, get_query_budget
+
+
+class QueryBudgetTestMixin:
+    @contextmanager
+    def assertWithinQueryBudget(self, view_name: str) -> Iterator[QueryRecorder]:
+        budget = get_query_budget(view_name)
+        self.assertIsNotNone(budget, "No query budget for `{}`.".format(view_name))
+
+        recorder = QueryRecorder()
+
+        # Elections are sharded across databases, so every connection is recorded.
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+
+            yield recorder
+
+        repeated_shapes = recorder.get_repeated_shapes(
+            settings.QUERY_BUDGET_REPEATED_SHAPE_THRESHOLD
+        )
+        self.assertFalse(
+            repeated_shapes,
+            "`{view}` repeated query shapes: {repeated}".format(
+                view=view_name, repeated=repeated_shapes
+            ),
+        )
+        self.assertLessEqual(
+            recorder.count,
+            budget,
+            "`{view}` issued {count} queries, over its budget of {budget}.".format(
+                view=view_name, count=recorder.count, budget=budget
+            ),
+        )
@@ -0,0 +1,176 @@
+import json
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import brotli
+import fakeredis
+import httpx
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from test.movies import fixtures
+from whichflix.movies import constants
+from whichflix.movies.asgi import AsyncMoviesRouter
+
+
+def build_scope(path, query=None, headers=None):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": urlencode(query or {}).encode(),
+        "headers": headers or [],
+    }
+
+
+class TestAsyncMoviesSearch(SimpleTestCase):
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+
+        # TMDB
+        self.tmdb_requests = []
+        self.tmdb_client_patcher = patch(
+            "whichflix.movies.async_manager.get_async_tmdb_client",
+            side_effect=lambda: httpx.AsyncClient(
+                base_url="https://api.themoviedb.org/3",
+                transport=httpx.MockTransport(self.handle_tmdb_request),
+            ),
+        )
+        self.tmdb_client_patcher.start()
+
+    def tearDown(self):
+        self.tmdb_client_patcher.stop()
+        self.redis_patcher.stop()
+
+    def handle_tmdb_request(self, request):
+        self.tmdb_requests.append(request)
+        responses = {
+            "/3/search/movie": fixtures.SEARCH_MOVIES_RESPONSE,
+            "/3/configuration": fixtures.CONFIGURATION_RESPONSE,
+        }
+
+        return httpx.Response(200, json=responses[request.url.path])
+
+    async def get_response(self, scope):
+        communicator = ApplicationCommunicator(AsyncMoviesRouter(self._fail), scope)
+        await communicator.send_input({"type": "http.request"})
+        start = await communicator.receive_output()
+        body = await communicator.receive_output()
+        await communicator.wait()
+
+        return start, body["body"]
+
+    async def get(self, scope):
+        start, content = await self.get_response(scope)
+
+        return start, json.loads(content)
+
+    def test_get(self):
+        start, body = async_to_sync(self.get)(
+            build_scope("/v1/movies/search/", {"query": "The Matrix"})
+        )
+
+        # Verify response.
+        self.assertEqual(start["status"], 200)
+        self.assertDictEqual(body, fixtures.EXPECTED_RESPONSE_SEARCH_MOVIES)
+
+        # Verify the configuration was cached.
+        self.assertEqual(
+            json.loads(self.redis_mock.get(constants.TMDB_CONFIGURATION_KEY)),
+            fixtures.CONFIGURATION_RESPONSE,
+        )
+
+    def test_get_uses_cached_tmdb_configuration_if_present(self):
+        self.redis_mock.set(
+            constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        start, body = async_to_sync(self.get)(
+            build_scope("/v1/movies/search/", {"query": "The Matrix"})
+        )
+
+        # Verify response.
+        self.assertEqual(start["status"], 200)
+        self.assertDictEqual(body, fixtures.EXPECTED_RESPONSE_SEARCH_MOVIES)
+        self.assertEqual(
+            [request.url.path for request in self.tmdb_requests], ["/3/search/movie"]
+        )
+        self.assertEqual(self.tmdb_requests[0].url.params["query"], "The Matrix")
+
+    @override_settings(COMPRESSION_MIN_SIZE_IN_BYTES=0)
+    def test_get_compresses_results_when_accepted(self):
+        start, content = async_to_sync(self.get_response)(
+            build_scope(
+                "/v1/movies/search/",
+                {"query": "The Matrix"},
+                headers=[(b"accept-encoding", b"gzip, deflate, br")],
+            )
+        )
+
+        headers = dict(start["headers"])
+        self.assertEqual(headers[b"content-encoding"], b"br")
+        self.assertEqual(headers[b"vary"], b"Accept-Encoding")
+        self.assertDictEqual(
+            json.loads(brotli.decompress(content)),
+            fixtures.EXPECTED_RESPONSE_SEARCH_MOVIES,
+        )
+
+    def test_get_returns_error_when_tmdb_is_unavailable(self):
+        self.handle_tmdb_request = lambda request: httpx.Response(503)
+
+        with self.assertLogs("whichflix.movies.asgi", "ERROR"):
+            start, body = async_to_sync(self.get)(
+                build_scope("/v1/movies/search/", {"query": "The Matrix"})
+            )
+
+        # Verify response.
+        self.assertEqual(start["status"], 503)
+        self.assertEqual(body, {"error": "The Movie Database could not be reached."})
+        self.assertIn((b"access-control-allow-origin", b"*"), start["headers"])
+
+    def test_get_returns_error_when_tmdb_cannot_be_reached(self):
+        def handle_tmdb_request(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        self.handle_tmdb_request = handle_tmdb_request
+
+        with self.assertLogs("whichflix.movies.asgi", "ERROR"):
+            start, body = async_to_sync(self.get)(
+                build_scope("/v1/movies/search/", {"query": "The Matrix"})
+            )
+
+        # Verify response.
+        self.assertEqual(start["status"], 503)
+        self.assertEqual(body, {"error": "The Movie Database could not be reached."})
+
+    def test_get_returns_no_results_for_short_query(self):
+        start, body = async_to_sync(self.get)(
+            build_scope("/v1/movies/search/", {"query": "Th"})
+        )
+
+        self.assertEqual(body, {"results": []})
+        self.assertEqual(self.tmdb_requests, [])
+
+    def test_passes_other_requests_through(self):
+        async def application(scope, receive, send):
+            await send({"type": "passed"})
+
+        async def get():
+            communicator = ApplicationCommunicator(
+                AsyncMoviesRouter(application), build_scope("/v1/elections/")
+            )
+            message = await communicator.receive_output()
+            await communicator.wait()
+
+            return message
+
+        self.assertEqual(async_to_sync(get)(), {"type": "passed"})
+
+    async def _fail(self, scope, receive, send):
+        raise AssertionError("The request should have been served asynchronously.")
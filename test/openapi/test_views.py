@@ -0,0 +1,196 @@
+import gzip
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import brotli
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from whichflix import compression
+from whichflix.openapi import constants
+from whichflix.openapi import artifact
+from whichflix.openapi.artifact import (
+    build_schema,
+    get_schema_artifact,
+    get_schema_source_paths,
+    get_urlconf_fingerprint,
+    write_schema,
+)
+
+
+class TestOpenAPISchemaView(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.schema_path = os.path.join(self.directory.name, "openapi.json")
+        self.settings_override = override_settings(OPENAPI_SCHEMA_PATH=self.schema_path)
+        self.settings_override.enable()
+        get_schema_artifact.cache_clear()
+
+    def tearDown(self):
+        get_schema_artifact.cache_clear()
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_builds_and_stores_the_schema_when_missing(self):
+        response = self.client.get(reverse("openapi_schema"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertIn("/elections/", json.loads(response.content)["paths"])
+
+        with open(self.schema_path, "rb") as schema_file:
+            self.assertEqual(schema_file.read(), response.content)
+
+    def test_serves_the_stored_schema(self):
+        content = build_schema()
+        schema = json.loads(content)
+        schema["info"]["title"] = "Prebuilt"
+        write_schema(self.schema_path, json.dumps(schema).encode())
+
+        response = self.client.get(reverse("openapi_schema"))
+
+        self.assertEqual(json.loads(response.content)["info"]["title"], "Prebuilt")
+
+    def test_rebuilds_the_schema_when_the_urlconf_changed(self):
+        schema = json.loads(build_schema())
+        schema["info"]["title"] = "Stale"
+        schema[constants.URLCONF_FINGERPRINT_KEY] = get_urlconf_fingerprint(
+            "test.openapi.urls"
+        )
+        write_schema(self.schema_path, json.dumps(schema).encode())
+
+        response = self.client.get(reverse("openapi_schema"))
+
+        self.assertEqual(json.loads(response.content)["info"]["title"], "WhichFlix")
+
+    def test_compresses_the_schema_when_accepted(self):
+        plain_response = self.client.get(reverse("openapi_schema"))
+        brotli_response = self.client.get(
+            reverse("openapi_schema"), HTTP_ACCEPT_ENCODING="gzip, deflate, br"
+        )
+        gzipped_response = self.client.get(
+            reverse("openapi_schema"), HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(brotli_response["Content-Encoding"], "br")
+        self.assertEqual(
+            brotli.decompress(brotli_response.content), plain_response.content
+        )
+        self.assertEqual(gzipped_response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(gzipped_response.content), plain_response.content
+        )
+        self.assertIn("Accept-Encoding", gzipped_response["Vary"])
+        self.assertEqual(
+            len(
+                {
+                    plain_response["ETag"],
+                    brotli_response["ETag"],
+                    gzipped_response["ETag"],
+                }
+            ),
+            3,
+        )
+
+    def test_compresses_each_encoding_once(self):
+        with patch(
+            "whichflix.compression.compress", wraps=compression.compress
+        ) as compress_mock:
+            for _ in range(3):
+                self.client.get(
+                    reverse("openapi_schema"), HTTP_ACCEPT_ENCODING="gzip, br"
+                )
+
+        compress_mock.assert_called_once()
+
+    def test_returns_not_modified_for_a_matching_etag(self):
+        etag = self.client.get(reverse("openapi_schema"))["ETag"]
+
+        response = self.client.get(reverse("openapi_schema"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_ignores_the_etag_of_another_encoding(self):
+        etag = self.client.get(reverse("openapi_schema"), HTTP_ACCEPT_ENCODING="gzip")[
+            "ETag"
+        ]
+
+        response = self.client.get(reverse("openapi_schema"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestSwaggerOperation(SimpleTestCase):
+    def test_applies_the_operation_overrides(self):
+        operation = json.loads(build_schema())["paths"]["/elections/"]["get"]
+
+        self.assertEqual(operation["operationId"], "Get Elections")
+        self.assertEqual(
+            [parameter["name"] for parameter in operation["parameters"]],
+            ["X-Device-ID", "cursor", "limit", "view"],
+        )
+        self.assertIn(
+            "next_cursor", operation["responses"]["200"]["schema"]["properties"]
+        )
+
+
+class TestURLConfFingerprint(SimpleTestCase):
+    def test_is_stable(self):
+        self.assertEqual(get_urlconf_fingerprint(), get_urlconf_fingerprint())
+
+    def test_changes_when_an_endpoint_is_removed(self):
+        self.assertNotEqual(
+            get_urlconf_fingerprint(), get_urlconf_fingerprint("test.openapi.urls")
+        )
+
+    def test_changes_when_a_schema_module_changes(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        def get_copied_source_paths(view_modules, suffix=b""):
+            copied_paths = []
+
+            for index, path in enumerate(get_schema_source_paths(view_modules)):
+                copied_path = os.path.join(directory.name, "{}.py".format(index))
+
+                with open(path, "rb") as source_file:
+                    content = source_file.read()
+
+                with open(copied_path, "wb") as copied_file:
+                    copied_file.write(content + suffix)
+
+                copied_paths.append(copied_path)
+
+            return copied_paths
+
+        with patch.object(
+            artifact, "get_schema_source_paths", side_effect=get_copied_source_paths
+        ):
+            unchanged_fingerprint = get_urlconf_fingerprint()
+
+        with patch.object(
+            artifact,
+            "get_schema_source_paths",
+            side_effect=lambda view_modules: get_copied_source_paths(
+                view_modules, b"# Changed.\n"
+            ),
+        ):
+            changed_fingerprint = get_urlconf_fingerprint()
+
+        self.assertEqual(unchanged_fingerprint, get_urlconf_fingerprint())
+        self.assertNotEqual(changed_fingerprint, unchanged_fingerprint)
+
+    def test_covers_the_views_and_their_schemas(self):
+        paths = get_schema_source_paths({"whichflix.elections.views"})
+
+        self.assertEqual(
+            [os.path.relpath(path, os.path.dirname(path)) for path in paths],
+            ["schemas.py", "views.py"],
+        )
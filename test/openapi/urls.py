@@ -0,0 +1,8 @@
+from whichflix.urls import urlpatterns as project_urlpatterns
+
+# The project's URLconf with one endpoint removed.
+urlpatterns = [
+    pattern
+    for pattern in project_urlpatterns
+    if getattr(pattern, "name", None) != "votes"
+]
@@ -0,0 +1,157 @@
+import json
+from unittest.mock import patch
+
+import fakeredis
+import redis
+from django.test import SimpleTestCase, override_settings
+
+from test.movies import fixtures as movie_fixtures
+from whichflix.clients import (
+    InstrumentedRedis,
+    build_redis_client,
+    get_many,
+    redis_command_latencies,
+    set_many,
+)
+from whichflix.movies import constants as movie_constants, manager as movie_manager
+
+
+def build_fake_redis_client() -> InstrumentedRedis:
+    return InstrumentedRedis(
+        connection_pool=redis.ConnectionPool(
+            connection_class=fakeredis.FakeConnection, server=fakeredis.FakeServer()
+        )
+    )
+
+
+class TestBuildRedisClient(SimpleTestCase):
+    @override_settings(
+        REDIS_URL="redis://localhost:6379/2",
+        REDIS_MAX_CONNECTIONS=7,
+        REDIS_POOL_TIMEOUT_IN_SECONDS=0.5,
+        REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS=15,
+    )
+    def test_configures_the_connection_pool(self):
+        client = build_redis_client(socket_timeout=0.25)
+        connection_pool = client.connection_pool
+
+        self.assertIsInstance(connection_pool, redis.BlockingConnectionPool)
+        self.assertEqual(connection_pool.max_connections, 7)
+        self.assertEqual(connection_pool.timeout, 0.5)
+        self.assertEqual(connection_pool.connection_kwargs["db"], 2)
+        self.assertEqual(connection_pool.connection_kwargs["socket_timeout"], 0.25)
+        self.assertEqual(connection_pool.connection_kwargs["health_check_interval"], 15)
+
+
+class TestRedisCommandLatencies(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = build_fake_redis_client()
+        redis_command_latencies.reset()
+
+    def tearDown(self):
+        redis_command_latencies.reset()
+
+    def test_records_each_command(self):
+        self.redis_client.set("key", "value")
+        self.redis_client.get("key")
+        self.redis_client.get("key")
+
+        latencies = redis_command_latencies.get_latencies()
+
+        self.assertEqual(set(latencies), {"SET", "GET"})
+        self.assertEqual(latencies["GET"]["count"], 2)
+        self.assertGreaterEqual(latencies["GET"]["max_ms"], latencies["GET"]["mean_ms"])
+
+    def test_records_pipelines_as_one_command(self):
+        pipeline = self.redis_client.pipeline()
+        pipeline.set("key", "value")
+        pipeline.get("key")
+        pipeline.execute()
+
+        latencies = redis_command_latencies.get_latencies()
+
+        self.assertEqual(set(latencies), {"PIPELINE"})
+        self.assertEqual(latencies["PIPELINE"]["count"], 1)
+
+    @override_settings(REDIS_SLOW_COMMAND_THRESHOLD_IN_MS=0)
+    def test_logs_slow_commands(self):
+        with self.assertLogs("whichflix.clients", level="WARNING") as logs:
+            self.redis_client.get("key")
+
+        self.assertIn("Redis GET took", logs.output[0])
+
+    @override_settings(REDIS_LATENCY_REPORT_INTERVAL_IN_SECONDS=0)
+    def test_reports_latencies_periodically(self):
+        with self.assertLogs("whichflix.clients", level="INFO") as logs:
+            self.redis_client.get("key")
+
+        self.assertIn("Redis GET ran 1 times", logs.output[-1])
+        self.assertEqual(redis_command_latencies.get_latencies(), {})
+
+
+class TestPipelinedHelpers(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = build_fake_redis_client()
+        redis_command_latencies.reset()
+
+    def tearDown(self):
+        redis_command_latencies.reset()
+
+    def test_set_many_writes_every_key_in_one_round_trip(self):
+        set_many(self.redis_client, {"first": "1", "second": "2"}, ex=60)
+
+        self.assertEqual(self.redis_client.get("first"), b"1")
+        self.assertEqual(self.redis_client.get("second"), b"2")
+        self.assertEqual(self.redis_client.ttl("second"), 60)
+        self.assertEqual(
+            redis_command_latencies.get_latencies()["PIPELINE"]["count"], 1
+        )
+
+    def test_get_many_reads_every_key_in_one_round_trip(self):
+        self.redis_client.set("first", "1")
+        redis_command_latencies.reset()
+
+        values = get_many(self.redis_client, ["first", "missing"])
+
+        self.assertEqual(values, [b"1", None])
+        self.assertEqual(set(redis_command_latencies.get_latencies()), {"MGET"})
+
+    def test_empty_batches_skip_redis(self):
+        self.assertEqual(get_many(self.redis_client, []), [])
+        set_many(self.redis_client, {})
+
+        self.assertEqual(redis_command_latencies.get_latencies(), {})
+
+
+class TestGetMovieDocuments(SimpleTestCase):
+    def setUp(self):
+        self.redis_client = build_fake_redis_client()
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", self.redis_client
+        )
+        self.redis_patcher.start()
+
+        self.redis_client.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        for movie_id in ["603", "604"]:
+            self.redis_client.set(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id=movie_id),
+                json.dumps(dict(movie_fixtures.MOVIE_INFO_RESPONSE, id=int(movie_id))),
+            )
+
+        redis_command_latencies.reset()
+
+    def tearDown(self):
+        self.redis_patcher.stop()
+        redis_command_latencies.reset()
+
+    def test_reads_cached_movies_and_configuration_in_one_round_trip(self):
+        movie_documents = movie_manager.get_movie_documents(["603", "604", "603"])
+
+        self.assertEqual(set(movie_documents), {"603", "604"})
+        self.assertEqual(movie_documents["604"]["id"], "604")
+        self.assertEqual(set(redis_command_latencies.get_latencies()), {"MGET"})
+        self.assertEqual(redis_command_latencies.get_latencies()["MGET"]["count"], 1)
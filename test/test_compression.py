@@ -0,0 +1,161 @@
+import gzip
+import json
+from unittest.mock import patch
+
+import brotli
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from whichflix.compression import (
+    CompressionMiddleware,
+    PrecompressedContent,
+    compress,
+    get_accepted_encoding,
+    precompress,
+)
+
+# Repetitive, like an election document with many candidates.
+LARGE_DOCUMENT = {
+    "candidates": [
+        {
+            "id": str(candidate_id),
+            "movie": {
+                "title": "The Matrix",
+                "description": "Set in the 22nd century, The Matrix tells the story "
+                "of a computer hacker.",
+                "poster_url": "https://image.tmdb.org/t/p/w500/f89U3ADr1oiB1s9Gk.jpg",
+            },
+        }
+        for candidate_id in range(50)
+    ]
+}
+
+
+class TestGetAcceptedEncoding(SimpleTestCase):
+    def test_prefers_brotli(self):
+        self.assertEqual(get_accepted_encoding("gzip, deflate, br"), "br")
+
+    def test_falls_back_to_gzip(self):
+        self.assertEqual(get_accepted_encoding("deflate, gzip;q=0.5"), "gzip")
+
+    def test_skips_refused_encodings(self):
+        self.assertEqual(get_accepted_encoding("br;q=0, gzip"), "gzip")
+        self.assertIsNone(get_accepted_encoding("identity"))
+        self.assertIsNone(get_accepted_encoding(""))
+
+
+@override_settings(COMPRESSION_MIN_SIZE_IN_BYTES=1024)
+class TestCompressionMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.request_factory = RequestFactory()
+
+    def get(self, response, accept_encoding="gzip, deflate, br"):
+        middleware = CompressionMiddleware(lambda request: response)
+
+        return middleware(
+            self.request_factory.get(
+                "/v1/elections/", HTTP_ACCEPT_ENCODING=accept_encoding
+            )
+        )
+
+    def test_compresses_large_responses(self):
+        response = self.get(JsonResponse(LARGE_DOCUMENT))
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(
+            json.loads(brotli.decompress(response.content)), LARGE_DOCUMENT
+        )
+
+    def test_compresses_with_gzip_when_brotli_is_not_accepted(self):
+        response = self.get(JsonResponse(LARGE_DOCUMENT), accept_encoding="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.content)), LARGE_DOCUMENT)
+
+    def test_compresses_identical_responses_once(self):
+        document = dict(LARGE_DOCUMENT, title="Compressed once")
+
+        with patch("whichflix.compression.compress", wraps=compress) as compress_mock:
+            first_response = self.get(JsonResponse(document))
+            second_response = self.get(JsonResponse(document))
+            self.get(JsonResponse(document), accept_encoding="gzip")
+
+        self.assertEqual(first_response.content, second_response.content)
+        self.assertEqual(
+            [call.args[1] for call in compress_mock.call_args_list], ["br", "gzip"]
+        )
+
+    @override_settings(COMPRESSION_CACHE_SIZE=1)
+    def test_evicts_least_recently_compressed_responses(self):
+        documents = [dict(LARGE_DOCUMENT, title=title) for title in ["A", "B", "A"]]
+
+        with patch("whichflix.compression.compress", wraps=compress) as compress_mock:
+            for document in documents:
+                self.get(JsonResponse(document))
+
+        self.assertEqual(compress_mock.call_count, 3)
+
+    def test_leaves_small_responses_alone(self):
+        response = self.get(JsonResponse({"id": "abc"}))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_leaves_encoded_responses_alone(self):
+        document = PrecompressedContent(json.dumps(LARGE_DOCUMENT).encode())
+        precompressed_response = HttpResponse(
+            document.get("gzip"), content_type="application/json"
+        )
+        precompressed_response["Content-Encoding"] = "gzip"
+
+        response = self.get(precompressed_response)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response.content, document.get("gzip"))
+
+    def test_leaves_streams_alone(self):
+        response = self.get(
+            StreamingHttpResponse(
+                iter([b"data: {}\n\n"]), content_type="text/event-stream"
+            )
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_weakens_etags(self):
+        etagged_response = JsonResponse(LARGE_DOCUMENT)
+        etagged_response["ETag"] = '"abc"'
+
+        response = self.get(etagged_response)
+
+        self.assertEqual(response["ETag"], 'W/"abc"')
+
+
+class TestPrecompressedContent(SimpleTestCase):
+    def test_builds_responses_in_the_accepted_encoding(self):
+        content = json.dumps(LARGE_DOCUMENT).encode()
+        document = PrecompressedContent(content)
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        response = document.build_response(request, content_type="application/json")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(brotli.decompress(response.content), content)
+        self.assertIs(document.get("br"), document.get("br"))
+
+    def test_serves_stored_variants(self):
+        content = json.dumps(LARGE_DOCUMENT).encode()
+        variants = precompress(content)
+
+        with patch("whichflix.compression.compress") as compress_mock:
+            document = PrecompressedContent(content, variants)
+
+            self.assertEqual(document.get("br"), variants["br"])
+            self.assertEqual(document.get("gzip"), variants["gzip"])
+            self.assertEqual(document.get(None), content)
+
+        compress_mock.assert_not_called()
+        self.assertEqual(gzip.decompress(variants["gzip"]), content)
@@ -0,0 +1,90 @@
+from asgiref.sync import async_to_sync
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.client import ClientHandler
+from django.urls import reverse
+
+from whichflix.handlers import APIMiddlewareMixin, APIRouter, WSGIAPIRouter
+from whichflix.users.models import Device
+
+
+class APIProfileClientHandler(APIMiddlewareMixin, ClientHandler):
+    pass
+
+
+class APIProfileClient(Client):
+    """
+    Test client that serves requests with the API middleware profile.
+    """
+
+    def __init__(self, **defaults):
+        super().__init__(**defaults)
+        self.handler = APIProfileClientHandler(enforce_csrf_checks=False)
+
+
+class TestAPIMiddlewareProfile(TestCase):
+    def setUp(self):
+        self.url = reverse("elections")
+        self.device = Device.objects.create(device_token="some-device-token")
+        self.headers = {
+            "HTTP_X_DEVICE_ID": self.device.device_token,
+            "HTTP_ORIGIN": "https://whichflix.example",
+        }
+
+    def test_skips_session_and_admin_middleware(self):
+        full_response = self.client.get(self.url, **self.headers)
+        api_response = APIProfileClient().get(self.url, **self.headers)
+
+        self.assertEqual(api_response.status_code, 200)
+        self.assertEqual(api_response.json(), full_response.json())
+        self.assertIn("X-Frame-Options", full_response)
+        self.assertNotIn("X-Frame-Options", api_response)
+        self.assertFalse(hasattr(api_response.wsgi_request, "session"))
+        self.assertFalse(hasattr(api_response.wsgi_request, "_messages"))
+
+    def test_keeps_cors_headers(self):
+        response = APIProfileClient().get(self.url, **self.headers)
+
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+
+    @override_settings(QUERY_BUDGET_MODE="header")
+    def test_keeps_query_budgets(self):
+        response = APIProfileClient().get(self.url, **self.headers)
+
+        self.assertIn("X-Query-Count", response)
+
+
+class TestAPIRouter(SimpleTestCase):
+    def setUp(self):
+        self.served_by = []
+        self.router = APIRouter(self.build_application("full"))
+        self.router.api_application = self.build_application("api")
+
+    def build_application(self, name):
+        async def application(scope, receive, send):
+            self.served_by.append(name)
+
+        return application
+
+    def call(self, scope_type, path):
+        async_to_sync(self.router)({"type": scope_type, "path": path}, None, None)
+
+    def test_serves_api_requests_with_the_api_profile(self):
+        self.call("http", "/v1/elections/")
+        self.call("http", "/admin/")
+        self.call("http", "/openapi/")
+
+        self.assertEqual(self.served_by, ["api", "full", "full"])
+
+    def test_leaves_websockets_to_the_wrapped_application(self):
+        self.call("websocket", "/v1/events/")
+
+        self.assertEqual(self.served_by, ["full"])
+
+
+class TestWSGIAPIRouter(SimpleTestCase):
+    def test_serves_api_requests_with_the_api_profile(self):
+        router = WSGIAPIRouter(lambda environ, start_response: "full")
+        router.api_application = lambda environ, start_response: "api"
+
+        self.assertEqual(router({"PATH_INFO": "/v1/elections/"}, None), "api")
+        self.assertEqual(router({"PATH_INFO": "/admin/"}, None), "full")
@@ -0,0 +1,399 @@
+import json
+from unittest import skipUnless
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import fakeredis
+import responses
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from whichflix.elections import constants as election_constants, manager, sharding
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    Election,
+    Participant,
+    Vote,
+)
+from whichflix.movies import constants as movie_constants
+from whichflix.query_budget import QueryBudgetExceededError, QueryBudgetMiddleware
+from whichflix.users.models import Device
+from whichflix.utils import decode_external_id
+from test import factories
+from test.helpers import QueryBudgetTestMixin
+from test.movies import fixtures as movie_fixtures
+
+MOVIE_IDS = ["603", "604", "605", "606", "607"]
+SHARDS = ["default", "election_shard_1"]
+
+
+class TestQueryBudgets(QueryBudgetTestMixin, APITestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # Redis
+        self.redis_patcher = patch(
+            "whichflix.movies.manager.redis_client", fakeredis.FakeStrictRedis()
+        )
+        self.redis_mock = self.redis_patcher.start()
+        self.redis_mock.set(
+            movie_constants.TMDB_CONFIGURATION_KEY,
+            json.dumps(movie_fixtures.CONFIGURATION_RESPONSE),
+        )
+
+        for movie_id in MOVIE_IDS:
+            self.redis_mock.set(
+                movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id=movie_id),
+                json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+            )
+
+        self.device = factories.create_device(device_token="some-device-token")
+        self.headers = {"HTTP_X_DEVICE_ID": self.device.device_token}
+        self._set_up_election()
+
+    def _set_up_election(self):
+        # Set up an election with several participants, candidates and votes, so that
+        # per-row query patterns show up in the counts.
+        self.election = factories.create_election(device=self.device)
+        self.initiator = self.election.participants.first()
+        participants = [self.initiator] + [
+            factories.create_participant(
+                self.election, factories.create_device(device_token=str(index))
+            )
+            for index in range(3)
+        ]
+
+        for movie_id in MOVIE_IDS[:-1]:
+            candidate = factories.create_candidate(
+                self.election, self.initiator, movie_id
+            )
+
+            for participant in participants[1:]:
+                Vote.objects.create(participant=participant, candidate=candidate)
+
+        self.candidate = candidate
+
+    def tearDown(self):
+        # Redis
+        self.redis_patcher.stop()
+
+        # Clean up database.
+        Vote.objects.all().delete()
+        Candidate.objects.all().delete()
+        Participant.objects.all().delete()
+        Election.objects.all().delete()
+        Device.objects.all().delete()
+
+    def _election_url(self, view_name: str) -> str:
+        return reverse(view_name, kwargs={"election_id": self.election.external_id})
+
+    def test_get_election(self):
+        with self.assertWithinQueryBudget("election_detail"):
+            response = self.client.get(
+                self._election_url("election_detail"), **self.headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_put_election(self):
+        with self.assertWithinQueryBudget("election_detail"):
+            response = self.client.put(
+                self._election_url("election_detail"),
+                data={"title": "Updated title"},
+                format="json",
+                **self.headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_close_election(self):
+        with self.assertWithinQueryBudget("election_close"):
+            response = self.client.post(
+                self._election_url("election_close"), **self.headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_elections(self):
+        with self.assertWithinQueryBudget("elections"):
+            response = self.client.get(reverse("elections"), **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_create_election(self):
+        with self.assertWithinQueryBudget("elections"):
+            response = self.client.post(
+                reverse("elections"),
+                data={"title": "Movie night", "initiator_name": "John"},
+                format="json",
+                **self.headers
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_candidate(self):
+        with self.assertWithinQueryBudget("candidates"):
+            response = self.client.post(
+                self._election_url("candidates"),
+                data={"movie_id": MOVIE_IDS[-1]},
+                format="json",
+                **self.headers
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_candidates(self):
+        self.redis_mock.set(
+            movie_constants.TMDB_MOVIE_INFO_KEY.format(movie_id="608"),
+            json.dumps(movie_fixtures.MOVIE_INFO_RESPONSE),
+        )
+
+        with self.assertWithinQueryBudget("bulk_candidates"):
+            response = self.client.post(
+                self._election_url("bulk_candidates"),
+                data={"movie_ids": [MOVIE_IDS[-1], "608"]},
+                format="json",
+                **self.headers
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_participant(self):
+        headers = {"HTTP_X_DEVICE_ID": "new-device-token"}
+
+        with self.assertWithinQueryBudget("participants"):
+            response = self.client.post(
+                self._election_url("participants"),
+                data={"name": "Jane"},
+                format="json",
+                **headers
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_delete_participant(self):
+        headers = {"HTTP_X_DEVICE_ID": "0"}
+
+        with self.assertWithinQueryBudget("participants"):
+            response = self.client.delete(self._election_url("participants"), **headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_rejoin_participant(self):
+        headers = {"HTTP_X_DEVICE_ID": "0"}
+        self.client.delete(self._election_url("participants"), **headers)
+
+        # Rejoining logs the votes of the participant as cast again.
+        with self.assertWithinQueryBudget("participants"):
+            response = self.client.post(
+                self._election_url("participants"),
+                data={"name": "Jane"},
+                format="json",
+                **headers
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_cast_vote(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+
+        with self.assertWithinQueryBudget("votes"):
+            response = self.client.post(url, data={}, format="json", **self.headers)
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_update_votes(self):
+        candidate_ids = list(self.election.candidates.values_list("id", flat=True))
+
+        # Set up a removed vote to cast again and an active vote to remove, so that
+        # every kind of vote change is written.
+        for candidate_id in [candidate_ids[0], candidate_ids[2]]:
+            url = reverse("votes", kwargs={"candidate_id": candidate_id})
+            self.client.post(url, data={}, format="json", **self.headers)
+
+        url = reverse("votes", kwargs={"candidate_id": candidate_ids[0]})
+        self.client.delete(url, **self.headers)
+
+        operations = [
+            {"candidate_id": str(candidate_id), "action": "vote"}
+            for candidate_id in candidate_ids[:2]
+        ] + [
+            {"candidate_id": str(candidate_id), "action": "remove_vote"}
+            for candidate_id in candidate_ids[2:]
+        ]
+
+        with self.assertWithinQueryBudget("election_votes"):
+            response = self.client.post(
+                self._election_url("election_votes"),
+                data={"operations": operations},
+                format="json",
+                **self.headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_vote(self):
+        url = reverse("votes", kwargs={"candidate_id": self.candidate.id})
+        headers = {"HTTP_X_DEVICE_ID": "0"}
+
+        with self.assertWithinQueryBudget("votes"):
+            response = self.client.delete(url, **headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    @responses.activate
+    def test_search_movies(self):
+        responses.add(
+            responses.GET,
+            "https://api.themoviedb.org/3/search/movie",
+            json=movie_fixtures.SEARCH_MOVIES_RESPONSE,
+            status=200,
+        )
+        url = "{base_url}?{parameters}".format(
+            base_url=reverse("movies_search"),
+            parameters=urlencode({"query": "The Matrix"}),
+        )
+
+        with self.assertWithinQueryBudget("movies_search"):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_BUDGET_MODE="header")
+    def test_middleware_reports_query_count_in_headers(self):
+        response = self.client.get(self._election_url("election_detail"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Query-Count", response)
+        self.assertIn("X-Query-Duration-Ms", response)
+        self.assertEqual(response["X-Query-Repeated-Shapes"], "0")
+
+    @override_settings(QUERY_BUDGET_MODE="raise", QUERY_BUDGETS={"election_detail": 1})
+    def test_middleware_raises_when_over_budget(self):
+        with self.assertRaises(QueryBudgetExceededError):
+            self.client.get(self._election_url("election_detail"))
+
+
+@skipUnless(
+    "election_shard_1" in settings.DATABASES, "Requires a second election shard."
+)
+@override_settings(
+    ELECTION_LOGICAL_SHARD_MAP={
+        logical_shard: "election_shard_1"
+        for logical_shard in range(election_constants.ELECTION_LOGICAL_SHARD_COUNT)
+    }
+)
+class TestQueryBudgetsOnOtherShard(TestQueryBudgets):
+    """
+    The same requests against an election on another database than the devices, the
+    worst case, where ids are allocated separately and devices are looked up apart.
+    """
+
+    def _set_up_election(self):
+        response = self.client.post(
+            reverse("elections"),
+            data={"title": "Movie night", "initiator_name": "John"},
+            format="json",
+            **self.headers
+        )
+        election_id = decode_external_id(response.json()["id"])
+        self.election = Election.objects.using(
+            sharding.get_shard_for_id(election_id)
+        ).get(id=election_id)
+        self.initiator = self.election.participants.get()
+
+        for index in range(3):
+            self.client.post(
+                self._election_url("participants"),
+                data={"name": "Jane"},
+                format="json",
+                HTTP_X_DEVICE_ID=str(index),
+            )
+
+        for movie_id in MOVIE_IDS[:-1]:
+            candidate_id = self.client.post(
+                self._election_url("candidates"),
+                data={"movie_id": movie_id},
+                format="json",
+                **self.headers
+            ).json()["candidates"][-1]["id"]
+
+            for index in range(3):
+                self.client.post(
+                    reverse("votes", kwargs={"candidate_id": candidate_id}),
+                    data={},
+                    format="json",
+                    HTTP_X_DEVICE_ID=str(index),
+                )
+
+        self.candidate = self.election.candidates.get(id=candidate_id)
+
+    @override_settings(
+        ELECTION_LOGICAL_SHARD_MAP={
+            logical_shard: SHARDS[logical_shard % len(SHARDS)]
+            for logical_shard in range(election_constants.ELECTION_LOGICAL_SHARD_COUNT)
+        }
+    )
+    def test_get_elections_across_shards(self):
+        # Set up elections on both databases, one of them archived on each.
+        for _ in range(6):
+            self.client.post(
+                reverse("elections"),
+                data={"title": "Movie night", "initiator_name": "John"},
+                format="json",
+                **self.headers
+            )
+
+        memberships = self.device.election_memberships.order_by("election_id")
+        election_ids_by_shard = sharding.group_ids_by_shard(
+            memberships.values_list("election_id", flat=True)
+        )
+        self.assertEqual(set(election_ids_by_shard), set(SHARDS))
+
+        for shard, election_ids in election_ids_by_shard.items():
+            Election.objects.using(shard).filter(id=election_ids[0]).update(
+                closed_at=timezone.now()
+            )
+            manager.archive_closed_elections(timezone.now(), 1, shard)
+
+        for view in [
+            election_constants.ELECTIONS_VIEW_FULL,
+            election_constants.ELECTIONS_VIEW_SUMMARY,
+        ]:
+            with self.assertWithinQueryBudget("elections"):
+                response = self.client.get(
+                    reverse("elections"), data={"view": view}, **self.headers
+                )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["results"]), memberships.count(), view)
+
+    def tearDown(self):
+        for model in [ArchivedElection, Vote, Candidate, Participant, Election]:
+            model.objects.using("election_shard_1").all().delete()
+
+        super().tearDown()
+
+
+class TestQueryBudgetMiddleware(TestCase):
+    databases = "__all__"
+
+    @override_settings(QUERY_BUDGET_MODE="header")
+    def test_records_queries_on_every_database(self):
+        def get_response(request):
+            for alias in connections:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+
+            return HttpResponse()
+
+        middleware = QueryBudgetMiddleware(get_response)
+        response = middleware(RequestFactory().get("/"))
+
+        self.assertEqual(response["X-Query-Count"], str(len(connections.databases)))
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+from whichflix.management.commands.benchmark_startup import parse_import_times
+
+# Modules that are only needed once a request uses them.
+DEFERRED_MODULES = ["drf_yasg.codecs", "httpx", "requests", "tmdbsimple"]
+
+# Modules that only schema builds need, which loading the views does not import.
+SCHEMA_MODULES = [
+    "drf_yasg.codecs",
+    "drf_yasg.openapi",
+    "drf_yasg.utils",
+    "whichflix.elections.schemas",
+    "whichflix.movies.schemas",
+]
+
+
+def get_imported_modules(script: str) -> set:
+    """
+    Modules imported by a fresh interpreter once it has run `script`.
+    """
+    script += "\nimport json, sys; print(json.dumps(list(sys.modules)))"
+    # Booting does not connect to Redis, so it does not need a Redis URL either.
+    environment = dict(os.environ, REDIS_URL="")
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+
+    return set(json.loads(result.stdout))
+
+
+class TestWorkerStartup(SimpleTestCase):
+    def test_boot_defers_modules_off_the_hot_path(self):
+        imported_modules = get_imported_modules("import whichflix.asgi")
+
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, imported_modules)
+
+    def test_first_request_defers_schema_modules(self):
+        imported_modules = get_imported_modules(
+            "import whichflix.asgi\n"
+            "from django.urls import get_resolver\n"
+            "get_resolver().url_patterns"
+        )
+
+        for module in SCHEMA_MODULES:
+            self.assertNotIn(module, imported_modules)
+
+    def test_parse_import_times_sums_self_time_by_package(self):
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:      1500 |       1500 |     django.utils",
+                "import time:       500 |       2000 |   django",
+                "import time:       250 |        250 | redis",
+            ]
+        )
+
+        import_times = parse_import_times(output)
+
+        self.assertEqual(import_times, {"django": 2.0, "redis": 0.25})
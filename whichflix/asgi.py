@@ -2,6 +2,9 @@
 ASGI config for whichflix project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Event streams and movie search are served directly by the ASGI application, and
+every other request is handled by Django, with a leaner middleware profile for the
+API.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -11,6 +14,12 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "whichflix.settings.base")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "whichflix.settings.production")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from whichflix.events.streams import EventStreamRouter  # noqa: E402
+from whichflix.handlers import APIRouter  # noqa: E402
+from whichflix.movies.asgi import AsyncMoviesRouter  # noqa: E402
+
+application = EventStreamRouter(AsyncMoviesRouter(APIRouter(django_application)))
@@ -1,5 +1,161 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
 import redis
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCommandLatencies:
+    """
+    Count, total and maximum latency of each Redis command run by this process since
+    they were last reported. Pipelines are recorded as a single `PIPELINE` command.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._reported_at = time.monotonic()
+
+    def record(self, command: str, duration: float) -> None:
+        duration_in_ms = duration * 1000
+
+        with self._lock:
+            latencies = self._latencies.setdefault(command, [0, 0.0, 0.0])
+            latencies[0] += 1
+            latencies[1] += duration_in_ms
+            latencies[2] = max(latencies[2], duration_in_ms)
+
+        if duration_in_ms >= settings.REDIS_SLOW_COMMAND_THRESHOLD_IN_MS:
+            logger.warning("Redis %s took %.1f ms.", command, duration_in_ms)
+
+        if (
+            time.monotonic() - self._reported_at
+            >= settings.REDIS_LATENCY_REPORT_INTERVAL_IN_SECONDS
+        ):
+            self.report()
+
+    def report(self) -> None:
+        """
+        Logs the latencies recorded since the last report, then starts over.
+        """
+        with self._lock:
+            latencies = self._get_latencies()
+            elapsed = time.monotonic() - self._reported_at
+            self._latencies.clear()
+            self._reported_at = time.monotonic()
+
+        for command, command_latencies in sorted(latencies.items()):
+            logger.info(
+                "Redis %s ran %d times in %.0f s: mean %.1f ms, max %.1f ms.",
+                command,
+                command_latencies["count"],
+                elapsed,
+                command_latencies["mean_ms"],
+                command_latencies["max_ms"],
+            )
+
+    def get_latencies(self) -> Dict[str, dict]:
+        with self._lock:
+            return self._get_latencies()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._reported_at = time.monotonic()
+
+    def _get_latencies(self) -> Dict[str, dict]:
+        return {
+            command: {
+                "count": count,
+                "total_ms": total,
+                "mean_ms": total / count,
+                "max_ms": maximum,
+            }
+            for command, (count, total, maximum) in self._latencies.items()
+        }
+
+
+redis_command_latencies = RedisCommandLatencies()
+
+
+class InstrumentedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        started_at = time.perf_counter()
+
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            redis_command_latencies.record(
+                str(args[0]).upper(), time.perf_counter() - started_at
+            )
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        started_at = time.perf_counter()
+
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            redis_command_latencies.record("PIPELINE", time.perf_counter() - started_at)
+
+
+def build_redis_client(**connection_options) -> InstrumentedRedis:
+    # A blocking pool caps the connections a process opens and makes requests wait
+    # for one to be released, instead of opening a new connection per thread.
+    connection_pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_IN_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_IN_SECONDS,
+        socket_keepalive=True,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS,
+        **connection_options,
+    )
+
+    return InstrumentedRedis(connection_pool=connection_pool)
+
+
+# Constructed on first use, so that importing a module that talks to Redis neither
+# needs REDIS_URL nor builds a connection pool in processes that never use it.
+redis_client = SimpleLazyObject(
+    lambda: build_redis_client(socket_timeout=settings.REDIS_SOCKET_TIMEOUT_IN_SECONDS)
+)
+
+# Subscriptions wait on reads until a message is published, so they have no read
+# timeout and draw from a pool of their own.
+redis_subscriber_client = SimpleLazyObject(build_redis_client)
+
+
+def get_many(client: redis.Redis, keys: List[str]) -> List[Optional[bytes]]:
+    """
+    Reads several keys in one round trip. Missing keys read as None.
+    """
+    return client.mget(keys) if keys else []
+
+
+def set_many(
+    client: redis.Redis, values: Dict[str, Union[bytes, str]], ex: Optional[int] = None
+) -> None:
+    """
+    Writes several keys, each expiring after `ex` seconds, in one round trip.
+    """
+    if not values:
+        return
+
+    pipeline = client.pipeline(transaction=False)
 
-from whichflix.settings.base import REDIS_URL
+    for key, value in values.items():
+        pipeline.set(key, value, ex=ex)
 
-redis_client = redis.Redis.from_url(REDIS_URL)  # type: ignore
+    pipeline.execute()
@@ -0,0 +1,198 @@
+import gzip
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import brotli
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+# Encodings we respond with, in order of preference. Brotli compresses our JSON
+# noticeably smaller than gzip at a similar cost.
+ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_CONTENT_TYPE_PATTERN = re.compile(r"^(application/json|text/)")
+
+# Levels for responses compressed as they are served, which trade a little size for
+# speed, and for cached documents compressed once and served many times.
+BROTLI_QUALITY = 5
+BROTLI_PRECOMPRESSED_QUALITY = 11
+GZIP_COMPRESSION_LEVEL = 6
+GZIP_PRECOMPRESSED_COMPRESSION_LEVEL = 9
+
+
+def get_accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The preferred encoding that an Accept-Encoding header allows, if any.
+    """
+    accepted_encodings = set()
+
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+        quality = parameters.strip()
+
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+
+        accepted_encodings.add(name.strip().lower())
+
+    return next(
+        (encoding for encoding in ENCODINGS if encoding in accepted_encodings), None
+    )
+
+
+def compress(content: bytes, encoding: str, precompressing: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(
+            content,
+            quality=BROTLI_PRECOMPRESSED_QUALITY if precompressing else BROTLI_QUALITY,
+        )
+
+    # A fixed mtime keeps the compressed bytes identical across processes.
+    return gzip.compress(
+        content,
+        compresslevel=(
+            GZIP_PRECOMPRESSED_COMPRESSION_LEVEL
+            if precompressing
+            else GZIP_COMPRESSION_LEVEL
+        ),
+        mtime=0,
+    )
+
+
+def precompress(content: bytes) -> Dict[str, bytes]:
+    """
+    Every compressed variant of a document, at the highest level, to be stored with it.
+    """
+    return {
+        encoding: compress(content, encoding, precompressing=True)
+        for encoding in ENCODINGS
+    }
+
+
+class CompressedContentCache:
+    """
+    The most recently compressed responses, keyed by a digest of their content, so
+    identical responses served repeatedly, such as an election document polled by its
+    participants, are only compressed once per process.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compress(self, content: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(content, digest_size=16).digest(), encoding)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        compressed_content = compress(content, encoding)
+
+        with self._lock:
+            self._entries[key] = compressed_content
+
+            while len(self._entries) > settings.COMPRESSION_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+        return compressed_content
+
+
+compressed_content_cache = CompressedContentCache()
+
+
+class PrecompressedContent:
+    """
+    Cached document stored alongside its compressed variants. Each variant is
+    compressed at the highest level the first time a client asks for it, unless it
+    was stored with the document, and never again.
+    """
+
+    def __init__(
+        self, content: bytes, variants: Optional[Dict[str, bytes]] = None
+    ) -> None:
+        self.content = content
+        self._variants: Dict[str, bytes] = dict(variants or {})
+        self._lock = threading.Lock()
+
+    def get(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.content
+
+        with self._lock:
+            if encoding not in self._variants:
+                self._variants[encoding] = compress(
+                    self.content, encoding, precompressing=True
+                )
+
+            return self._variants[encoding]
+
+    def build_response(self, request: HttpRequest, content_type: str) -> HttpResponse:
+        encoding = get_accepted_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        response = HttpResponse(self.get(encoding), content_type=content_type)
+
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compresses JSON and text responses of at least `COMPRESSION_MIN_SIZE_IN_BYTES`
+    with the best encoding the client accepts, reusing the compressed bytes of
+    identical responses. Responses that are already encoded, such as precompressed
+    documents, and streams are left alone.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not COMPRESSIBLE_CONTENT_TYPE_PATTERN.match(
+                response.get("Content-Type", "")
+            )
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE_IN_BYTES
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = get_accepted_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+        if encoding is None:
+            return response
+
+        compressed_content = compressed_content_cache.compress(
+            response.content, encoding
+        )
+
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response["Content-Length"] = str(len(compressed_content))
+        response["Content-Encoding"] = encoding
+
+        # The encoded bytes differ from those the ETag was computed for.
+        etag = response.get("ETag")
+
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        return response
@@ -1,9 +1,20 @@
 from django.contrib import admin
 
-from whichflix.elections.models import Election, Participant, Candidate, Vote
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    CandidateTallySnapshot,
+    Election,
+    Participant,
+    Vote,
+    VoteEvent,
+)
 
 
 admin.site.register(Election)
 admin.site.register(Participant)
 admin.site.register(Candidate)
 admin.site.register(Vote)
+admin.site.register(ArchivedElection)
+admin.site.register(VoteEvent)
+admin.site.register(CandidateTallySnapshot)
@@ -1,6 +1,13 @@
+import json
 from typing import List, Optional
 
-from whichflix.elections.models import Candidate, Election, Participant
+from whichflix.compression import PrecompressedContent
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    Election,
+    Participant,
+)
 from whichflix.movies import manager as movie_manager
 
 
@@ -11,6 +18,7 @@ def build_election_document(
         "id": election.external_id,
         "title": election.title,
         "created_at": election.created_at.isoformat(),
+        "closed_at": election.closed_at.isoformat() if election.closed_at else None,
         "participants": _build_participant_documents_for_election(election),
         "candidates": _build_candidate_documents_for_election(
             election, candidate_actions_map
@@ -18,6 +26,81 @@ def build_election_document(
     }
 
 
+def build_election_summary_document(election: Election) -> dict:
+    leading_candidate = None
+
+    if election.leading_candidate_id is not None:
+        leading_candidate = {
+            "id": str(election.leading_candidate_id),
+            "movie_id": election.leading_candidate_movie_id,
+            "vote_count": election.leading_candidate_vote_count,
+        }
+
+    return {
+        "id": election.external_id,
+        "title": election.title,
+        "created_at": election.created_at.isoformat(),
+        "closed_at": election.closed_at.isoformat() if election.closed_at else None,
+        "participant_count": election.participant_count,
+        "candidate_count": election.candidate_count,
+        "leading_candidate": leading_candidate,
+    }
+
+
+def build_archived_election_document(archived_election: ArchivedElection) -> dict:
+    return json.loads(archived_election.document)
+
+
+def build_archived_election_content(
+    archived_election: ArchivedElection,
+) -> PrecompressedContent:
+    return PrecompressedContent(
+        archived_election.document.encode(),
+        {
+            "br": bytes(archived_election.document_br),
+            "gzip": bytes(archived_election.document_gzip),
+        },
+    )
+
+
+def build_archived_election_summary_document(
+    archived_election: ArchivedElection,
+) -> dict:
+    election_document = build_archived_election_document(archived_election)
+    candidate_documents = election_document["candidates"]
+    leading_candidate = None
+    voted_candidate_documents = [
+        candidate_document
+        for candidate_document in candidate_documents
+        if candidate_document["vote_count"] > 0
+    ]
+
+    if voted_candidate_documents:
+        # Ties go to the oldest candidate, as they do for live elections.
+        leading_candidate_document = min(
+            voted_candidate_documents,
+            key=lambda candidate_document: (
+                -candidate_document["vote_count"],
+                int(candidate_document["id"]),
+            ),
+        )
+        leading_candidate = {
+            "id": leading_candidate_document["id"],
+            "movie_id": leading_candidate_document["movie"]["id"],
+            "vote_count": leading_candidate_document["vote_count"],
+        }
+
+    return {
+        "id": election_document["id"],
+        "title": election_document["title"],
+        "created_at": election_document["created_at"],
+        "closed_at": election_document["closed_at"],
+        "participant_count": len(election_document["participants"]),
+        "candidate_count": len(candidate_documents),
+        "leading_candidate": leading_candidate,
+    }
+
+
 def _build_paticipant_document(participant: Participant) -> dict:
     return {
         "id": str(participant.id),
@@ -27,26 +110,37 @@ def _build_paticipant_document(participant: Participant) -> dict:
 
 
 def _build_participant_documents_for_election(election: Election) -> List[dict]:
+    # Sorted here rather than with `order_by`, which would bypass prefetched
+    # participants, so elections that were not prefetched keep the same order.
+    participants = sorted(
+        election.participants.all(),
+        key=lambda participant: (participant.name, participant.id),
+    )
+
     return [
         _build_paticipant_document(participant)
-        for participant in election.participants.order_by("id").order_by("name").all()
+        for participant in participants
         if participant.deleted_at is None
     ]
 
 
-def build_candidate_document(candidate: Candidate, actions: Optional[dict]) -> dict:
+def build_candidate_document(
+    candidate: Candidate, actions: Optional[dict], movie_document: Optional[dict] = None
+) -> dict:
+    voting_participants = [
+        vote.participant
+        for vote in candidate.prefetched_votes
+        if vote.deleted_at is None and vote.participant.deleted_at is None
+    ]
+
     return {
         "id": str(candidate.id),
         "actions": actions,
-        "movie": movie_manager.get_movie_document(candidate.movie_id),
-        "vote_count": candidate.votes.filter(
-            participant__deleted_at__isnull=True, deleted_at__isnull=True
-        ).count(),
+        "movie": movie_document or movie_manager.get_movie_document(candidate.movie_id),
+        "vote_count": len(voting_participants),
         "voting_participants": [
-            _build_paticipant_document(vote.participant)
-            for vote in candidate.votes.filter(
-                participant__deleted_at__isnull=True, deleted_at__isnull=True
-            ).all()
+            _build_paticipant_document(participant)
+            for participant in voting_participants
         ],
     }
 
@@ -54,13 +148,20 @@ def build_candidate_document(candidate: Candidate, actions: Optional[dict]) -> d
 def _build_candidate_documents_for_election(
     election: Election, candidate_actions_map: Optional[dict] = None
 ) -> List[dict]:
+    candidates = election.candidates.all()
+    # Every candidate's movie is read from the cache in a single round trip.
+    movie_documents = movie_manager.get_movie_documents(
+        [candidate.movie_id for candidate in candidates]
+    )
     candidate_documents = []
 
-    for candidate in election.candidates.all():
+    for candidate in candidates:
         actions = (
             candidate_actions_map.get(candidate.id) if candidate_actions_map else None
         )
-        candidate_document = build_candidate_document(candidate, actions)
+        candidate_document = build_candidate_document(
+            candidate, actions, movie_documents[candidate.movie_id]
+        )
         candidate_documents.append(candidate_document)
 
     return candidate_documents
@@ -0,0 +1,78 @@
+#
+# Pagination
+#
+
+
+ELECTIONS_DEFAULT_PAGE_SIZE = 20
+ELECTIONS_MAX_PAGE_SIZE = 50
+
+
+#
+# Request limits
+#
+
+
+# Maximum number of vote operations in a single request.
+VOTE_OPERATIONS_MAX_COUNT = 100
+
+# Maximum number of movies added as candidates in a single request.
+BULK_CANDIDATES_MAX_COUNT = 50
+
+
+#
+# Representations
+#
+
+
+ELECTIONS_VIEW_FULL = "full"
+ELECTIONS_VIEW_SUMMARY = "summary"
+
+
+#
+# Vote buffer
+#
+
+
+# Maximum number of votes written by a single statement.
+VOTE_WRITE_BATCH_SIZE = 500
+VOTE_BUFFER_FLUSH_INTERVAL_IN_SECONDS = 1.0
+
+# Another worker may flush an election once its flush has not made progress for this
+# long.
+VOTE_BUFFER_FLUSH_LOCK_TTL_IN_SECONDS = 60
+
+
+#
+# Tally events
+#
+
+
+# Tally versions outlive any burst of tally events that could still be coalesced.
+CANDIDATE_TALLY_VERSION_TTL_IN_SECONDS = 24 * 60 * 60
+
+
+#
+# Sharding
+#
+
+
+# Election, candidate and participant ids end in one of this many logical shards, which
+# are assigned to databases by `ELECTION_LOGICAL_SHARD_MAP`. Changing it re-routes
+# existing ids.
+ELECTION_LOGICAL_SHARD_COUNT = 64
+
+
+#
+# Redis keys
+#
+
+
+VOTE_BUFFER_KEY = "elections:election:{election_id}:votes:buffer"
+VOTE_BUFFER_FLUSHING_KEY = "elections:election:{election_id}:votes:flushing"
+VOTE_BUFFER_KEY_PATTERN = "elections:election:*:votes:*"
+# Buffered votes that could not be written, kept for inspection. It is deliberately
+# not matched by `VOTE_BUFFER_KEY_PATTERN`, so they are not flushed again.
+VOTE_BUFFER_FAILED_KEY = "elections:election:{election_id}:failed_votes"
+VOTE_BUFFER_PENDING_ELECTIONS_KEY = "elections:votes:buffer:pending"
+VOTE_BUFFER_FLUSH_LOCK_KEY = "elections:election:{election_id}:votes_flush_lock"
+CANDIDATE_TALLY_VERSION_KEY = "elections:candidate:{candidate_id}:tally_version"
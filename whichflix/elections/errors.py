@@ -2,6 +2,10 @@ class ParticipantNotPartOfElectionError(Exception):
     message = "The participant is not part of the election."
 
 
+class CandidateNotPartOfElectionError(Exception):
+    message = "The candidate is not part of the election."
+
+
 class CandidateAlreadyExistsError(Exception):
     message = "A candidate for the movie provided already exists."
 
@@ -10,9 +14,21 @@ class MovieDoesNotExistError(Exception):
     message = "Movie does not exist."
 
 
+class MovieDatabaseUnavailableError(Exception):
+    message = "Movies cannot be looked up right now. Please try again."
+
+
 class ParticipantAlreadyVotedForCandidate(Exception):
     message = "The participant has already voted for the candidate."
 
 
 class ParticipantDidNotInitiateElectionError(Exception):
     message = "The participant is not the initiator of the election."
+
+
+class ElectionClosedError(Exception):
+    message = "The election is closed."
+
+
+class VoteFlushLockLostError(Exception):
+    message = "Another worker took over flushing the buffered votes of the election."
@@ -0,0 +1,46 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from whichflix.elections import manager, sharding
+
+
+class Command(BaseCommand):
+    help = "Move elections closed longer than the retention window into cold storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retention-days", type=int, default=30)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--pause", type=float, default=0.0, help="Seconds to sleep between batches."
+        )
+
+    def handle(self, *args, **options):
+        closed_before = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(
+            days=options["retention_days"]
+        )
+        total_archived = 0
+
+        for shard in sharding.get_election_shards():
+            # Batches resume after the last election attempted, so elections that
+            # failed to archive do not block the ones after them.
+            after_election_id = 0
+
+            while True:
+                archived, last_election_id = manager.archive_closed_elections(
+                    closed_before,
+                    options["batch_size"],
+                    using=shard,
+                    after_election_id=after_election_id,
+                )
+                total_archived += archived
+
+                if last_election_id is None:
+                    break
+
+                after_election_id = last_election_id
+                time.sleep(options["pause"])
+
+        self.stdout.write("Archived {} elections.".format(total_archived))
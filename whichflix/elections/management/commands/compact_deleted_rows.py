@@ -0,0 +1,112 @@
+import datetime
+import time
+from typing import Callable, Dict, Tuple
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from whichflix.elections import manager, sharding
+
+COMPACTED_TABLES = ["elections_vote", "elections_participant"]
+
+
+class Command(BaseCommand):
+    help = "Hard-delete soft-deleted votes and participants older than a grace period."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-days", type=int, default=7)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to sleep between batches, to keep lock time and I/O low.",
+        )
+
+    def handle(self, *args, **options):
+        deleted_before = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(
+            days=options["grace_days"]
+        )
+
+        for shard in sharding.get_election_shards():
+            index_sizes_before = _get_index_sizes(shard)
+
+            reclaimed_votes, _ = self._compact(
+                lambda *args: (manager.compact_deleted_votes(*args), 0),
+                deleted_before,
+                shard,
+                options,
+            )
+            # Votes of departed participants are deleted along with them.
+            reclaimed_participants, reclaimed_participant_votes = self._compact(
+                manager.compact_deleted_participants, deleted_before, shard, options
+            )
+            reclaimed_votes += reclaimed_participant_votes
+
+            self.stdout.write("Reclaimed {} votes.".format(reclaimed_votes))
+            self.stdout.write(
+                "Reclaimed {} participants.".format(reclaimed_participants)
+            )
+            self._write_index_sizes(index_sizes_before, _get_index_sizes(shard))
+
+    def _compact(
+        self,
+        compact: Callable[[datetime.datetime, int, str], Tuple[int, int]],
+        deleted_before: datetime.datetime,
+        shard: str,
+        options: dict,
+    ) -> Tuple[int, int]:
+        """
+        Run `compact` in batches until a batch comes back partial. It returns the rows
+        of the batch and the dependent votes deleted along with them.
+        """
+        total_reclaimed = 0
+        total_reclaimed_votes = 0
+
+        while True:
+            reclaimed, reclaimed_votes = compact(
+                deleted_before, options["batch_size"], shard
+            )
+            total_reclaimed += reclaimed
+            total_reclaimed_votes += reclaimed_votes
+
+            if reclaimed < options["batch_size"]:
+                return total_reclaimed, total_reclaimed_votes
+
+            time.sleep(options["pause"])
+
+    def _write_index_sizes(self, before: Dict[str, int], after: Dict[str, int]):
+        if not before:
+            self.stdout.write("Index sizes are only reported on PostgreSQL.")
+            return
+
+        # These are raw on-disk sizes, not bloat estimates. Deleted tuples only shrink
+        # indexes once vacuum has processed them, so the after sizes still include
+        # dead entries waiting to be reclaimed.
+        self.stdout.write("Index sizes on disk, before and after compaction:")
+
+        for index_name, size_before in sorted(before.items()):
+            self.stdout.write(
+                "{index}: {before} bytes -> {after} bytes".format(
+                    index=index_name, before=size_before, after=after.get(index_name)
+                )
+            )
+
+
+def _get_index_sizes(using: str) -> Dict[str, int]:
+    connection = connections[using]
+
+    if connection.vendor != "postgresql":
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT indexrelname, pg_relation_size(indexrelid)
+            FROM pg_stat_user_indexes
+            WHERE relname = ANY(%s)
+            """,
+            [COMPACTED_TABLES],
+        )
+        return dict(cursor.fetchall())
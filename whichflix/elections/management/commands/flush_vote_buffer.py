@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from whichflix.elections import constants, manager
+
+
+class Command(BaseCommand):
+    help = "Write votes buffered in Redis to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=constants.VOTE_BUFFER_FLUSH_INTERVAL_IN_SECONDS,
+            help="Seconds to sleep between flushes.",
+        )
+        parser.add_argument("--once", action="store_true", help="Flush once and exit.")
+
+    def handle(self, *args, **options):
+        # Pick up votes left behind by a worker that stopped mid-flush.
+        recovered = manager.recover_buffered_votes()
+        self.stdout.write(
+            "Recovered buffered votes for {} elections.".format(recovered)
+        )
+
+        while True:
+            flushed = manager.flush_buffered_votes()
+
+            if options["once"]:
+                self.stdout.write("Flushed {} votes.".format(flushed))
+                break
+
+            time.sleep(options["interval"])
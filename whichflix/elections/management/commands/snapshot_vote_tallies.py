@@ -0,0 +1,29 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from whichflix.elections import manager, sharding
+
+
+class Command(BaseCommand):
+    help = "Snapshot the tallies of elections with new vote events."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settle-seconds",
+            type=int,
+            default=60,
+            help="Only include vote events older than this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        created_before = datetime.datetime.now(tz=timezone.utc) - datetime.timedelta(
+            seconds=options["settle_seconds"]
+        )
+        snapshotted = sum(
+            manager.snapshot_candidate_tallies(created_before, using=shard)
+            for shard in sharding.get_election_shards()
+        )
+
+        self.stdout.write("Snapshotted tallies for {} elections.".format(snapshotted))
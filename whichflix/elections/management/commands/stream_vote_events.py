@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from whichflix.elections import manager
+
+
+class Command(BaseCommand):
+    help = "Write the vote event log as JSON lines, for analytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Only write vote events after this id, to resume a previous export.",
+        )
+        parser.add_argument(
+            "--shard",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias of the election shard whose log is written.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        after_vote_event_id = options["after_id"]
+
+        while True:
+            vote_events = manager.get_vote_events(
+                after_vote_event_id, options["batch_size"], using=options["shard"]
+            )
+
+            for vote_event in vote_events:
+                self.stdout.write(
+                    json.dumps(
+                        {
+                            "id": vote_event.id,
+                            "election_id": vote_event.election_id,
+                            "participant_id": vote_event.participant_id,
+                            "candidate_id": vote_event.candidate_id,
+                            "kind": vote_event.kind,
+                            "created_at": vote_event.created_at.isoformat(),
+                        }
+                    )
+                )
+
+            if len(vote_events) < options["batch_size"]:
+                break
+
+            after_vote_event_id = vote_events[-1].id
@@ -1,14 +1,48 @@
 import datetime
-
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.db.models import (
+    CharField,
+    Count,
+    F,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Cast, Coalesce, Concat
 from django.utils import timezone
-from django_eventstream import send_event
-from typing import List, Optional
-
-from whichflix.elections import errors
-from whichflix.elections.models import Candidate, Election, Participant, Vote
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import redis
+
+from whichflix.clients import redis_client
+from whichflix.compression import precompress
+from whichflix.elections import builders, constants, errors, sharding
+from whichflix.elections.models import (
+    ArchivedElection,
+    Candidate,
+    CandidateTallySnapshot,
+    Election,
+    ElectionMembership,
+    Participant,
+    Vote,
+    VoteEvent,
+)
+from whichflix.events import send_event
 from whichflix.movies import manager as movie_manager, errors as movie_errors
 from whichflix.users.models import Device
-from whichflix.utils import generate_external_id
+from whichflix.utils import decode_external_id, generate_external_id
+
+logger = logging.getLogger(__name__)
 
 
 #
@@ -16,36 +50,242 @@ from whichflix.utils import generate_external_id
 #
 
 
+def get_election_by_external_id(election_id: str) -> Optional[Election]:
+    internal_id = decode_external_id(election_id)
+
+    if internal_id is None:
+        return None
+
+    shard = sharding.get_shard_for_id(internal_id)
+
+    return Election.objects.using(shard).filter(id=internal_id).first()
+
+
+def is_device_participating_in_election(device_token: str, election_id: str) -> bool:
+    election = get_election_by_external_id(election_id)
+
+    if election is None:
+        return False
+
+    return ElectionMembership.objects.filter(
+        device__device_token=device_token, election_id=election.id
+    ).exists()
+
+
 def get_election_and_related_objects(election_id: str) -> Optional[Election]:
+    internal_id = decode_external_id(election_id)
+
+    if internal_id is None:
+        return None
+
+    shard = sharding.get_shard_for_id(internal_id)
     election = (
-        Election.objects.prefetch_related(
-            "participants", "candidates", "candidates__votes"
-        )
-        .filter(external_id=election_id)
+        Election.objects.using(shard)
+        .prefetch_related(*_get_election_related_lookups())
+        .filter(id=internal_id)
         .first()
     )
 
+    if election is not None:
+        _apply_buffered_votes(election.id, list(election.candidates.all()))
+
     return election
 
 
 def get_elections_and_related_objects_by_device_token(
     device_token: str,
-) -> List[Election]:
-    elections = (
-        Election.objects.prefetch_related(
-            "participants", "candidates", "candidates__votes"
-        )
-        .filter(
-            participants__device__device_token=device_token,
-            participants__deleted_at__isnull=True,
-        )
-        .order_by("id")
-        .all()
+    after_election_id: Optional[int] = None,
+    limit: int = constants.ELECTIONS_DEFAULT_PAGE_SIZE,
+) -> List[Union[Election, ArchivedElection]]:
+    # Keyset pagination on the election id, so each page costs the same regardless
+    # of how many elections the device has joined. Only the page is prefetched.
+    election_ids = _get_election_ids_by_device_token(
+        device_token, after_election_id, limit
     )
+    elections = _get_elections_across_shards(
+        election_ids,
+        limit,
+        lambda elections: elections.prefetch_related(*_get_election_related_lookups()),
+    )
+
+    for election in elections:
+        if isinstance(election, Election):
+            _apply_buffered_votes(election.id, list(election.candidates.all()))
 
     return elections
 
 
+def get_election_summaries_by_device_token(
+    device_token: str,
+    after_election_id: Optional[int] = None,
+    limit: int = constants.ELECTIONS_DEFAULT_PAGE_SIZE,
+) -> List[Union[Election, ArchivedElection]]:
+    """
+    Fetch a page of elections annotated with participant and candidate counts and the
+    leading candidate, all computed by the database in a single query per shard.
+    """
+    election_ids = _get_election_ids_by_device_token(
+        device_token, after_election_id, limit
+    )
+    elections = _get_elections_across_shards(
+        election_ids, limit, _annotate_election_summaries
+    )
+
+    for election in elections:
+        if isinstance(election, Election):
+            _unpack_leading_candidate(election)
+
+    return elections
+
+
+def _annotate_election_summaries(elections: QuerySet) -> QuerySet:
+    active_participants = Participant.objects.filter(
+        election=OuterRef("pk"), deleted_at__isnull=True
+    )
+    candidates = Candidate.objects.filter(election=OuterRef("pk"))
+    leading_candidates = (
+        candidates.annotate(
+            vote_count=Count(
+                "votes",
+                filter=Q(
+                    votes__deleted_at__isnull=True,
+                    votes__participant__deleted_at__isnull=True,
+                ),
+            )
+        )
+        .filter(vote_count__gt=0)
+        .order_by("-vote_count", "id")
+    )
+
+    # The fields of the leading candidate are packed into a single value, so the
+    # candidates of each election are only counted and ranked once.
+    leading_candidate = Concat(
+        Cast("id", CharField()),
+        Value(":"),
+        Cast("vote_count", CharField()),
+        Value(":"),
+        "movie_id",
+        output_field=CharField(),
+    )
+
+    return elections.annotate(
+        participant_count=_count_subquery(active_participants),
+        candidate_count=_count_subquery(candidates),
+        leading_candidate=Subquery(
+            leading_candidates.annotate(leading_candidate=leading_candidate).values(
+                "leading_candidate"
+            )[:1]
+        ),
+    )
+
+
+def _unpack_leading_candidate(election: Election) -> None:
+    election.leading_candidate_id = None
+    election.leading_candidate_movie_id = None
+    election.leading_candidate_vote_count = None
+
+    if election.leading_candidate:
+        # Movie ids come last, since only they can contain the separator.
+        candidate_id, vote_count, movie_id = election.leading_candidate.split(":", 2)
+        election.leading_candidate_id = int(candidate_id)
+        election.leading_candidate_movie_id = movie_id
+        election.leading_candidate_vote_count = int(vote_count)
+
+
+def _get_election_ids_by_device_token(
+    device_token: str, after_election_id: Optional[int], limit: int
+) -> QuerySet:
+    memberships = ElectionMembership.objects.filter(device__device_token=device_token)
+
+    if after_election_id is not None:
+        memberships = memberships.filter(election_id__gt=after_election_id)
+
+    return memberships.order_by("election_id").values_list("election_id", flat=True)[
+        :limit
+    ]
+
+
+# Listings only read the document of archived elections, so its compressed copies are
+# not loaded.
+_ARCHIVED_ELECTION_COMPRESSED_FIELDS = ("document_br", "document_gzip")
+
+
+def _get_elections_across_shards(
+    election_ids: QuerySet, limit: int, build_queryset: Callable[[QuerySet], QuerySet]
+) -> List[Union[Election, ArchivedElection]]:
+    """
+    Fetch elections by id from every shard they live on, in id order. Elections that
+    were archived are returned as archived elections. On a single database the ids
+    are read in a subquery rather than a query of their own.
+    """
+    if not sharding.is_sharded():
+        elections: List[Union[Election, ArchivedElection]] = list(
+            build_queryset(Election.objects.filter(id__in=election_ids))
+        )
+
+        # A full page has no archived elections, so only a partial one looks them up.
+        if len(elections) < limit:
+            elections.extend(
+                ArchivedElection.objects.filter(id__in=election_ids).defer(
+                    *_ARCHIVED_ELECTION_COMPRESSED_FIELDS
+                )
+            )
+
+        return sorted(elections, key=lambda election: election.id)
+
+    elections = []
+
+    for shard, shard_election_ids in sharding.group_ids_by_shard(election_ids).items():
+        shard_elections = list(
+            build_queryset(
+                Election.objects.using(shard).filter(id__in=shard_election_ids)
+            )
+        )
+        archived_election_ids = set(shard_election_ids) - {
+            election.id for election in shard_elections
+        }
+        elections.extend(shard_elections)
+
+        if archived_election_ids:
+            elections.extend(
+                ArchivedElection.objects.using(shard)
+                .filter(id__in=archived_election_ids)
+                .defer(*_ARCHIVED_ELECTION_COMPRESSED_FIELDS)
+            )
+
+    return sorted(elections, key=lambda election: election.id)
+
+
+def _count_subquery(queryset: QuerySet) -> Coalesce:
+    counts = queryset.order_by().values("election").annotate(count=Count("id"))
+
+    return Coalesce(Subquery(counts.values("count")), 0)
+
+
+def prefetch_election_related_objects(election: Election) -> Election:
+    prefetch_related_objects([election], *_get_election_related_lookups())
+    _apply_buffered_votes(election.id, list(election.candidates.all()))
+
+    return election
+
+
+def _get_election_related_lookups() -> list:
+    # Everything the election document and candidate actions read, so that building
+    # them issues no further queries per participant, candidate or vote.
+    return [
+        Prefetch("participants", queryset=Participant.objects.order_by("name")),
+        "candidates",
+        _get_votes_prefetch("candidates__votes"),
+        "candidates__prefetched_votes__participant",
+    ]
+
+
+def _get_votes_prefetch(lookup: str) -> Prefetch:
+    # Votes are prefetched into a plain list that `_apply_buffered_votes` can replace,
+    # and which documents and candidate actions read instead of `votes.all()`.
+    return Prefetch(lookup, to_attr="prefetched_votes")
+
+
 def initiate_election(device: Device, initiator_name: str, title: str) -> Election:
     election = _create_election(title)
     _create_participant_who_initiated_election(election, device, initiator_name)
@@ -54,6 +294,13 @@ def initiate_election(device: Device, initiator_name: str, title: str) -> Electi
 
 
 def _create_election(title: str) -> Election:
+    election_id = sharding.allocate_election_id()
+
+    if election_id is not None:
+        return Election.objects.using(sharding.get_shard_for_id(election_id)).create(
+            id=election_id, external_id=generate_external_id(election_id), title=title
+        )
+
     election = Election.objects.create(title=title)
     election.external_id = generate_external_id(election.id)
     election.save()
@@ -72,6 +319,21 @@ def update_election(
     return election
 
 
+def close_election(election: Election, participant: Participant) -> Election:
+    _validate_participant_is_initiator_of_election(election, participant)
+
+    if election.closed_at is None:
+        election.closed_at = datetime.datetime.now(tz=timezone.utc)
+        election.save()
+
+    return election
+
+
+def _validate_election_is_open(election: Election) -> None:
+    if election.closed_at is not None:
+        raise errors.ElectionClosedError()
+
+
 def _validate_participant_is_initiator_of_election(
     election: Election, participant: Participant
 ) -> None:
@@ -86,9 +348,17 @@ def _validate_participant_is_initiator_of_election(
 def _create_participant_who_initiated_election(
     election: Election, device: Device, name: str
 ) -> Participant:
-    participant = Participant.objects.create(
-        name=name, election=election, device=device, is_initiator=True
+    (participant_id,) = sharding.allocate_ids_for_election(election.id, 1)
+    participant = Participant.objects.using(
+        sharding.get_shard_for_id(election.id)
+    ).create(
+        id=participant_id,
+        name=name,
+        election=election,
+        device_id=device.id,
+        is_initiator=True,
     )
+    _add_election_membership(device, election)
 
     return participant
 
@@ -102,122 +372,414 @@ def get_candidate_actions_map_for_election(
     }
 
 
+def get_archived_election(election_id: str) -> Optional[ArchivedElection]:
+    internal_id = decode_external_id(election_id)
+
+    if internal_id is None:
+        return None
+
+    shard = sharding.get_shard_for_id(internal_id)
+
+    return ArchivedElection.objects.using(shard).filter(id=internal_id).first()
+
+
+def archive_closed_elections(
+    closed_before: datetime.datetime,
+    batch_size: int,
+    using: str = DEFAULT_DB_ALIAS,
+    after_election_id: int = 0,
+) -> Tuple[int, Optional[int]]:
+    """
+    Archive a batch of elections closed before `closed_before`, starting after
+    `after_election_id`. Returns the number archived and the id of the last election
+    of the batch, or None once no elections are left. An election that fails to
+    archive is logged and skipped, so the next batch can resume after it.
+    """
+    election_ids = list(
+        Election.objects.using(using)
+        .filter(closed_at__lt=closed_before, id__gt=after_election_id)
+        .order_by("id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    archived_count = 0
+
+    for election_id in election_ids:
+        try:
+            archived_election = _archive_election(election_id, using)
+        except Exception:
+            logger.exception("Failed to archive election %s.", election_id)
+            continue
+
+        if archived_election is not None:
+            archived_count += 1
+
+    return archived_count, election_ids[-1] if election_ids else None
+
+
+def _archive_election(election_id: int, using: str) -> Optional[ArchivedElection]:
+    # The document reads movies from TMDB and Redis, so it is built before the row
+    # is locked. Closed elections no longer change, and the lock only confirms the
+    # election was not updated in between.
+    election = (
+        Election.objects.using(using)
+        .prefetch_related(*_get_election_related_lookups())
+        .get(id=election_id)
+    )
+    document = json.dumps(builders.build_election_document(election))
+    # Compressed once here, since archived documents never change.
+    compressed_documents = precompress(document.encode())
+
+    with transaction.atomic(using=using):
+        locked_election = (
+            Election.objects.using(using)
+            .select_for_update()
+            .filter(id=election.id, updated_at=election.updated_at)
+            .first()
+        )
+
+        if locked_election is None:
+            return None
+
+        archived_election = ArchivedElection.objects.using(using).create(
+            id=election.id,
+            external_id=election.external_id,
+            title=election.title,
+            document=document,
+            document_br=compressed_documents["br"],
+            document_gzip=compressed_documents["gzip"],
+            closed_at=election.closed_at,
+            created_at=election.created_at,
+        )
+
+        # Delete children before parents, since every foreign key is protected. No
+        # vote events are logged, so tallies keep the counts of the archived document.
+        Vote.objects.using(using).filter(candidate__election_id=election.id).delete()
+        Candidate.objects.using(using).filter(election_id=election.id).delete()
+        Participant.objects.using(using).filter(election_id=election.id).delete()
+        election.delete()
+
+    # Memberships are kept, so archived elections stay listed for their devices.
+    return archived_election
+
+
 def send_election_event(election_document: dict) -> None:
     channel = "election-{id}".format(id=election_document["id"])
     send_event(channel, "message", election_document)
 
 
+def allocate_candidate_tally_version(candidate: Candidate) -> Optional[int]:
+    """
+    Number the next tally of a candidate. Allocated after a vote is written and before
+    the votes are counted, a higher version always counts at least the votes of a
+    lower one, whichever order concurrent requests publish them in.
+    """
+    key = constants.CANDIDATE_TALLY_VERSION_KEY.format(candidate_id=candidate.id)
+
+    try:
+        pipeline = redis_client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, constants.CANDIDATE_TALLY_VERSION_TTL_IN_SECONDS)
+        version, _ = pipeline.execute()
+    except redis.RedisError:
+        # Events are best effort, so the tally is sent without a version.
+        logger.exception("Failed to version the tally of candidate %s.", candidate.id)
+        return None
+
+    return version
+
+
+def send_candidate_tally_event(
+    candidate: Candidate, vote_count: int, version: Optional[int] = None
+) -> None:
+    """
+    Publish the tally of a candidate after a vote is cast or retracted, so subscribers
+    can update it without the full election document. The event carries the absolute
+    vote count and its version, since bursts of tally events for a candidate are
+    coalesced into the one with the highest version.
+    """
+    channel = "election-{id}".format(id=candidate.election.external_id)
+    tally = {
+        "candidate_id": str(candidate.id),
+        "vote_count": vote_count,
+        "version": version,
+    }
+    state_key = "tally-{id}".format(id=candidate.id)
+    send_event(channel, "tally", tally, state_key=state_key)
+
+
 #
 # Participants
 #
 
 
+_UPSERT_PARTICIPANT_SQL = """
+    INSERT INTO elections_participant
+        ({id_column}name, device_id, election_id, is_initiator, deleted_at, created_at,
+        updated_at)
+    VALUES ({id_value}%s, %s, %s, FALSE, NULL, %s, %s)
+    ON CONFLICT (device_id, election_id) DO UPDATE
+        SET name = EXCLUDED.name, deleted_at = NULL, updated_at = EXCLUDED.updated_at
+    RETURNING *
+"""
+
+
 def create_or_activate_participant_for_election(
     election: Election, device: Device, name: str
 ) -> Participant:
-    participant = _get_deleted_participant_by_election_and_device_token(
-        election, device.device_token
-    )
-
-    if participant is not None:
-        participant.deleted_at = None
-        participant.name = name
-        participant.save()
+    _validate_election_is_open(election)
+
+    # Joining, rejoining after leaving and repeated joins from the same device all
+    # resolve to the same row in a single statement.
+    shard = sharding.get_shard_for_id(election.id)
+    now = _get_database_now(shard)
+    params = [name, device.id, election.id, now, now]
+    # Sharded participant ids are allocated up front, and unused when the device
+    # already has a row.
+    (participant_id,) = sharding.allocate_ids_for_election(election.id, 1)
+
+    if participant_id is None:
+        sql = _UPSERT_PARTICIPANT_SQL.format(id_column="", id_value="")
     else:
-        participant = create_participant_for_election(election, device, name)
+        sql = _UPSERT_PARTICIPANT_SQL.format(id_column="id, ", id_value="%s, ")
+        params.insert(0, participant_id)
+
+    with transaction.atomic(using=shard):
+        # The row is locked, so leaving and rejoining concurrently log votes once.
+        is_rejoining = (
+            Participant.objects.using(shard)
+            .select_for_update()
+            .filter(device_id=device.id, election_id=election.id)
+            .exclude(deleted_at=None)
+            .exists()
+        )
+        participant = list(Participant.objects.db_manager(shard).raw(sql, params))[0]
+
+        # Votes of participants who left count again once they rejoin.
+        if is_rejoining:
+            _log_vote_events(
+                election.id, _get_active_vote_keys(participant, shard), VoteEvent.CAST
+            )
+
+    _add_election_membership(device, election)
 
     return participant
 
 
-def create_participant_for_election(
-    election: Election, device: Device, name: str
-) -> Participant:
-    participant = Participant.objects.create(
-        name=name, election=election, device=device, is_initiator=False
+def compact_deleted_participants(
+    deleted_before: datetime.datetime, batch_size: int, using: str = DEFAULT_DB_ALIAS
+) -> Tuple[int, int]:
+    """
+    Hard-delete a batch of participants who left before `deleted_before`, along with
+    their votes. Returns the number of participants and of votes deleted.
+    """
+    # Participants who created candidates stay referenced by those candidates, so
+    # only participants without candidates can be removed. Their votes were logged as
+    # retracted when they left, so removing them logs nothing.
+    compactable_participants = Participant.objects.using(using).filter(
+        deleted_at__lt=deleted_before, candidates__isnull=True
+    )
+    participant_ids = list(
+        compactable_participants.order_by("id").values_list("id", flat=True)[
+            :batch_size
+        ]
     )
 
-    return participant
+    with transaction.atomic(using=using):
+        # Participants may have rejoined or added candidates since they were picked,
+        # so they are checked again, and locked until they are deleted.
+        participant_ids = list(
+            compactable_participants.select_for_update(of=("self",))
+            .filter(id__in=participant_ids)
+            .values_list("id", flat=True)
+        )
+        vote_count, _ = (
+            Vote.objects.using(using)
+            .filter(participant_id__in=participant_ids)
+            .delete()
+        )
+        Participant.objects.using(using).filter(id__in=participant_ids).delete()
+
+    return len(participant_ids), vote_count
 
 
 def get_participant_by_election_and_device_token(
     election: Election, device_token: str
 ) -> Optional[Participant]:
+    participants = Participant.objects.using(sharding.get_shard_for_id(election.id))
+    participants = _filter_by_device_token(participants, device_token)
+
     try:
-        participant = Participant.objects.get(
-            election=election,
-            device__device_token=device_token,
-            deleted_at__isnull=True,
-        )
+        participant = participants.get(election=election, deleted_at__isnull=True)
     except Participant.DoesNotExist:
         participant = None
 
     return participant
 
 
-def _get_deleted_participant_by_election_and_device_token(
-    election: Election, device_token: str
-) -> Optional[Participant]:
-    try:
-        participant = Participant.objects.get(
-            election=election,
-            device__device_token=device_token,
-            deleted_at__isnull=False,
-        )
-    except Participant.DoesNotExist:
-        participant = None
+def _filter_by_device_token(participants: QuerySet, device_token: str) -> QuerySet:
+    # Devices live on the default database, so they can only be joined on the shard
+    # it hosts. Other shards look the device up first.
+    if participants.db == DEFAULT_DB_ALIAS:
+        return participants.filter(device__device_token=device_token)
 
-    return participant
+    device_ids = list(
+        Device.objects.filter(device_token=device_token).values_list("id", flat=True)
+    )
 
+    return participants.filter(device_id__in=device_ids)
 
-def delete_participant(participant: Participant) -> Participant:
-    if participant.deleted_at is None:
-        participant.deleted_at = datetime.datetime.now(tz=timezone.utc)
 
-    participant.save()
+def delete_participant(election: Election, participant: Participant) -> Participant:
+    _validate_election_is_open(election)
+    shard = sharding.get_shard_for_id(election.id)
+    now = datetime.datetime.now(tz=timezone.utc)
+
+    with transaction.atomic(using=shard):
+        # Only the request that marks the participant as deleted logs their votes.
+        is_leaving = (
+            Participant.objects.using(shard)
+            .filter(id=participant.id, deleted_at=None)
+            .update(deleted_at=now, updated_at=now)
+        )
+
+        # Votes of participants who left no longer count, so tallies computed from
+        # vote events drop them the same way election documents do.
+        if is_leaving:
+            _log_vote_events(
+                election.id,
+                _get_active_vote_keys(participant, shard),
+                VoteEvent.RETRACT,
+            )
+
+    participant.deleted_at = participant.deleted_at or now
+    ElectionMembership.objects.filter(
+        device_id=participant.device_id, election_id=participant.election_id
+    ).delete()
 
     return participant
 
 
+def _add_election_membership(device: Device, election: Election) -> None:
+    ElectionMembership.objects.bulk_create(
+        [ElectionMembership(device=device, election_id=election.id)],
+        ignore_conflicts=True,
+    )
+
+
 #
 # Candidates
 #
 
 
 def get_candidate_and_related_objects(candidate_id: int) -> Optional[Candidate]:
-    election = (
-        Candidate.objects.prefetch_related("votes", "votes__participant")
+    candidate = (
+        Candidate.objects.using(sharding.get_shard_for_id(candidate_id))
+        .select_related("election")
         .filter(id=candidate_id)
         .first()
     )
 
-    return election
+    return candidate
+
+
+def prefetch_candidate_related_objects(candidate: Candidate) -> Candidate:
+    prefetch_related_objects(
+        [candidate], _get_votes_prefetch("votes"), "prefetched_votes__participant"
+    )
+    _apply_buffered_votes(candidate.election_id, [candidate])
+
+    return candidate
 
 
 def create_candidate_for_election(
     election: Election, participant: Participant, movie_id: str
 ) -> Candidate:
+    _validate_election_is_open(election)
     _validate_participant_is_in_election(participant, election)
     _validate_candidate_does_not_already_exist(movie_id, election)
     _validate_movie_exists(movie_id)
 
-    candidate = Candidate.objects.create(
-        participant=participant, movie_id=movie_id, election=election
-    )
+    (candidate_id,) = sharding.allocate_ids_for_election(election.id, 1)
+    shard = sharding.get_shard_for_id(election.id)
+
+    # A concurrent request may have added the same movie since it was validated.
+    try:
+        with transaction.atomic(using=shard):
+            candidate = Candidate.objects.using(shard).create(
+                id=candidate_id,
+                participant=participant,
+                movie_id=movie_id,
+                election=election,
+            )
+    except IntegrityError:
+        raise errors.CandidateAlreadyExistsError()
 
     return candidate
 
 
+def create_candidates_for_election(
+    election: Election, participant: Participant, movie_ids: List[str]
+) -> List[Candidate]:
+    _validate_election_is_open(election)
+    _validate_participant_is_in_election(participant, election)
+
+    # Movies that are already candidates are skipped, so seeding an election from a
+    # watchlist can safely be retried.
+    existing_movie_ids = set(
+        election.candidates.filter(movie_id__in=movie_ids).values_list(
+            "movie_id", flat=True
+        )
+    )
+    new_movie_ids = [
+        movie_id
+        for movie_id in dict.fromkeys(movie_ids)
+        if movie_id not in existing_movie_ids
+    ]
+    _validate_movies_exist(new_movie_ids)
+
+    candidate_ids = sharding.allocate_ids_for_election(election.id, len(new_movie_ids))
+    # Movies added by a concurrent request since the check above are skipped too.
+    candidates = Candidate.objects.using(
+        sharding.get_shard_for_id(election.id)
+    ).bulk_create(
+        [
+            Candidate(
+                id=candidate_id,
+                participant=participant,
+                movie_id=movie_id,
+                election=election,
+            )
+            for candidate_id, movie_id in zip(candidate_ids, new_movie_ids)
+        ],
+        ignore_conflicts=True,
+    )
+
+    return candidates
+
+
+def _validate_movies_exist(movie_ids: List[str]) -> None:
+    try:
+        tmdb_movies = movie_manager.get_tmdb_movies_by_ids(movie_ids)
+    except movie_errors.TMDBUnavailableError:
+        raise errors.MovieDatabaseUnavailableError
+
+    if len(tmdb_movies) != len(movie_ids):
+        raise errors.MovieDoesNotExistError
+
+
 def _validate_movie_exists(movie_id):
     try:
         movie_manager.get_tmdb_movie_by_id(movie_id)
     except movie_errors.TMDBMovieDoesNotExistError:
         raise errors.MovieDoesNotExistError
+    except movie_errors.TMDBUnavailableError:
+        raise errors.MovieDatabaseUnavailableError
 
 
 def _validate_participant_is_in_election(
     participant: Participant, election: Election
 ) -> None:
-    if participant.election != election:
+    if participant.election_id != election.id:
         raise errors.ParticipantNotPartOfElectionError()
 
 
@@ -231,10 +793,11 @@ def _validate_candidate_does_not_already_exist(
 def get_candidate_actions_for_participant(
     candidate: Candidate, participant: Participant
 ) -> dict:
-    has_participant_voted_for_candidate = candidate.votes.filter(
-        participant=participant, deleted_at__isnull=True
-    ).exists()
-    did_participant_create_candidate = candidate.participant.id == participant.id
+    has_participant_voted_for_candidate = any(
+        vote.participant_id == participant.id and vote.deleted_at is None
+        for vote in candidate.prefetched_votes
+    )
+    did_participant_create_candidate = candidate.participant_id == participant.id
 
     return {
         "can_vote": not has_participant_voted_for_candidate,
@@ -248,66 +811,731 @@ def get_candidate_actions_for_participant(
 #
 
 
+_UPSERT_VOTE_SQL = """
+    INSERT INTO elections_vote
+        (participant_id, candidate_id, deleted_at, created_at, updated_at)
+    VALUES (%s, %s, NULL, %s, %s)
+    ON CONFLICT (participant_id, candidate_id) DO UPDATE
+        SET deleted_at = NULL, updated_at = EXCLUDED.updated_at
+        WHERE elections_vote.deleted_at IS NOT NULL
+    RETURNING *
+"""
+
+_DELETE_VOTE_SQL = """
+    UPDATE elections_vote
+    SET deleted_at = %s, updated_at = %s
+    WHERE participant_id = %s AND candidate_id = %s AND deleted_at IS NULL
+    RETURNING *
+"""
+
+
+_BULK_UPSERT_VOTES_SQL = """
+    INSERT INTO elections_vote
+        (participant_id, candidate_id, deleted_at, created_at, updated_at)
+    VALUES {values}
+    ON CONFLICT (participant_id, candidate_id) DO UPDATE
+        SET deleted_at = NULL, updated_at = EXCLUDED.updated_at
+        WHERE elections_vote.deleted_at IS NOT NULL
+    RETURNING participant_id, candidate_id
+"""
+
+_BULK_DELETE_VOTES_SQL = """
+    UPDATE elections_vote
+    SET deleted_at = %s, updated_at = %s
+    WHERE (participant_id, candidate_id) IN (VALUES {values})
+        AND deleted_at IS NULL
+    RETURNING participant_id, candidate_id
+"""
+
+
 def create_or_activate_vote_for_candidate(
     participant: Participant, candidate: Candidate
 ) -> Vote:
-    vote = _get_deleted_vote_by_candidate_and_participant(participant, candidate)
+    _validate_election_is_open(candidate.election)
+    _validate_participant_is_in_election(participant, candidate.election)
 
-    if vote is not None:
-        vote.deleted_at = None
-        vote.save()
-    else:
-        vote = _create_vote_for_candidate(participant, candidate)
+    if settings.VOTE_BUFFER_ENABLED:
+        if _is_vote_active(participant, candidate):
+            raise errors.ParticipantAlreadyVotedForCandidate
 
-    return vote
+        _buffer_vote_states(
+            candidate.election_id, {(participant.id, candidate.id): True}
+        )
 
+        return Vote(participant=participant, candidate=candidate)
 
-def _create_vote_for_candidate(participant: Participant, candidate: Candidate) -> Vote:
-    _validate_participant_is_in_election(participant, candidate.election)
-    _validate_participant_has_not_already_voted_for_candidate(participant, candidate)
+    # A single upsert either inserts a new vote or reactivates a deleted one. The
+    # conflict clause only fires for deleted votes, so no row comes back when the
+    # participant already has an active vote for the candidate.
+    shard = sharding.get_shard_for_id(candidate.election_id)
+    now = _get_database_now(shard)
 
-    vote = Vote.objects.create(participant=participant, candidate=candidate)
+    with transaction.atomic(using=shard):
+        vote = _execute_vote_statement(
+            _UPSERT_VOTE_SQL, [participant.id, candidate.id, now, now], shard
+        )
 
-    return vote
+        if vote is None:
+            raise errors.ParticipantAlreadyVotedForCandidate
 
+        _log_vote_events(
+            candidate.election_id, [(participant.id, candidate.id)], VoteEvent.CAST
+        )
 
-def _validate_participant_has_not_already_voted_for_candidate(
-    participant: Participant, candidate: Candidate
-) -> None:
-    if candidate.votes.filter(participant=participant).exists():
-        raise errors.ParticipantAlreadyVotedForCandidate
+    return vote
 
 
-def get_vote_by_participant_and_candidate(
+def delete_vote_for_candidate(
     participant: Participant, candidate: Candidate
 ) -> Optional[Vote]:
-    try:
-        vote = Vote.objects.get(
-            candidate=candidate, participant=participant, deleted_at__isnull=True
+    _validate_election_is_open(candidate.election)
+
+    if settings.VOTE_BUFFER_ENABLED:
+        if not _is_vote_active(participant, candidate):
+            return None
+
+        _buffer_vote_states(
+            candidate.election_id, {(participant.id, candidate.id): False}
         )
-    except Vote.DoesNotExist:
-        vote = None
+
+        return Vote(
+            participant=participant,
+            candidate=candidate,
+            deleted_at=datetime.datetime.now(tz=timezone.utc),
+        )
+
+    shard = sharding.get_shard_for_id(candidate.election_id)
+    now = _get_database_now(shard)
+
+    with transaction.atomic(using=shard):
+        vote = _execute_vote_statement(
+            _DELETE_VOTE_SQL, [now, now, participant.id, candidate.id], shard
+        )
+
+        if vote is not None:
+            _log_vote_events(
+                candidate.election_id,
+                [(participant.id, candidate.id)],
+                VoteEvent.RETRACT,
+            )
 
     return vote
 
 
-def _get_deleted_vote_by_candidate_and_participant(
-    participant: Participant, candidate: Candidate
-) -> Optional[Vote]:
+def update_votes_for_participant(
+    election: Election,
+    participant: Participant,
+    voted_candidate_ids: List[int],
+    unvoted_candidate_ids: List[int],
+) -> None:
+    _validate_election_is_open(election)
+    _validate_participant_is_in_election(participant, election)
+    _validate_candidates_are_in_election(
+        voted_candidate_ids + unvoted_candidate_ids, election
+    )
+
+    vote_states = {
+        (participant.id, candidate_id): True for candidate_id in voted_candidate_ids
+    }
+    vote_states.update(
+        {
+            (participant.id, candidate_id): False
+            for candidate_id in unvoted_candidate_ids
+        }
+    )
+
+    if settings.VOTE_BUFFER_ENABLED:
+        _buffer_vote_states(election.id, vote_states)
+    else:
+        _write_vote_states(election.id, vote_states)
+
+
+def _write_vote_states(
+    election_id: int, vote_states: Dict[Tuple[int, int], bool]
+) -> None:
+    """
+    Write the state of many votes, keyed by participant and candidate id, in batched
+    statements within one transaction. Votes whose state changed are logged.
+    """
+    shard = sharding.get_shard_for_id(election_id)
+    now = _get_database_now(shard)
+    voted_keys = [key for key, is_active in vote_states.items() if is_active]
+    unvoted_keys = [key for key, is_active in vote_states.items() if not is_active]
+    batch_size = constants.VOTE_WRITE_BATCH_SIZE
+
+    with transaction.atomic(using=shard), connections[shard].cursor() as cursor:
+        # Votes of participants who left were logged as retracted when they left, and
+        # are logged as cast again when they rejoin. Their rows are locked, so a
+        # concurrent leave or rejoin sees the votes written here.
+        departed_participant_ids = {
+            participant_id
+            for participant_id, deleted_at in Participant.objects.using(shard)
+            .select_for_update()
+            .filter(id__in={participant_id for participant_id, _ in vote_states})
+            .values_list("id", "deleted_at")
+            if deleted_at is not None
+        }
+
+        for start in range(0, len(voted_keys), batch_size):
+            batch = voted_keys[start : start + batch_size]
+            values = ", ".join(["(%s, %s, NULL, %s, %s)"] * len(batch))
+            params: List[Any] = []
+
+            for participant_id, candidate_id in batch:
+                params.extend([participant_id, candidate_id, now, now])
+
+            cursor.execute(_BULK_UPSERT_VOTES_SQL.format(values=values), params)
+            _log_vote_events(
+                election_id,
+                _exclude_vote_keys(cursor.fetchall(), departed_participant_ids),
+                VoteEvent.CAST,
+            )
+
+        for start in range(0, len(unvoted_keys), batch_size):
+            batch = unvoted_keys[start : start + batch_size]
+            values = ", ".join(["(%s, %s)"] * len(batch))
+            params = [now, now]
+
+            for participant_id, candidate_id in batch:
+                params.extend([participant_id, candidate_id])
+
+            cursor.execute(_BULK_DELETE_VOTES_SQL.format(values=values), params)
+            _log_vote_events(
+                election_id,
+                _exclude_vote_keys(cursor.fetchall(), departed_participant_ids),
+                VoteEvent.RETRACT,
+            )
+
+
+def _exclude_vote_keys(
+    vote_keys: List[Tuple[int, int]], participant_ids: Set[int]
+) -> List[Tuple[int, int]]:
+    return [
+        (participant_id, candidate_id)
+        for participant_id, candidate_id in vote_keys
+        if participant_id not in participant_ids
+    ]
+
+
+def _get_active_vote_keys(
+    participant: Participant, using: str
+) -> List[Tuple[int, int]]:
+    return list(
+        Vote.objects.using(using)
+        .filter(participant_id=participant.id, deleted_at=None)
+        .values_list("participant_id", "candidate_id")
+    )
+
+
+def _validate_candidates_are_in_election(
+    candidate_ids: List[int], election: Election
+) -> None:
+    existing_candidate_ids = set(
+        election.candidates.filter(id__in=candidate_ids).values_list("id", flat=True)
+    )
+
+    if existing_candidate_ids != set(candidate_ids):
+        raise errors.CandidateNotPartOfElectionError()
+
+
+def compact_deleted_votes(
+    deleted_before: datetime.datetime, batch_size: int, using: str = DEFAULT_DB_ALIAS
+) -> int:
+    # Deleted votes were logged as retracted when they were deleted, so removing them
+    # logs nothing.
+    compactable_votes = Vote.objects.using(using).filter(deleted_at__lt=deleted_before)
+    vote_ids = list(
+        compactable_votes.order_by("id").values_list("id", flat=True)[:batch_size]
+    )
+    # Votes cast again since they were picked are no longer deleted, so they are
+    # filtered out by the delete itself.
+    vote_count, _ = compactable_votes.filter(id__in=vote_ids).delete()
+
+    return vote_count
+
+
+def _log_vote_events(
+    election_id: int, vote_keys: List[Tuple[int, int]], kind: str
+) -> None:
+    VoteEvent.objects.using(sharding.get_shard_for_id(election_id)).bulk_create(
+        [
+            VoteEvent(
+                election_id=election_id,
+                participant_id=participant_id,
+                candidate_id=candidate_id,
+                kind=kind,
+            )
+            for participant_id, candidate_id in vote_keys
+        ]
+    )
+
+
+def _execute_vote_statement(sql: str, params: list, using: str) -> Optional[Vote]:
+    votes = list(Vote.objects.db_manager(using).raw(sql, params))
+
+    return votes[0] if votes else None
+
+
+def _get_database_now(using: str = DEFAULT_DB_ALIAS) -> Any:
+    return connections[using].ops.adapt_datetimefield_value(
+        datetime.datetime.now(tz=timezone.utc)
+    )
+
+
+#
+# Vote tallies
+#
+
+
+def get_candidate_tallies(
+    election_id: int, at: Optional[datetime.datetime] = None
+) -> Dict[int, int]:
+    """
+    Compute the vote count of each candidate of an election, as of now or as of the
+    given time, from the latest tally snapshot plus the vote events after it.
+    """
+    vote_events = VoteEvent.objects.using(
+        sharding.get_shard_for_id(election_id)
+    ).filter(election_id=election_id)
+
+    if at is not None:
+        vote_events = vote_events.filter(created_at__lte=at)
+
+    last_vote_event_id = vote_events.aggregate(Max("id"))["id__max"]
+
+    if last_vote_event_id is None:
+        return {}
+
+    return _compute_candidate_tallies(election_id, last_vote_event_id)
+
+
+def get_vote_events(
+    after_vote_event_id: int, limit: int, using: str = DEFAULT_DB_ALIAS
+) -> List[VoteEvent]:
+    return list(
+        VoteEvent.objects.using(using)
+        .filter(id__gt=after_vote_event_id)
+        .order_by("id")[:limit]
+    )
+
+
+def snapshot_candidate_tallies(
+    created_before: datetime.datetime, using: str = DEFAULT_DB_ALIAS
+) -> int:
+    """
+    Snapshot the tallies of every election with vote events since its latest
+    snapshot. Only events created before `created_before` are included, so events
+    from transactions that have not committed yet are not skipped. Returns the number
+    of elections snapshotted.
+    """
+    latest_snapshots = (
+        CandidateTallySnapshot.objects.using(using)
+        .filter(election_id=OuterRef("election_id"))
+        .order_by("-last_vote_event_id")
+    )
+    pending_elections = list(
+        VoteEvent.objects.using(using)
+        .filter(created_at__lt=created_before)
+        .values("election_id")
+        .annotate(last_vote_event_id=Max("id"))
+        .annotate(
+            snapshot_vote_event_id=Coalesce(
+                Subquery(latest_snapshots.values("last_vote_event_id")[:1]), 0
+            )
+        )
+        .filter(last_vote_event_id__gt=F("snapshot_vote_event_id"))
+        .values_list("election_id", "last_vote_event_id")
+    )
+
+    for election_id, last_vote_event_id in pending_elections:
+        tallies = _compute_candidate_tallies(election_id, last_vote_event_id)
+
+        with transaction.atomic(using=using):
+            CandidateTallySnapshot.objects.using(using).bulk_create(
+                [
+                    CandidateTallySnapshot(
+                        election_id=election_id,
+                        candidate_id=candidate_id,
+                        vote_count=vote_count,
+                        last_vote_event_id=last_vote_event_id,
+                    )
+                    for candidate_id, vote_count in tallies.items()
+                ]
+            )
+            # Replaced snapshots are pruned. Tallies as of an earlier time replay the
+            # vote events instead, which are never deleted.
+            CandidateTallySnapshot.objects.using(using).filter(
+                election_id=election_id, last_vote_event_id__lt=last_vote_event_id
+            ).delete()
+
+    return len(pending_elections)
+
+
+def _compute_candidate_tallies(
+    election_id: int, last_vote_event_id: int
+) -> Dict[int, int]:
+    shard = sharding.get_shard_for_id(election_id)
+    snapshot_vote_event_id = (
+        CandidateTallySnapshot.objects.using(shard)
+        .filter(election_id=election_id, last_vote_event_id__lte=last_vote_event_id)
+        .aggregate(Max("last_vote_event_id"))["last_vote_event_id__max"]
+        or 0
+    )
+    tallies = dict(
+        CandidateTallySnapshot.objects.using(shard)
+        .filter(election_id=election_id, last_vote_event_id=snapshot_vote_event_id)
+        .values_list("candidate_id", "vote_count")
+    )
+    tail = (
+        VoteEvent.objects.using(shard)
+        .filter(
+            election_id=election_id,
+            id__gt=snapshot_vote_event_id,
+            id__lte=last_vote_event_id,
+        )
+        .values("candidate_id")
+        .annotate(
+            cast_count=Count("id", filter=Q(kind=VoteEvent.CAST)),
+            retract_count=Count("id", filter=Q(kind=VoteEvent.RETRACT)),
+        )
+    )
+
+    for row in tail:
+        tallies[row["candidate_id"]] = (
+            tallies.get(row["candidate_id"], 0)
+            + row["cast_count"]
+            - row["retract_count"]
+        )
+
+    return tallies
+
+
+#
+# Vote buffer
+#
+
+
+def get_buffered_vote_states(election_id: int) -> Dict[Tuple[int, int], bool]:
+    """
+    Fetch the votes buffered for an election that have not been written to the
+    database yet, keyed by participant and candidate id.
+    """
+    pipeline = redis_client.pipeline()
+    pipeline.hgetall(constants.VOTE_BUFFER_FLUSHING_KEY.format(election_id=election_id))
+    pipeline.hgetall(constants.VOTE_BUFFER_KEY.format(election_id=election_id))
+    flushing_vote_states, buffered_vote_states = pipeline.execute()
+
+    # Votes buffered after a flush started are newer than the ones being flushed.
+    return _decode_vote_states({**flushing_vote_states, **buffered_vote_states})
+
+
+def flush_buffered_votes() -> int:
+    election_ids = redis_client.smembers(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY)
+    flushed_count = 0
+
+    for election_id in election_ids:
+        # One election failing to flush must not hold back the others. Its votes are
+        # kept and flushed again once it is marked as pending.
+        try:
+            flushed_count += flush_buffered_votes_for_election(int(election_id))
+        except Exception:
+            logger.exception(
+                "Failed to flush buffered votes of election %s.", int(election_id)
+            )
+
+    return flushed_count
+
+
+def flush_buffered_votes_for_election(election_id: int) -> int:
+    """
+    Write the buffered votes of an election to the database. Returns 0 without
+    flushing while another worker holds the flush lock of the election.
+    """
+    lock_id = uuid.uuid4().hex.encode()
+
+    if not _acquire_vote_flush_lock(election_id, lock_id):
+        return 0
+
+    try:
+        return _flush_buffered_votes_for_election(election_id, lock_id)
+    except Exception:
+        # The election is flushed again on the next flush instead of waiting for a
+        # new vote to mark it as pending.
+        redis_client.sadd(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, election_id)
+        raise
+    finally:
+        _release_vote_flush_lock(election_id, lock_id)
+
+
+def recover_buffered_votes() -> int:
+    """
+    Mark every election with buffered or partially flushed votes as pending, so votes
+    left behind by a worker that stopped are flushed. Returns the number of elections.
+    """
+    election_ids = {
+        int(key.split(b":")[2])
+        for key in redis_client.scan_iter(match=constants.VOTE_BUFFER_KEY_PATTERN)
+    }
+
+    if election_ids:
+        redis_client.sadd(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, *election_ids)
+
+    return len(election_ids)
+
+
+def _flush_buffered_votes_for_election(election_id: int, lock_id: bytes) -> int:
+    buffer_key = constants.VOTE_BUFFER_KEY.format(election_id=election_id)
+    flushing_key = constants.VOTE_BUFFER_FLUSHING_KEY.format(election_id=election_id)
+    flushed_count = 0
+
+    # A leftover flushing hash means an earlier flush stopped before finishing. It is
+    # replayed first, which is safe since writing a vote state is idempotent.
+    if redis_client.exists(flushing_key):
+        flushed_count += _write_buffered_vote_states(election_id, lock_id)
+
+    with redis_client.pipeline() as pipeline:
+        _watch_vote_flush_lock(pipeline, election_id, lock_id)
+
+        # Only a flusher renames the buffer, so it cannot disappear until the rename.
+        if not pipeline.exists(buffer_key):
+            return flushed_count
+
+        pipeline.multi()
+        pipeline.rename(buffer_key, flushing_key)
+        _execute_holding_vote_flush_lock(pipeline, election_id, lock_id)
+
+    flushed_count += _write_buffered_vote_states(election_id, lock_id)
+
+    return flushed_count
+
+
+def _acquire_vote_flush_lock(election_id: int, lock_id: bytes) -> bool:
+    lock_key = constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(election_id=election_id)
+
+    with redis_client.pipeline() as pipeline:
+        pipeline.watch(lock_key)
+
+        # The election stays pending, so the worker holding the lock or a later flush
+        # picks up its votes.
+        if pipeline.get(lock_key) is not None:
+            return False
+
+        # Votes buffered from here on mark the election as pending again.
+        pipeline.multi()
+        pipeline.srem(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, election_id)
+
+        try:
+            _execute_holding_vote_flush_lock(pipeline, election_id, lock_id)
+        except errors.VoteFlushLockLostError:
+            return False
+
+    return True
+
+
+def _release_vote_flush_lock(election_id: int, lock_id: bytes) -> None:
+    lock_key = constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(election_id=election_id)
+
+    with redis_client.pipeline() as pipeline:
+        pipeline.watch(lock_key)
+
+        if pipeline.get(lock_key) != lock_id:
+            return
+
+        pipeline.multi()
+        pipeline.delete(lock_key)
+
+        try:
+            pipeline.execute()
+        except redis.WatchError:
+            pass
+
+
+def _watch_vote_flush_lock(
+    pipeline: redis.client.Pipeline, election_id: int, lock_id: bytes
+) -> None:
+    """
+    Watch the flush lock of an election until the pipeline is executed, so commands
+    queued on it only run while the lock is held by `lock_id`.
+    """
+    lock_key = constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(election_id=election_id)
+    pipeline.watch(lock_key)
+
+    if pipeline.get(lock_key) not in (None, lock_id):
+        raise errors.VoteFlushLockLostError
+
+
+def _execute_holding_vote_flush_lock(
+    pipeline: redis.client.Pipeline, election_id: int, lock_id: bytes
+) -> None:
+    # Each step of a flush extends the lock, the way the event dispatcher does.
+    pipeline.set(
+        constants.VOTE_BUFFER_FLUSH_LOCK_KEY.format(election_id=election_id),
+        lock_id,
+        ex=constants.VOTE_BUFFER_FLUSH_LOCK_TTL_IN_SECONDS,
+    )
+
+    try:
+        pipeline.execute()
+    except redis.WatchError:
+        raise errors.VoteFlushLockLostError
+
+
+def _write_buffered_vote_states(election_id: int, lock_id: bytes) -> int:
+    flushing_key = constants.VOTE_BUFFER_FLUSHING_KEY.format(election_id=election_id)
+    vote_states = _decode_vote_states(redis_client.hgetall(flushing_key))
+
     try:
-        vote = Vote.objects.get(
-            candidate=candidate, participant=participant, deleted_at__isnull=False
+        _write_vote_states(election_id, vote_states)
+    except IntegrityError:
+        # A vote whose participant or candidate has since been deleted fails the whole
+        # batch, and would fail every replay. Votes are written one at a time instead,
+        # and the ones that fail are set aside.
+        failed_vote_states = _write_vote_states_one_by_one(election_id, vote_states)
+        _set_aside_failed_vote_states(election_id, failed_vote_states)
+        vote_states = {
+            key: is_active
+            for key, is_active in vote_states.items()
+            if key not in failed_vote_states
+        }
+
+    # The flushing hash is only removed by the worker that wrote it. If another worker
+    # took over in the meantime, it replays the hash instead.
+    with redis_client.pipeline() as pipeline:
+        _watch_vote_flush_lock(pipeline, election_id, lock_id)
+        pipeline.multi()
+        pipeline.delete(flushing_key)
+        _execute_holding_vote_flush_lock(pipeline, election_id, lock_id)
+
+    return len(vote_states)
+
+
+def _write_vote_states_one_by_one(
+    election_id: int, vote_states: Dict[Tuple[int, int], bool]
+) -> Dict[Tuple[int, int], bool]:
+    failed_vote_states = {}
+
+    for vote_key, is_active in vote_states.items():
+        try:
+            _write_vote_states(election_id, {vote_key: is_active})
+        except IntegrityError:
+            failed_vote_states[vote_key] = is_active
+
+    return failed_vote_states
+
+
+def _set_aside_failed_vote_states(
+    election_id: int, vote_states: Dict[Tuple[int, int], bool]
+) -> None:
+    if not vote_states:
+        return
+
+    logger.error(
+        "Set aside %s buffered votes of election %s that could not be written.",
+        len(vote_states),
+        election_id,
+    )
+    redis_client.hset(
+        constants.VOTE_BUFFER_FAILED_KEY.format(election_id=election_id),
+        mapping=_encode_vote_states(vote_states),
+    )
+
+
+def _buffer_vote_states(
+    election_id: int, vote_states: Dict[Tuple[int, int], bool]
+) -> None:
+    # The hash only keeps the latest state of each vote, so a burst of votes and
+    # unvotes for the same candidate collapses into a single write.
+    pipeline = redis_client.pipeline()
+    pipeline.hset(
+        constants.VOTE_BUFFER_KEY.format(election_id=election_id),
+        mapping=_encode_vote_states(vote_states),
+    )
+    pipeline.sadd(constants.VOTE_BUFFER_PENDING_ELECTIONS_KEY, election_id)
+    pipeline.execute()
+
+
+def _encode_vote_states(vote_states: Dict[Tuple[int, int], bool]) -> Dict[str, int]:
+    return {
+        "{}:{}".format(participant_id, candidate_id): int(is_active)
+        for (participant_id, candidate_id), is_active in vote_states.items()
+    }
+
+
+def _decode_vote_states(vote_states: Dict[bytes, bytes]) -> Dict[Tuple[int, int], bool]:
+    decoded_vote_states = {}
+
+    for key, is_active in vote_states.items():
+        participant_id, candidate_id = key.split(b":")
+        decoded_vote_states[(int(participant_id), int(candidate_id))] = (
+            is_active == b"1"
         )
-    except Vote.DoesNotExist:
-        vote = None
 
-    return vote
+    return decoded_vote_states
 
 
-def delete_vote(vote: Vote) -> Vote:
-    if vote.deleted_at is None:
-        vote.deleted_at = datetime.datetime.now(tz=timezone.utc)
+def _is_vote_active(participant: Participant, candidate: Candidate) -> bool:
+    vote_key = (participant.id, candidate.id)
+    vote_states = get_buffered_vote_states(candidate.election_id)
 
-    vote.save()
+    if vote_key in vote_states:
+        return vote_states[vote_key]
 
-    return vote
+    return (
+        Vote.objects.using(sharding.get_shard_for_id(candidate.election_id))
+        .filter(participant=participant, candidate=candidate, deleted_at__isnull=True)
+        .exists()
+    )
+
+
+def _apply_buffered_votes(election_id: int, candidates: List[Candidate]) -> None:
+    """
+    Overlay buffered votes on the prefetched votes of the candidates, so documents
+    reflect votes that have not been flushed to the database yet.
+    """
+    if not settings.VOTE_BUFFER_ENABLED:
+        return
+
+    vote_states = get_buffered_vote_states(election_id)
+
+    if not vote_states:
+        return
+
+    candidates_by_id = {candidate.id: candidate for candidate in candidates}
+    votes_by_key = {
+        (vote.participant_id, vote.candidate_id): vote
+        for candidate in candidates
+        for vote in candidate.prefetched_votes
+    }
+    new_vote_keys = [
+        (participant_id, candidate_id)
+        for (participant_id, candidate_id), is_active in vote_states.items()
+        if is_active
+        and candidate_id in candidates_by_id
+        and (participant_id, candidate_id) not in votes_by_key
+    ]
+    participants = Participant.objects.using(
+        sharding.get_shard_for_id(election_id)
+    ).in_bulk({participant_id for participant_id, _ in new_vote_keys})
+    now = datetime.datetime.now(tz=timezone.utc)
+
+    for vote_key, is_active in vote_states.items():
+        vote = votes_by_key.get(vote_key)
+
+        if vote is not None:
+            vote.deleted_at = None if is_active else vote.deleted_at or now
+
+    new_votes_by_candidate_id: Dict[int, List[Vote]] = {}
+
+    for participant_id, candidate_id in new_vote_keys:
+        participant = participants.get(participant_id)
+
+        if participant is not None:
+            new_votes_by_candidate_id.setdefault(candidate_id, []).append(
+                Vote(participant=participant, candidate=candidates_by_id[candidate_id])
+            )
+
+    for candidate in candidates:
+        candidate.prefetched_votes = [
+            *candidate.prefetched_votes,
+            *new_votes_by_candidate_id.get(candidate.id, []),
+        ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-18 22:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("elections", "0011_auto_20200520_2048")]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedElection",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("external_id", models.CharField(max_length=255, unique=True)),
+                ("title", models.CharField(max_length=255)),
+                ("document", models.TextField()),
+                ("closed_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="election",
+            name="closed_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
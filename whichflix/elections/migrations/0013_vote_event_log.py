@@ -0,0 +1,68 @@
+# Generated by Django 3.0.7 on 2026-10-18 22:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("elections", "0012_archivedelection")]
+
+    operations = [
+        migrations.CreateModel(
+            name="CandidateTallySnapshot",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("election_id", models.IntegerField()),
+                ("candidate_id", models.IntegerField()),
+                ("vote_count", models.IntegerField()),
+                ("last_vote_event_id", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="VoteEvent",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("election_id", models.IntegerField()),
+                ("participant_id", models.IntegerField()),
+                ("candidate_id", models.IntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("cast", "Cast"), ("retract", "Retract")],
+                        max_length=16,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="voteevent",
+            index=models.Index(
+                fields=["election_id", "id"], name="elections_v_electio_ba26c9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="candidatetallysnapshot",
+            index=models.Index(
+                fields=["election_id", "last_vote_event_id"],
+                name="elections_c_electio_726557_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.0.7 on 2026-10-18 22:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_election_memberships(apps, schema_editor):
+    # The index only lives on the default database, which held every election
+    # before sharding.
+    if schema_editor.connection.alias != "default":
+        return
+
+    ElectionMembership = apps.get_model("elections", "ElectionMembership")
+    Participant = apps.get_model("elections", "Participant")
+
+    ElectionMembership.objects.bulk_create(
+        [
+            ElectionMembership(device_id=device_id, election_id=election_id)
+            for device_id, election_id in Participant.objects.filter(
+                deleted_at__isnull=True
+            ).values_list("device_id", "election_id")
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0002_device"), ("elections", "0013_vote_event_log")]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShardedId",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="participant",
+            name="device",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="users.Device",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ElectionMembership",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("election_id", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "device",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="election_memberships",
+                        to="users.Device",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("device", "election_id")}},
+        ),
+        migrations.RunPython(create_election_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+import copy
+
+from django.db import migrations
+
+
+def _get_device_fields(apps):
+    Participant = apps.get_model("elections", "Participant")
+    field = Participant._meta.get_field("device")
+    constrained_field = copy.copy(field)
+    constrained_field.db_constraint = True
+
+    return Participant, field, constrained_field
+
+
+def add_device_constraint(apps, schema_editor):
+    # Devices live on the default database, so only its participants can reference
+    # them with a constraint.
+    if schema_editor.connection.alias != "default":
+        return
+
+    Participant, field, constrained_field = _get_device_fields(apps)
+    schema_editor.alter_field(Participant, field, constrained_field)
+
+
+def remove_device_constraint(apps, schema_editor):
+    if schema_editor.connection.alias != "default":
+        return
+
+    Participant, field, constrained_field = _get_device_fields(apps)
+    schema_editor.alter_field(Participant, constrained_field, field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("elections", "0014_election_shards")]
+
+    operations = [migrations.RunPython(add_device_constraint, remove_device_constraint)]
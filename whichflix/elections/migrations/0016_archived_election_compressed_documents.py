@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+from whichflix.compression import precompress
+
+
+def compress_archived_documents(apps, schema_editor):
+    ArchivedElection = apps.get_model("elections", "ArchivedElection")
+    archived_elections = ArchivedElection.objects.using(
+        schema_editor.connection.alias
+    ).only("id", "document")
+
+    for archived_election in archived_elections.iterator():
+        compressed_documents = precompress(archived_election.document.encode())
+        archived_elections.filter(id=archived_election.id).update(
+            document_br=compressed_documents["br"],
+            document_gzip=compressed_documents["gzip"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("elections", "0015_participant_device_constraint")]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedelection",
+            name="document_br",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name="archivedelection",
+            name="document_gzip",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.RunPython(compress_archived_documents, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="archivedelection",
+            name="document_br",
+            field=models.BinaryField(),
+        ),
+        migrations.AlterField(
+            model_name="archivedelection",
+            name="document_gzip",
+            field=models.BinaryField(),
+        ),
+    ]
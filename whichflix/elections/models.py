@@ -6,7 +6,7 @@ from whichflix.users.models import Device
 class Election(models.Model):
     external_id = models.CharField(unique=True, db_index=True, max_length=255)
     title = models.CharField(max_length=255)
-    closed_at = models.DateTimeField(null=True, blank=True)
+    closed_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -17,7 +17,9 @@ class Election(models.Model):
 
 class Participant(models.Model):
     name = models.CharField(max_length=255)
-    device = models.ForeignKey(Device, on_delete=models.PROTECT)
+    # Devices live on the default database, which may not host the election's shard.
+    # The constraint is only added on the default database, by a migration.
+    device = models.ForeignKey(Device, on_delete=models.PROTECT, db_constraint=False)
     election = models.ForeignKey(
         Election, related_name="participants", on_delete=models.PROTECT
     )
@@ -68,3 +70,103 @@ class Vote(models.Model):
 
     def __str__(self) -> str:
         return "Vote: {}".format(self.id)
+
+
+class ArchivedElection(models.Model):
+    """
+    Cold storage for elections that were closed past the retention window. The live
+    rows are deleted once the final election document is frozen here.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    external_id = models.CharField(unique=True, max_length=255)
+    title = models.CharField(max_length=255)
+    document = models.TextField()
+    # The document compressed with each encoding clients accept, so it is served
+    # without being compressed again.
+    document_br = models.BinaryField()
+    document_gzip = models.BinaryField()
+    closed_at = models.DateTimeField()
+
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return "Archived Election: {}".format(self.id)
+
+
+class VoteEvent(models.Model):
+    """
+    Append-only log of votes being cast and retracted. Rows are never updated or
+    deleted, and they reference elections, participants and candidates by id so the
+    log outlives compaction and archival.
+    """
+
+    CAST = "cast"
+    RETRACT = "retract"
+    KIND_CHOICES = [(CAST, "Cast"), (RETRACT, "Retract")]
+
+    election_id = models.IntegerField()
+    participant_id = models.IntegerField()
+    candidate_id = models.IntegerField()
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["election_id", "id"])]
+
+    def __str__(self) -> str:
+        return "Vote Event: {}".format(self.id)
+
+
+class CandidateTallySnapshot(models.Model):
+    """
+    The vote count of a candidate after applying every vote event of its election up
+    to and including `last_vote_event_id`.
+    """
+
+    election_id = models.IntegerField()
+    candidate_id = models.IntegerField()
+    vote_count = models.IntegerField()
+    last_vote_event_id = models.IntegerField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["election_id", "last_vote_event_id"])]
+
+    def __str__(self) -> str:
+        return "Candidate Tally Snapshot: {}".format(self.id)
+
+
+class ElectionMembership(models.Model):
+    """
+    Global index of the elections each device participates in. It stays on the
+    default database, since elections are sharded across databases.
+    """
+
+    device = models.ForeignKey(
+        Device, related_name="election_memberships", on_delete=models.CASCADE
+    )
+    election_id = models.IntegerField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ["device", "election_id"]
+
+    def __str__(self) -> str:
+        return "Election Membership: {}".format(self.id)
+
+
+class ShardedId(models.Model):
+    """
+    Sequence on the default database for election and candidate ids, which must be
+    unique across shards.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return "Sharded Id: {}".format(self.id)
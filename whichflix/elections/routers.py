@@ -0,0 +1,21 @@
+from typing import Optional
+
+from django.db.models import Model
+
+from whichflix.users.models import Device
+
+
+class ElectionShardRouter:
+    """
+    Election data is spread across the databases in `ELECTION_LOGICAL_SHARD_MAP`.
+    Objects stay on the database they were loaded from, so related lookups follow
+    them, while queries that start from an id pick their shard with `using()` in the
+    manager.
+    """
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> Optional[bool]:
+        # Participants reference devices, which always live on the default database.
+        if isinstance(obj1, Device) or isinstance(obj2, Device):
+            return True
+
+        return None
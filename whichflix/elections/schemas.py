@@ -15,6 +15,32 @@ DEVICE_ID_PARAMETER = openapi.Parameter(
     required=True,
 )
 
+CURSOR_PARAMETER = openapi.Parameter(
+    name="cursor",
+    in_=openapi.IN_QUERY,
+    description="The `next_cursor` of the previous page.",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+LIMIT_PARAMETER = openapi.Parameter(
+    name="limit",
+    in_=openapi.IN_QUERY,
+    description="Maximum number of results per page. Defaults to 20, capped at 50.",
+    type=openapi.TYPE_INTEGER,
+    required=False,
+)
+
+VIEW_PARAMETER = openapi.Parameter(
+    name="view",
+    in_=openapi.IN_QUERY,
+    description="Representation of each election: `full` documents (default) or "
+    "`summary` documents.",
+    type=openapi.TYPE_STRING,
+    enum=["full", "summary"],
+    required=False,
+)
+
 
 #
 # Request bodies
@@ -33,6 +59,49 @@ CREATE_CANDIDATE_REQUEST_BODY = openapi.Schema(
     required=["movie_id"],
 )
 
+UPDATE_VOTES_REQUEST_BODY = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "operations": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            description="Votes to cast or remove, at most 100. The last operation for a "
+            "candidate wins.",
+            max_items=100,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "candidate_id": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        description="A unique identifier for the candidate.",
+                        example="456",
+                    ),
+                    "action": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        description="Whether to cast or remove the participant's vote.",
+                        enum=["vote", "remove_vote"],
+                    ),
+                },
+                required=["candidate_id", "action"],
+            ),
+        )
+    },
+    required=["operations"],
+)
+
+CREATE_CANDIDATES_REQUEST_BODY = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "movie_ids": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            description="Unique identifiers for the movies to suggest, at most 50. Movies "
+            "that are already candidates are skipped.",
+            max_items=50,
+            items=openapi.Schema(type=openapi.TYPE_STRING, example="603"),
+        )
+    },
+    required=["movie_ids"],
+)
+
 CREATE_ELECTION_REQUEST_BODY = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -160,6 +229,12 @@ ELECTION_DOCUMENT_SCHEMA = openapi.Schema(
             description="Timestamp of the election's creation in ISO 8601 format.",
             example="2020-02-25T23:21:34+00:00",
         ),
+        "closed_at": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            nullable=True,
+            description="Timestamp of when the election was closed in ISO 8601 format.",
+            example="2020-02-26T03:02:11+00:00",
+        ),
         "candidates": openapi.Schema(
             type=openapi.TYPE_ARRAY,
             description="List of movie candidates and their voters.",
@@ -173,13 +248,180 @@ ELECTION_DOCUMENT_SCHEMA = openapi.Schema(
     },
 )
 
+ELECTION_SUMMARY_DOCUMENT_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "id": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="A unique identifier for the election.",
+            example="nygr37",
+        ),
+        "title": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="Description of the election.",
+            example="Movie night in Brooklyn!",
+        ),
+        "created_at": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="Timestamp of the election's creation in ISO 8601 format.",
+            example="2020-02-25T23:21:34+00:00",
+        ),
+        "closed_at": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            nullable=True,
+            description="Timestamp of when the election was closed in ISO 8601 format.",
+            example="2020-02-26T03:02:11+00:00",
+        ),
+        "participant_count": openapi.Schema(
+            type=openapi.TYPE_INTEGER,
+            description="The number of active participants in the election.",
+            example=4,
+        ),
+        "candidate_count": openapi.Schema(
+            type=openapi.TYPE_INTEGER,
+            description="The number of movie candidates in the election.",
+            example=6,
+        ),
+        "leading_candidate": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            nullable=True,
+            description="The candidate with the most votes, or null if nobody has voted.",
+            properties={
+                "id": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="A unique identifier for the candidate.",
+                    example="456",
+                ),
+                "movie_id": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="A unique identifier for the movie.",
+                    example="603",
+                ),
+                "vote_count": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="The number of votes the candidate has earned from active participants.",
+                    example=3,
+                ),
+            },
+        ),
+    },
+)
+
+# Swagger 2.0 has no `oneOf`, so listed elections are described by the properties of
+# both representations. Each document only has those of the requested view.
+LISTED_ELECTION_DOCUMENT_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    description="An election document, or an election summary document when "
+    "`view=summary` is passed.",
+    properties={
+        **ELECTION_DOCUMENT_SCHEMA.properties,
+        **ELECTION_SUMMARY_DOCUMENT_SCHEMA.properties,
+    },
+)
+
 GET_ELECTIONS_SCHEMA = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
         "results": openapi.Schema(
             type=openapi.TYPE_ARRAY,
-            description="List of elections the device is currently participating in.",
-            items=ELECTION_DOCUMENT_SCHEMA,
-        )
+            description="Page of elections the device is currently participating in. "
+            "Election summary documents when `view=summary` is passed.",
+            items=LISTED_ELECTION_DOCUMENT_SCHEMA,
+        ),
+        "next_cursor": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            nullable=True,
+            description="Cursor for the next page, or null on the last page.",
+            example="nygr37",
+        ),
     },
 )
+
+
+#
+# Operations
+#
+
+
+# `swagger_auto_schema` overrides of the views, applied by `swagger_operation`.
+CREATE_CANDIDATE_OPERATION = {
+    "operation_id": "Create Candidate",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": CREATE_CANDIDATE_REQUEST_BODY,
+    "responses": {201: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+CREATE_CANDIDATES_OPERATION = {
+    "operation_id": "Create Candidates",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": CREATE_CANDIDATES_REQUEST_BODY,
+    "responses": {201: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+CREATE_ELECTION_OPERATION = {
+    "operation_id": "Create Election",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": CREATE_ELECTION_REQUEST_BODY,
+    "responses": {201: ELECTION_DOCUMENT_SCHEMA, 404: "", 400: ""},
+}
+
+GET_ELECTIONS_OPERATION = {
+    "operation_id": "Get Elections",
+    "manual_parameters": [
+        DEVICE_ID_PARAMETER,
+        CURSOR_PARAMETER,
+        LIMIT_PARAMETER,
+        VIEW_PARAMETER,
+    ],
+    "responses": {200: GET_ELECTIONS_SCHEMA, 400: ""},
+}
+
+GET_ELECTION_OPERATION = {
+    "operation_id": "Get Election",
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 404: ""},
+}
+
+UPDATE_ELECTION_OPERATION = {
+    "operation_id": "Update Election",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": UPDATE_ELECTION_REQUEST_BODY,
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 404: ""},
+}
+
+CLOSE_ELECTION_OPERATION = {
+    "operation_id": "Close Election",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+UPDATE_VOTES_OPERATION = {
+    "operation_id": "Update Votes",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": UPDATE_VOTES_REQUEST_BODY,
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+CREATE_PARTICIPANT_OPERATION = {
+    "operation_id": "Create Participant",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "request_body": CREATE_PARTICIPANT_REQUEST_BODY,
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+DELETE_PARTICIPANT_OPERATION = {
+    "operation_id": "Delete Participant",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "responses": {200: ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
+
+CAST_VOTE_OPERATION = {
+    "operation_id": "Cast Vote",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "responses": {201: CANDIDATE_DOCUMENT_SCHEMA, 404: "", 400: ""},
+}
+
+DELETE_VOTE_OPERATION = {
+    "operation_id": "Delete Vote",
+    "manual_parameters": [DEVICE_ID_PARAMETER],
+    "responses": {200: CANDIDATE_DOCUMENT_SCHEMA, 400: "", 404: ""},
+}
@@ -0,0 +1,85 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from whichflix.elections import constants
+from whichflix.elections.models import ShardedId
+
+
+def get_election_shards() -> List[str]:
+    return list(
+        dict.fromkeys([DEFAULT_DB_ALIAS, *settings.ELECTION_LOGICAL_SHARD_MAP.values()])
+    )
+
+
+def is_sharded() -> bool:
+    return get_election_shards() != [DEFAULT_DB_ALIAS]
+
+
+def get_shard_for_id(sharded_id: int) -> str:
+    """
+    Return the database alias holding an election or candidate. Both ids end in the
+    logical shard of the election, so a bare candidate id can be routed as well.
+    """
+    logical_shard = sharded_id % constants.ELECTION_LOGICAL_SHARD_COUNT
+
+    return settings.ELECTION_LOGICAL_SHARD_MAP.get(logical_shard, DEFAULT_DB_ALIAS)
+
+
+def group_ids_by_shard(sharded_ids: Iterable[int]) -> Dict[str, List[int]]:
+    ids_by_shard: Dict[str, List[int]] = defaultdict(list)
+
+    for sharded_id in sharded_ids:
+        ids_by_shard[get_shard_for_id(sharded_id)].append(sharded_id)
+
+    return ids_by_shard
+
+
+def allocate_election_id() -> Optional[int]:
+    """
+    Allocate an id for a new election, whose logical shard is a hash of a global
+    sequence. Without sharding the database assigns ids as usual.
+    """
+    if not is_sharded():
+        return None
+
+    sequence = ShardedId.objects.using(DEFAULT_DB_ALIAS).create().id
+    logical_shard = (
+        zlib.crc32(str(sequence).encode()) % constants.ELECTION_LOGICAL_SHARD_COUNT
+    )
+
+    return sequence * constants.ELECTION_LOGICAL_SHARD_COUNT + logical_shard
+
+
+def allocate_ids_for_election(election_id: int, count: int) -> List[Optional[int]]:
+    """
+    Allocate ids for new candidates or participants of an election, which share the
+    logical shard of the election and are unique across shards.
+    """
+    if not is_sharded():
+        return [None] * count
+
+    logical_shard = election_id % constants.ELECTION_LOGICAL_SHARD_COUNT
+
+    return [
+        sequence * constants.ELECTION_LOGICAL_SHARD_COUNT + logical_shard
+        for sequence in _allocate_sequences(count)
+    ]
+
+
+def _allocate_sequences(count: int) -> List[int]:
+    sharded_ids = ShardedId.objects.using(DEFAULT_DB_ALIAS)
+
+    # Backends that return the ids of bulk inserts allocate them in one statement.
+    if connections[DEFAULT_DB_ALIAS].features.can_return_rows_from_bulk_insert:
+        return [
+            sharded_id.id
+            for sharded_id in sharded_ids.bulk_create(
+                [ShardedId() for _ in range(count)]
+            )
+        ]
+
+    return [sharded_ids.create().id for _ in range(count)]
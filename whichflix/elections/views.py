@@ -1,29 +1,27 @@
+from typing import Any, Dict, List, Optional
+
 from django.http import HttpRequest
-from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from whichflix.elections import builders, errors, manager, schemas
-from whichflix.elections.models import Election
+from whichflix.elections import builders, constants, errors, manager
+from whichflix.elections.models import ArchivedElection
+from whichflix.openapi.utils import swagger_operation
 from whichflix.users import manager as users_manager
+from whichflix.utils import decode_external_id, parse_integer
 
 
 class CandidatesView(APIView):
-    @swagger_auto_schema(
-        operation_id="Create Candidate",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        request_body=schemas.CREATE_CANDIDATE_REQUEST_BODY,
-        responses={201: schemas.ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.CREATE_CANDIDATE_OPERATION")
     def post(self, request: HttpRequest, election_id: str) -> Response:
         """
         Create a new movie candidate. Called when a user finds a movie they want to suggest
         to the group.
         """
-        try:
-            election = Election.objects.get(external_id=election_id)
-        except Election.DoesNotExist:
+        election = manager.get_election_by_external_id(election_id)
+
+        if not election:
             return Response({}, status=status.HTTP_404_NOT_FOUND)
 
         device_token = request.headers.get("X-Device-ID")
@@ -56,9 +54,88 @@ class CandidatesView(APIView):
 
         try:
             manager.create_candidate_for_election(election, participant, movie_id)
-        except (errors.CandidateAlreadyExistsError, errors.MovieDoesNotExistError) as e:
+        except (
+            errors.CandidateAlreadyExistsError,
+            errors.ElectionClosedError,
+            errors.MovieDoesNotExistError,
+        ) as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except errors.MovieDatabaseUnavailableError as e:
+            return Response(
+                {"error": e.message}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        manager.prefetch_election_related_objects(election)
+        candidate_actions_map = manager.get_candidate_actions_map_for_election(
+            election, participant
+        )
+        election_document = builders.build_election_document(
+            election, candidate_actions_map
+        )
+
+        manager.send_election_event(election_document)
+
+        return Response(election_document, status=status.HTTP_201_CREATED)
+
+
+class BulkCandidatesView(APIView):
+    @swagger_operation("whichflix.elections.schemas.CREATE_CANDIDATES_OPERATION")
+    def post(self, request: HttpRequest, election_id: str) -> Response:
+        """
+        Create several movie candidates at once. Called when a user seeds an election with
+        a list of movies, such as a watchlist.
+        """
+        election = manager.get_election_by_external_id(election_id)
+
+        if not election:
+            return Response({}, status=status.HTTP_404_NOT_FOUND)
+
+        device_token = request.headers.get("X-Device-ID")
+
+        if not device_token:
+            return Response(
+                {"error": "Missing header: `X-Device-ID`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        participant = manager.get_participant_by_election_and_device_token(
+            election, device_token
+        )
+
+        if not participant:
+            return Response(
+                {
+                    "error": "Participant with the provided device ID does not exist in the election."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        movie_ids = request.data.get("movie_ids")
+
+        if not movie_ids or not isinstance(movie_ids, list):
+            return Response(
+                {"error": "Missing parameter: `movie_ids`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(movie_ids) > constants.BULK_CANDIDATES_MAX_COUNT:
+            return Response(
+                {"error": "Invalid parameter: `movie_ids`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            manager.create_candidates_for_election(
+                election, participant, [str(movie_id) for movie_id in movie_ids]
+            )
+        except (errors.ElectionClosedError, errors.MovieDoesNotExistError) as e:
             return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except errors.MovieDatabaseUnavailableError as e:
+            return Response(
+                {"error": e.message}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
+        manager.prefetch_election_related_objects(election)
         candidate_actions_map = manager.get_candidate_actions_map_for_election(
             election, participant
         )
@@ -72,12 +149,7 @@ class CandidatesView(APIView):
 
 
 class ElectionsView(APIView):
-    @swagger_auto_schema(
-        operation_id="Create Election",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        request_body=schemas.CREATE_ELECTION_REQUEST_BODY,
-        responses={201: schemas.ELECTION_DOCUMENT_SCHEMA, 404: "", 400: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.CREATE_ELECTION_OPERATION")
     def post(self, request: HttpRequest) -> Response:
         """
         Create a new election.
@@ -112,14 +184,12 @@ class ElectionsView(APIView):
 
         return Response(election_document, status=status.HTTP_201_CREATED)
 
-    @swagger_auto_schema(
-        operation_id="Get Elections",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        responses={200: schemas.GET_ELECTIONS_SCHEMA, 400: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.GET_ELECTIONS_OPERATION")
     def get(self, request: HttpRequest) -> Response:
         """
-        Retrieve all elections the user is a participating in.
+        Retrieve the elections the user is a participating in, one page at a time. Pass
+        the `next_cursor` of a response as `cursor` to retrieve the following page. Pass
+        `view=summary` to receive lightweight election summaries instead of full documents.
         """
         device_token = request.headers.get("X-Device-ID")
 
@@ -129,24 +199,69 @@ class ElectionsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        elections = manager.get_elections_and_related_objects_by_device_token(
-            device_token
+        after_election_id = None
+        cursor = request.GET.get("cursor")
+
+        if cursor:
+            after_election_id = decode_external_id(cursor)
+
+            if after_election_id is None:
+                return Response(
+                    {"error": "Invalid parameter: `cursor`."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        limit = parse_integer(
+            request.GET.get("limit") or str(constants.ELECTIONS_DEFAULT_PAGE_SIZE)
         )
 
+        if limit is None or limit < 1:
+            return Response(
+                {"error": "Invalid parameter: `limit`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = min(limit, constants.ELECTIONS_MAX_PAGE_SIZE)
+        view = request.GET.get("view") or constants.ELECTIONS_VIEW_FULL
+
+        # Fetch one extra election to know whether another page follows.
+        if view == constants.ELECTIONS_VIEW_SUMMARY:
+            elections = manager.get_election_summaries_by_device_token(
+                device_token, after_election_id, limit + 1
+            )
+            build_document = builders.build_election_summary_document
+            build_archived_document = builders.build_archived_election_summary_document
+        elif view == constants.ELECTIONS_VIEW_FULL:
+            elections = manager.get_elections_and_related_objects_by_device_token(
+                device_token, after_election_id, limit + 1
+            )
+            build_document = builders.build_election_document
+            build_archived_document = builders.build_archived_election_document
+        else:
+            return Response(
+                {"error": "Invalid parameter: `view`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        page = elections[:limit]
+
         response_body = {
             "results": [
-                builders.build_election_document(election) for election in elections
-            ]
+                (
+                    build_archived_document(election)
+                    if isinstance(election, ArchivedElection)
+                    else build_document(election)
+                )
+                for election in page
+            ],
+            "next_cursor": page[-1].external_id if len(elections) > limit else None,
         }
 
         return Response(response_body, status=status.HTTP_200_OK)
 
 
 class ElectionDetailView(APIView):
-    @swagger_auto_schema(
-        operation_id="Get Election",
-        responses={200: schemas.ELECTION_DOCUMENT_SCHEMA, 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.GET_ELECTION_OPERATION")
     def get(self, request: HttpRequest, election_id: str) -> Response:
         """
         Get information about a single election, including participants and candidates.
@@ -154,7 +269,15 @@ class ElectionDetailView(APIView):
         election = manager.get_election_and_related_objects(election_id)
 
         if not election:
-            return Response({}, status=status.HTTP_404_NOT_FOUND)
+            archived_election = manager.get_archived_election(election_id)
+
+            if not archived_election:
+                return Response({}, status=status.HTTP_404_NOT_FOUND)
+
+            # Served as stored, since archived documents are compressed when archived.
+            return builders.build_archived_election_content(
+                archived_election
+            ).build_response(request, content_type="application/json")
 
         candidate_actions_map = None
 
@@ -174,12 +297,7 @@ class ElectionDetailView(APIView):
 
         return Response(election_document, status=status.HTTP_200_OK)
 
-    @swagger_auto_schema(
-        operation_id="Update Election",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        request_body=schemas.UPDATE_ELECTION_REQUEST_BODY,
-        responses={200: schemas.ELECTION_DOCUMENT_SCHEMA, 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.UPDATE_ELECTION_OPERATION")
     def put(self, request: HttpRequest, election_id: str) -> Response:
         """
         Update the attributes of an election.
@@ -229,21 +347,160 @@ class ElectionDetailView(APIView):
         return Response(election_document, status=status.HTTP_200_OK)
 
 
+class ElectionCloseView(APIView):
+    @swagger_operation("whichflix.elections.schemas.CLOSE_ELECTION_OPERATION")
+    def post(self, request: HttpRequest, election_id: str) -> Response:
+        """
+        Close an election. Closed elections no longer accept candidates or votes, and are
+        eventually archived while remaining readable.
+        """
+        device_token = request.headers.get("X-Device-ID")
+
+        if not device_token:
+            return Response(
+                {"error": "Missing header: `X-Device-ID`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        election = manager.get_election_and_related_objects(election_id)
+
+        if not election:
+            return Response({}, status=status.HTTP_404_NOT_FOUND)
+
+        participant = manager.get_participant_by_election_and_device_token(
+            election, device_token
+        )
+
+        if not participant:
+            return Response(
+                {
+                    "error": "Participant with the provided device ID does not exist in the election."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            manager.close_election(election, participant)
+        except errors.ParticipantDidNotInitiateElectionError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+
+        election_document = builders.build_election_document(election)
+
+        manager.send_election_event(election_document)
+
+        return Response(election_document, status=status.HTTP_200_OK)
+
+
+class ElectionVotesView(APIView):
+    @swagger_operation("whichflix.elections.schemas.UPDATE_VOTES_OPERATION")
+    def post(self, request: HttpRequest, election_id: str) -> Response:
+        """
+        Cast and remove several of the participant's votes at once. All operations are
+        applied together, and a single updated election document is returned.
+        """
+        election = manager.get_election_by_external_id(election_id)
+
+        if not election:
+            return Response({}, status=status.HTTP_404_NOT_FOUND)
+
+        device_token = request.headers.get("X-Device-ID")
+
+        if not device_token:
+            return Response(
+                {"error": "Missing header: `X-Device-ID`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        participant = manager.get_participant_by_election_and_device_token(
+            election, device_token
+        )
+
+        if not participant:
+            return Response(
+                {
+                    "error": "Participant with the provided device ID does not exist in the election."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        candidate_ids_by_action = _parse_vote_operations(request.data.get("operations"))
+
+        if candidate_ids_by_action is None:
+            return Response(
+                {"error": "Invalid parameter: `operations`."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            manager.update_votes_for_participant(
+                election,
+                participant,
+                candidate_ids_by_action["vote"],
+                candidate_ids_by_action["remove_vote"],
+            )
+        except (
+            errors.CandidateNotPartOfElectionError,
+            errors.ElectionClosedError,
+            errors.ParticipantNotPartOfElectionError,
+        ) as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+
+        manager.prefetch_election_related_objects(election)
+        candidate_actions_map = manager.get_candidate_actions_map_for_election(
+            election, participant
+        )
+        election_document = builders.build_election_document(
+            election, candidate_actions_map
+        )
+
+        manager.send_election_event(election_document)
+
+        return Response(election_document, status=status.HTTP_200_OK)
+
+
+def _parse_vote_operations(operations: Any) -> Optional[Dict[str, List[int]]]:
+    if (
+        not isinstance(operations, list)
+        or not operations
+        or len(operations) > constants.VOTE_OPERATIONS_MAX_COUNT
+    ):
+        return None
+
+    # The last operation for a candidate wins.
+    action_by_candidate_id = {}
+
+    for operation in operations:
+        if not isinstance(operation, dict):
+            return None
+
+        action = operation.get("action")
+        candidate_id = parse_integer(str(operation.get("candidate_id")))
+
+        if action not in ("vote", "remove_vote") or candidate_id is None:
+            return None
+
+        action_by_candidate_id[candidate_id] = action
+
+    return {
+        action: [
+            candidate_id
+            for candidate_id, candidate_action in action_by_candidate_id.items()
+            if candidate_action == action
+        ]
+        for action in ("vote", "remove_vote")
+    }
+
+
 class ParticipantsView(APIView):
-    @swagger_auto_schema(
-        operation_id="Create Participant",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        request_body=schemas.CREATE_PARTICIPANT_REQUEST_BODY,
-        responses={200: schemas.ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.CREATE_PARTICIPANT_OPERATION")
     def post(self, request: HttpRequest, election_id: str) -> Response:
         """
         Create a new participant for an existing election. Called when a user clicks an
         election link and is prompted to enter their name and join the election.
         """
-        try:
-            election = Election.objects.get(external_id=election_id)
-        except Election.DoesNotExist:
+        election = manager.get_election_by_external_id(election_id)
+
+        if not election:
             return Response({}, status=status.HTTP_404_NOT_FOUND)
 
         name = request.data.get("name")
@@ -264,10 +521,14 @@ class ParticipantsView(APIView):
 
         device = users_manager.get_or_create_device(device_token)
 
-        participant = manager.create_or_activate_participant_for_election(
-            election, device, name
-        )
+        try:
+            participant = manager.create_or_activate_participant_for_election(
+                election, device, name
+            )
+        except errors.ElectionClosedError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
+        manager.prefetch_election_related_objects(election)
         candidate_actions_map = manager.get_candidate_actions_map_for_election(
             election, participant
         )
@@ -279,20 +540,16 @@ class ParticipantsView(APIView):
 
         return Response(election_document, status=status.HTTP_201_CREATED)
 
-    @swagger_auto_schema(
-        operation_id="Delete Participant",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        responses={200: schemas.ELECTION_DOCUMENT_SCHEMA, 400: "", 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.DELETE_PARTICIPANT_OPERATION")
     def delete(self, request: HttpRequest, election_id: str) -> Response:
         """
         Remove a participant from an election. This is called when a user chooses to leave an
         election. Deleted participants and their votes will no longer appear in the election
         document.
         """
-        try:
-            election = Election.objects.get(external_id=election_id)
-        except Election.DoesNotExist:
+        election = manager.get_election_by_external_id(election_id)
+
+        if not election:
             return Response({}, status=status.HTTP_404_NOT_FOUND)
 
         device_token = request.headers.get("X-Device-ID")
@@ -315,8 +572,12 @@ class ParticipantsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        manager.delete_participant(participant)
+        try:
+            manager.delete_participant(election, participant)
+        except errors.ElectionClosedError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
+        manager.prefetch_election_related_objects(election)
         candidate_actions_map = manager.get_candidate_actions_map_for_election(
             election, participant
         )
@@ -330,11 +591,7 @@ class ParticipantsView(APIView):
 
 
 class VotesView(APIView):
-    @swagger_auto_schema(
-        operation_id="Cast Vote",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        responses={201: schemas.CANDIDATE_DOCUMENT_SCHEMA, 404: "", 400: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.CAST_VOTE_OPERATION")
     def post(self, request: HttpRequest, candidate_id: str) -> Response:
         """
         Cast a vote for one of the candidates in an election.
@@ -367,21 +624,26 @@ class VotesView(APIView):
         try:
             manager.create_or_activate_vote_for_candidate(participant, candidate)
         except (
+            errors.ElectionClosedError,
             errors.ParticipantNotPartOfElectionError,
             errors.ParticipantAlreadyVotedForCandidate,
         ) as e:
             return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Allocated before the votes are read, so the tally with the highest version
+        # counts every vote written before it.
+        tally_version = manager.allocate_candidate_tally_version(candidate)
+        manager.prefetch_candidate_related_objects(candidate)
         actions = manager.get_candidate_actions_for_participant(candidate, participant)
         candidate_document = builders.build_candidate_document(candidate, actions)
 
+        manager.send_candidate_tally_event(
+            candidate, candidate_document["vote_count"], tally_version
+        )
+
         return Response(candidate_document, status=status.HTTP_201_CREATED)
 
-    @swagger_auto_schema(
-        operation_id="Delete Vote",
-        manual_parameters=[schemas.DEVICE_ID_PARAMETER],
-        responses={200: schemas.CANDIDATE_DOCUMENT_SCHEMA, 400: "", 404: ""},
-    )
+    @swagger_operation("whichflix.elections.schemas.DELETE_VOTE_OPERATION")
     def delete(self, request: HttpRequest, candidate_id: str) -> Response:
         """
         Remove a vote from one of the candidates in an election.
@@ -411,7 +673,10 @@ class VotesView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        vote = manager.get_vote_by_participant_and_candidate(participant, candidate)
+        try:
+            vote = manager.delete_vote_for_candidate(participant, candidate)
+        except errors.ElectionClosedError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
 
         if not vote:
             return Response(
@@ -421,9 +686,15 @@ class VotesView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        manager.delete_vote(vote)
-
+        # Allocated before the votes are read, so the tally with the highest version
+        # counts every vote written before it.
+        tally_version = manager.allocate_candidate_tally_version(candidate)
+        manager.prefetch_candidate_related_objects(candidate)
         actions = manager.get_candidate_actions_for_participant(candidate, participant)
         candidate_document = builders.build_candidate_document(candidate, actions)
 
+        manager.send_candidate_tally_event(
+            candidate, candidate_document["vote_count"], tally_version
+        )
+
         return Response(candidate_document, status=status.HTTP_200_OK)
@@ -0,0 +1,18 @@
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from whichflix.events.backends import EventBackend
+
+
+@lru_cache(maxsize=None)
+def get_event_backend() -> EventBackend:
+    return import_string(settings.EVENT_BACKEND)()
+
+
+def send_event(
+    channel: str, event_type: str, data: dict, state_key: Optional[str] = None
+) -> None:
+    get_event_backend().publish(channel, event_type, data, state_key)
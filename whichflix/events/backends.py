@@ -0,0 +1,432 @@
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+
+from whichflix.clients import redis_client, redis_subscriber_client
+from whichflix.events import constants
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[str, bytes], None]
+
+# The channel, type, data and state key of an event.
+Event = Tuple[str, str, dict, Optional[str]]
+
+
+class EventBackend:
+    """
+    Carries events from the process that publishes them to the processes serving
+    event streams. `listen` is called once per serving process and invokes the
+    callback with the channel and the encoded event for every published event.
+    """
+
+    def publish(
+        self, channel: str, event_type: str, data: dict, state_key: Optional[str] = None
+    ) -> None:
+        """
+        Publishes an event. Events with the same state key, which defaults to the event
+        type, carry the same state, so only the latest of them needs delivering. Events
+        whose data has a `version` are only replaced by events with a higher one.
+        """
+        raise NotImplementedError
+
+    def listen(self, callback: EventCallback) -> None:
+        raise NotImplementedError
+
+    def get_history(self, channel: str, last_event_id: str) -> List[bytes]:
+        """
+        Returns the encoded events a subscriber reconnecting with `last_event_id`
+        missed, or the latest event of each state key when they are no longer retained.
+        """
+        return []
+
+
+class RedisEventBackend(EventBackend):
+    """
+    Publishes events to Redis pub/sub. Each serving process holds a single
+    subscription for every channel and fans events out to its own subscribers.
+    Events published concurrently may reach subscribers out of id order.
+    """
+
+    def publish(
+        self, channel: str, event_type: str, data: dict, state_key: Optional[str] = None
+    ) -> None:
+        try:
+            self.publish_batch([(channel, event_type, data, state_key)])
+        except redis.RedisError:
+            # Events are best effort, so a failed publish does not fail the request.
+            logger.exception("Failed to publish event to channel `%s`.", channel)
+
+    def publish_batch(self, events: List[Event]) -> None:
+        """
+        Records and publishes events in order.
+        """
+        with redis_client.pipeline() as pipeline:
+            while True:
+                self._add_publish_commands(pipeline, events)
+
+                try:
+                    pipeline.execute()
+                    return
+                except redis.WatchError:
+                    # Another publisher numbered events on the same channels first.
+                    continue
+
+    def get_history(self, channel: str, last_event_id: str) -> List[bytes]:
+        if not keeps_history(channel):
+            return []
+
+        history_key = constants.EVENT_HISTORY_KEY.format(channel=channel)
+
+        try:
+            last_sequence: Optional[int] = int(last_event_id)
+        except ValueError:
+            last_sequence = None
+
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            pipeline.zrange(history_key, 0, 0, withscores=True)
+            pipeline.zrange(history_key, -1, -1, withscores=True)
+            pipeline.zrangebyscore(
+                history_key, "({}".format(last_sequence or 0), "+inf"
+            )
+            pipeline.hvals(constants.EVENT_LATEST_KEY.format(channel=channel))
+            oldest_events, newest_events, missed_events, latest_events = (
+                pipeline.execute()
+            )
+        except redis.RedisError:
+            logger.exception("Failed to read the history of channel `%s`.", channel)
+            return []
+
+        # A last event id beyond the newest event was numbered by a sequence that has
+        # since expired, and restarted.
+        if (
+            last_sequence is not None
+            and oldest_events
+            and oldest_events[0][1] <= last_sequence + 1
+            and last_sequence <= newest_events[0][1]
+        ):
+            return missed_events
+
+        # The gap is no longer retained, so send the latest state instead.
+        return sorted(latest_events, key=lambda event: json.loads(event)["id"])
+
+    def _add_publish_commands(
+        self, pipeline: redis.client.Pipeline, events: List[Event]
+    ) -> None:
+        """
+        Numbers the events on channels that keep history, starts the transaction of
+        `pipeline`, and adds the commands that record and publish them to it.
+        """
+        event_ids = allocate_event_ids(
+            pipeline, [channel for channel, _, _, _ in events]
+        )
+
+        for (channel, event_type, data, state_key), event_id in zip(events, event_ids):
+            event = encode_event(event_type, data, event_id, state_key)
+
+            if event_id is not None:
+                history_key = constants.EVENT_HISTORY_KEY.format(channel=channel)
+                latest_key = constants.EVENT_LATEST_KEY.format(channel=channel)
+                pipeline.zadd(history_key, {event: event_id})
+                pipeline.zremrangebyrank(
+                    history_key, 0, -constants.EVENT_HISTORY_LENGTH - 1
+                )
+                pipeline.hset(latest_key, state_key or event_type, event)
+                pipeline.expire(history_key, constants.EVENT_HISTORY_TTL_IN_SECONDS)
+                pipeline.expire(latest_key, constants.EVENT_HISTORY_TTL_IN_SECONDS)
+
+            pipeline.publish(constants.EVENT_CHANNEL_KEY.format(channel=channel), event)
+
+    def listen(self, callback: EventCallback) -> None:
+        thread = threading.Thread(
+            target=self._listen, args=(callback,), name="event-listener", daemon=True
+        )
+        thread.start()
+
+    def _listen(self, callback: EventCallback) -> None:
+        prefix = constants.EVENT_CHANNEL_KEY.format(channel="")
+
+        while True:
+            try:
+                pubsub = redis_subscriber_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(constants.EVENT_CHANNEL_KEY.format(channel="*"))
+
+                for message in pubsub.listen():
+                    channel = message["channel"].decode()[len(prefix) :]
+                    callback(channel, message["data"])
+            except redis.RedisError:
+                logger.exception("Lost the event subscription, reconnecting.")
+                time.sleep(constants.EVENT_BACKEND_RECONNECT_DELAY_IN_SECONDS)
+
+
+class QueuedEventBackend(RedisEventBackend):
+    """
+    Appends events to a queue in Redis instead of publishing them, so requests do not
+    wait on the publish. The `dispatch_events` worker publishes queued events in the
+    order they were queued, except for coalesced events, which are published once
+    their window has passed, after events queued later for other state. A lock in
+    Redis lets a single dispatcher publish at a time, so extra workers only take over
+    once it stops.
+    """
+
+    def __init__(self) -> None:
+        self.dispatcher_id = uuid.uuid4().hex.encode()
+        # Events held back by the coalescing window, by coalescing key, and when an
+        # event for each key was last published. Pending events are also kept in Redis,
+        # so a restarted dispatcher publishes them.
+        self.pending_events: Optional[Dict[str, bytes]] = None
+        self.last_published_at: Dict[str, float] = {}
+
+    def publish(
+        self, channel: str, event_type: str, data: dict, state_key: Optional[str] = None
+    ) -> None:
+        queued_event = {"channel": channel, "event": event_type, "data": data}
+
+        if state_key is not None:
+            queued_event["state_key"] = state_key
+
+        try:
+            redis_client.rpush(constants.EVENT_QUEUE_KEY, json.dumps(queued_event))
+        except redis.RedisError:
+            logger.exception("Failed to queue event for channel `%s`.", channel)
+
+    def dispatch(self, batch_size: int = constants.EVENT_DISPATCH_BATCH_SIZE) -> int:
+        """
+        Publishes the oldest queued events and removes them from the queue. Events
+        stay queued if the publish fails, so they are retried in the same order.
+
+        Events for an election are coalesced: the first event in a burst is published
+        right away, and the rest of the burst collapses into its latest event, or the
+        one with the highest version, which is published once the coalescing window has
+        passed.
+
+        Returns 0 without publishing while another dispatcher holds the lock.
+        """
+        with redis_client.pipeline() as pipeline:
+            return self._dispatch(pipeline, batch_size)
+
+    def _dispatch(self, pipeline: redis.client.Pipeline, batch_size: int) -> int:
+        # The lock is watched from reading the queue until the batch is published and
+        # trimmed, so the batch is only removed from the queue by its publisher.
+        pipeline.watch(constants.EVENT_DISPATCHER_LOCK_KEY)
+        lock_owner = pipeline.get(constants.EVENT_DISPATCHER_LOCK_KEY)
+
+        if lock_owner not in (None, self.dispatcher_id):
+            return 0
+
+        # Another dispatcher may have changed the pending events since this one last
+        # held the lock.
+        if lock_owner is None or self.pending_events is None:
+            self.pending_events = {
+                key.decode(): queued_event
+                for key, queued_event in pipeline.hgetall(
+                    constants.EVENT_PENDING_KEY
+                ).items()
+            }
+
+        queued_events = pipeline.lrange(constants.EVENT_QUEUE_KEY, 0, batch_size - 1)
+
+        if not queued_events and not self.pending_events:
+            return 0
+
+        now = time.monotonic()
+        window = settings.EVENT_COALESCING_WINDOW_IN_SECONDS
+        pending_events = dict(self.pending_events)
+        last_published_at = dict(self.last_published_at)
+        events = []
+
+        for queued_event in queued_events:
+            decoded_event = json.loads(queued_event)
+            key = get_coalescing_key(decoded_event)
+
+            if key is not None:
+                if (
+                    key in pending_events
+                    or now - last_published_at.get(key, -math.inf) < window
+                ):
+                    if not is_superseded(decoded_event, pending_events.get(key)):
+                        pending_events[key] = queued_event
+
+                    continue
+
+                last_published_at[key] = now
+
+            events.append(decoded_event)
+
+        for key in list(pending_events):
+            if now - last_published_at.get(key, -math.inf) >= window:
+                events.append(json.loads(pending_events.pop(key)))
+                last_published_at[key] = now
+
+        # Starts the transaction, once the sequences numbering the events are watched.
+        self._add_publish_commands(
+            pipeline,
+            [
+                (
+                    event["channel"],
+                    event["event"],
+                    event["data"],
+                    event.get("state_key"),
+                )
+                for event in events
+            ],
+        )
+        pipeline.delete(constants.EVENT_PENDING_KEY)
+
+        if pending_events:
+            pipeline.hset(constants.EVENT_PENDING_KEY, mapping=pending_events)
+
+        pipeline.ltrim(constants.EVENT_QUEUE_KEY, len(queued_events), -1)
+        pipeline.set(
+            constants.EVENT_DISPATCHER_LOCK_KEY,
+            self.dispatcher_id,
+            ex=constants.EVENT_DISPATCHER_LOCK_TTL_IN_SECONDS,
+        )
+
+        try:
+            pipeline.execute()
+        except redis.WatchError:
+            # Another dispatcher took the lock in the meantime.
+            return 0
+
+        self.pending_events = pending_events
+        self.last_published_at = {
+            key: published_at
+            for key, published_at in last_published_at.items()
+            if now - published_at < window
+        }
+
+        return len(queued_events)
+
+
+def is_superseded(event: dict, pending_event: Optional[bytes]) -> bool:
+    """
+    Whether the event held back for the same state has a higher version, so `event`
+    carries an older state, as a tally counted before a concurrent vote does.
+    """
+    if pending_event is None:
+        return False
+
+    version = get_event_version(event)
+    pending_version = get_event_version(json.loads(pending_event))
+
+    return (
+        version is not None
+        and pending_version is not None
+        and version < pending_version
+    )
+
+
+def get_event_version(event: dict) -> Optional[int]:
+    data = event["data"]
+
+    return data.get("version") if isinstance(data, dict) else None
+
+
+def get_coalescing_key(event: dict) -> Optional[str]:
+    if not event["channel"].startswith(constants.EVENT_COALESCED_CHANNEL_PREFIXES):
+        return None
+
+    return "{channel}:{state_key}".format(
+        channel=event["channel"], state_key=event.get("state_key") or event["event"]
+    )
+
+
+class LocalEventBackend(EventBackend):
+    """
+    Delivers events within the current process, for development and tests without
+    Redis.
+    """
+
+    def __init__(self) -> None:
+        self.callbacks: List[EventCallback] = []
+
+    def publish(
+        self, channel: str, event_type: str, data: dict, state_key: Optional[str] = None
+    ) -> None:
+        event = encode_event(event_type, data, state_key=state_key)
+
+        for callback in self.callbacks:
+            callback(channel, event)
+
+    def listen(self, callback: EventCallback) -> None:
+        self.callbacks.append(callback)
+
+
+def keeps_history(channel: str) -> bool:
+    return channel.startswith(constants.EVENT_HISTORY_CHANNEL_PREFIXES)
+
+
+def allocate_event_ids(
+    pipeline: redis.client.Pipeline, channels: List[str]
+) -> List[Optional[int]]:
+    """
+    Returns the next id in the sequence of each channel that keeps history. The
+    sequences are watched and read in a single round trip, then `pipeline` starts its
+    transaction and advances them in it. Ids are only used up if the transaction
+    executes, so a transaction retried after a `WatchError` allocates them again.
+
+    Events only reach subscribers in id order when a single process publishes them.
+    This holds for `QueuedEventBackend`, whose dispatchers publish one at a time, but
+    not for `RedisEventBackend` publishing from concurrent requests.
+    """
+    sequence_keys = {
+        channel: constants.EVENT_SEQUENCE_KEY.format(channel=channel)
+        for channel in channels
+        if keeps_history(channel)
+    }
+    last_event_ids: Dict[str, int] = {}
+
+    if sequence_keys:
+        keys = sorted(set(sequence_keys.values()))
+        pipeline.watch(*keys)
+        last_event_ids = {
+            key: int(last_event_id or 0)
+            for key, last_event_id in zip(keys, pipeline.mget(keys))
+        }
+
+    pipeline.multi()
+    event_ids: List[Optional[int]] = []
+
+    for channel in channels:
+        sequence_key = sequence_keys.get(channel)
+
+        if sequence_key is None:
+            event_ids.append(None)
+            continue
+
+        last_event_ids[sequence_key] += 1
+        event_ids.append(last_event_ids[sequence_key])
+
+    for sequence_key, last_event_id in last_event_ids.items():
+        # Sequences expire along with the history they number.
+        pipeline.set(
+            sequence_key, last_event_id, ex=constants.EVENT_HISTORY_TTL_IN_SECONDS
+        )
+
+    return event_ids
+
+
+def encode_event(
+    event_type: str,
+    data: dict,
+    event_id: Optional[int] = None,
+    state_key: Optional[str] = None,
+) -> bytes:
+    event = {"event": event_type, "data": data}
+
+    if event_id is not None:
+        event["id"] = event_id
+
+    if state_key is not None:
+        event["state_key"] = state_key
+
+    return json.dumps(event).encode()
@@ -0,0 +1,62 @@
+#
+# Event streams
+#
+
+
+# Comment lines sent to idle streams, so proxies do not close them.
+EVENT_STREAM_KEEPALIVE_IN_SECONDS = 15.0
+
+# Events buffered for a slow event stream before its oldest events are dropped.
+EVENT_SUBSCRIBER_QUEUE_SIZE = 32
+
+EVENT_BACKEND_RECONNECT_DELAY_IN_SECONDS = 1.0
+
+# Elections a single WebSocket connection can follow.
+WEBSOCKET_MAX_SUBSCRIPTIONS = 100
+
+# Close code for WebSocket connections that do not identify their device.
+WEBSOCKET_UNAUTHORIZED_CODE = 4401
+
+
+#
+# Event history
+#
+
+
+# Channels whose recent events are kept, so reconnecting subscribers can resume.
+EVENT_HISTORY_CHANNEL_PREFIXES = ("election-",)
+EVENT_HISTORY_LENGTH = 100
+EVENT_HISTORY_TTL_IN_SECONDS = 7 * 24 * 60 * 60
+
+
+#
+# Event dispatcher
+#
+
+
+# Queued events published per round trip to Redis.
+EVENT_DISPATCH_BATCH_SIZE = 100
+EVENT_DISPATCH_INTERVAL_IN_SECONDS = 0.05
+
+# Failed batches are retried with exponential backoff, up to this delay.
+EVENT_DISPATCH_MAX_RETRY_DELAY_IN_SECONDS = 5.0
+
+# Another dispatcher takes over once the active one has published nothing for this long.
+EVENT_DISPATCHER_LOCK_TTL_IN_SECONDS = 10
+
+# Channels whose events carry the latest state, so bursts can be coalesced.
+EVENT_COALESCED_CHANNEL_PREFIXES = ("election-",)
+
+
+#
+# Redis keys
+#
+
+
+EVENT_CHANNEL_KEY = "events:channel:{channel}"
+EVENT_QUEUE_KEY = "events:queue"
+EVENT_PENDING_KEY = "events:pending"
+EVENT_DISPATCHER_LOCK_KEY = "events:dispatcher:lock"
+EVENT_HISTORY_KEY = "events:history:{channel}"
+EVENT_LATEST_KEY = "events:latest:{channel}"
+EVENT_SEQUENCE_KEY = "events:sequence:{channel}"
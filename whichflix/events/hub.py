@@ -0,0 +1,124 @@
+import asyncio
+import json
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Set
+
+from whichflix.events import get_event_backend
+from whichflix.events.backends import EventBackend
+
+
+class EventMessage:
+    """
+    An event as delivered to the subscribers of a channel. The event data is
+    serialized once and shared by every subscriber.
+    """
+
+    __slots__ = (
+        "channel",
+        "event_id",
+        "event_type",
+        "state_key",
+        "data",
+        "_server_sent_event",
+    )
+
+    def __init__(self, channel: str, decoded_event: dict) -> None:
+        self.channel = channel
+        self.event_id: Optional[int] = decoded_event.get("id")
+        self.event_type: str = decoded_event["event"]
+        self.state_key: str = decoded_event.get("state_key") or self.event_type
+        self.data = json.dumps(decoded_event["data"])
+        self._server_sent_event: Optional[bytes] = None
+
+    @property
+    def server_sent_event(self) -> bytes:
+        if self._server_sent_event is None:
+            self._server_sent_event = format_server_sent_event(self)
+
+        return self._server_sent_event
+
+
+Subscriber = Callable[[EventMessage], None]
+
+
+class EventHub:
+    """
+    Fans events out from the event backend to the subscribers in this process. Each
+    event is decoded once and shared by every subscriber of its channel, so the cost
+    of a publish grows with the number of processes rather than the number of
+    subscribers.
+    """
+
+    def __init__(self, backend: EventBackend) -> None:
+        self.backend = backend
+        self.subscribers: Dict[str, Set[Subscriber]] = defaultdict(set)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None:
+        """
+        Calls `subscriber` on the event loop with every event published to `channel`.
+        """
+        if self.loop is None:
+            self.loop = asyncio.get_event_loop()
+            self.backend.listen(self._receive)
+
+        self.subscribers[channel].add(subscriber)
+
+    def unsubscribe(self, channel: str, subscriber: Subscriber) -> None:
+        subscribers = self.subscribers.get(channel)
+
+        if subscribers is None:
+            return
+
+        subscribers.discard(subscriber)
+
+        if not subscribers:
+            del self.subscribers[channel]
+
+    def _receive(self, channel: str, event: bytes) -> None:
+        # Backends deliver events from their own threads.
+        self.loop.call_soon_threadsafe(self._dispatch, channel, event)
+
+    def _dispatch(self, channel: str, event: bytes) -> None:
+        subscribers = self.subscribers.get(channel)
+
+        if not subscribers:
+            return
+
+        message = EventMessage(channel, json.loads(event))
+
+        for subscriber in list(subscribers):
+            subscriber(message)
+
+
+class SubscriberQueue(asyncio.Queue):
+    """
+    Queues the events of a subscriber that is slower than its channel. Once full, the
+    oldest event is dropped, since events carry full documents and the newest event
+    supersedes the ones before it.
+    """
+
+    def __call__(self, message: EventMessage) -> None:
+        if self.full():
+            self.get_nowait()
+
+        self.put_nowait(message)
+
+
+@lru_cache(maxsize=None)
+def get_event_hub() -> EventHub:
+    return EventHub(get_event_backend())
+
+
+def format_server_sent_event(message: EventMessage) -> bytes:
+    server_sent_event = "event: {event}\ndata: {data}\n\n".format(
+        event=message.event_type, data=message.data
+    )
+
+    if message.event_id is not None:
+        server_sent_event = "id: {id}\n{server_sent_event}".format(
+            id=message.event_id, server_sent_event=server_sent_event
+        )
+
+    return server_sent_event.encode()
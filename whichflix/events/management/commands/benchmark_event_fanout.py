@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+from typing import List
+
+from django.core.management.base import BaseCommand
+
+from whichflix.events import constants, get_event_backend
+from whichflix.events.backends import EventBackend, QueuedEventBackend
+from whichflix.events.hub import EventHub, SubscriberQueue
+
+BENCHMARK_CHANNEL = "benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the latency from publishing an event to every subscriber receiving "
+        "it, through the configured event backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subscribers",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100, 1000],
+            help="Subscriber counts to benchmark.",
+        )
+        parser.add_argument(
+            "--events", type=int, default=100, help="Events to publish per run."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.01,
+            help="Seconds to wait between events.",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self._benchmark(options))
+
+    async def _benchmark(self, options: dict) -> None:
+        # One hub for every run, as in a serving process, so the backend listens once.
+        backend = get_event_backend()
+        hub = EventHub(backend)
+        self.stdout.write("subscribers      p50 ms      p95 ms      p99 ms")
+
+        for subscriber_count in options["subscribers"]:
+            latencies = await self._run(
+                backend, hub, subscriber_count, options["events"], options["interval"]
+            )
+            self.stdout.write(
+                "{:>11} {:>11.2f} {:>11.2f} {:>11.2f}".format(
+                    subscriber_count,
+                    get_percentile(latencies, 50),
+                    get_percentile(latencies, 95),
+                    get_percentile(latencies, 99),
+                )
+            )
+
+    async def _run(
+        self,
+        backend: EventBackend,
+        hub: EventHub,
+        subscriber_count: int,
+        event_count: int,
+        interval: float,
+    ) -> List[float]:
+        queues = [
+            SubscriberQueue(maxsize=constants.EVENT_SUBSCRIBER_QUEUE_SIZE)
+            for _ in range(subscriber_count)
+        ]
+        latencies: List[float] = []
+
+        for queue in queues:
+            hub.subscribe(BENCHMARK_CHANNEL, queue)
+
+        async def receive(queue: SubscriberQueue) -> None:
+            for _ in range(event_count):
+                message = await queue.get()
+                data = json.loads(message.data)
+                latencies.append((time.time() - data["published_at"]) * 1000)
+
+        # Give the backend time to subscribe before publishing.
+        await asyncio.sleep(0.5)
+        receivers = [asyncio.ensure_future(receive(queue)) for queue in queues]
+
+        for _ in range(event_count):
+            backend.publish(
+                BENCHMARK_CHANNEL, "benchmark", {"published_at": time.time()}
+            )
+
+            # Include the dispatcher's publish when requests only queue events.
+            if isinstance(backend, QueuedEventBackend):
+                backend.dispatch()
+
+            await asyncio.sleep(interval)
+
+        await asyncio.wait_for(asyncio.gather(*receivers), timeout=30)
+
+        for queue in queues:
+            hub.unsubscribe(BENCHMARK_CHANNEL, queue)
+
+        return latencies
+
+
+def get_percentile(values: List[float], percentile: int) -> float:
+    ordered_values = sorted(values)
+    index = round(percentile / 100 * (len(ordered_values) - 1))
+
+    return ordered_values[index]
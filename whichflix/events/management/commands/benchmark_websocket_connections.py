@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand
+
+from whichflix.events import get_event_backend
+from whichflix.events.backends import QueuedEventBackend
+from whichflix.events.hub import get_event_hub
+from whichflix.events.management.commands.benchmark_event_fanout import get_percentile
+from whichflix.events.websockets import ELECTION_CHANNEL, ElectionWebSocket
+
+
+class BenchmarkWebSocket(ElectionWebSocket):
+    # The benchmark elections do not exist, so membership is not checked.
+    async def _is_participating(self, election_id: str) -> bool:
+        return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the memory held by concurrent election WebSocket connections in one "
+        "worker, and the latency of delivering an event to all of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections",
+            type=int,
+            nargs="+",
+            default=[100, 1000, 10000],
+            help="Concurrent connection counts to benchmark.",
+        )
+        parser.add_argument(
+            "--subscriptions",
+            type=int,
+            default=5,
+            help="Elections followed by each connection.",
+        )
+        parser.add_argument(
+            "--events", type=int, default=20, help="Events to publish per run."
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self._benchmark(options))
+
+    async def _benchmark(self, options: dict) -> None:
+        self.stdout.write("connections  KiB/connection  p50 ms  p99 ms  all ms")
+
+        for connection_count in options["connections"]:
+            memory, latencies, fan_out_latencies = await self._run(
+                connection_count, options["subscriptions"], options["events"]
+            )
+            self.stdout.write(
+                "{:>11} {:>15.2f} {:>7.2f} {:>7.2f} {:>7.2f}".format(
+                    connection_count,
+                    memory / connection_count / 1024,
+                    get_percentile(latencies, 50),
+                    get_percentile(latencies, 99),
+                    get_percentile(fan_out_latencies, 50),
+                )
+            )
+
+    async def _run(
+        self, connection_count: int, subscription_count: int, event_count: int
+    ) -> Tuple[int, List[float], List[float]]:
+        backend = get_event_backend()
+        hub = get_event_hub()
+        channel = ELECTION_CHANNEL.format(election_id=0)
+        latencies: List[float] = []
+        delivered = asyncio.Event()
+
+        async def send(message: dict) -> None:
+            if message["type"] != "websocket.send":
+                return
+
+            data = json.loads(message["text"])["data"]
+            latencies.append((time.time() - data["published_at"]) * 1000)
+
+            if len(latencies) % connection_count == 0:
+                delivered.set()
+
+        tracemalloc.start()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        inboxes = []
+        connections = []
+
+        for _ in range(connection_count):
+            inbox: asyncio.Queue = asyncio.Queue()
+
+            for election_id in range(subscription_count):
+                inbox.put_nowait(
+                    {
+                        "type": "websocket.receive",
+                        "text": json.dumps(
+                            {"action": "subscribe", "election_id": election_id}
+                        ),
+                    }
+                )
+
+            inboxes.append(inbox)
+            connections.append(
+                asyncio.ensure_future(
+                    BenchmarkWebSocket(hub, send, "benchmark").serve(inbox.get)
+                )
+            )
+
+        while len(hub.subscribers.get(channel, ())) < connection_count:
+            await asyncio.sleep(0.01)
+
+        memory_after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Give the backend time to subscribe before publishing.
+        await asyncio.sleep(0.5)
+        fan_out_latencies = []
+
+        for _ in range(event_count):
+            delivered.clear()
+            published_at = time.time()
+            backend.publish(channel, "benchmark", {"published_at": published_at})
+
+            # Include the dispatcher's publish when requests only queue events.
+            if isinstance(backend, QueuedEventBackend):
+                backend.dispatch()
+
+            await asyncio.wait_for(delivered.wait(), timeout=30)
+            fan_out_latencies.append((time.time() - published_at) * 1000)
+
+        for inbox in inboxes:
+            inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+        await asyncio.gather(*connections)
+
+        return memory_after - memory_before, latencies, fan_out_latencies
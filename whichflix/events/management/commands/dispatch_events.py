@@ -0,0 +1,65 @@
+import logging
+import time
+
+import redis
+from django.core.management.base import BaseCommand, CommandError
+
+from whichflix.events import constants, get_event_backend
+from whichflix.events.backends import QueuedEventBackend
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Publish queued events in the order they were queued."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=constants.EVENT_DISPATCH_BATCH_SIZE,
+            help="Events to publish per round trip to Redis.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=constants.EVENT_DISPATCH_INTERVAL_IN_SECONDS,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Dispatch until the queue is empty."
+        )
+
+    def handle(self, *args, **options):
+        backend = get_event_backend()
+
+        if not isinstance(backend, QueuedEventBackend):
+            raise CommandError("The configured event backend does not queue events.")
+
+        dispatched = 0
+        retry_delay = options["interval"]
+
+        while True:
+            try:
+                count = backend.dispatch(options["batch_size"])
+            except redis.RedisError:
+                # Only one dispatcher runs, so waiting on the failed batch keeps every
+                # channel in order.
+                logger.exception("Failed to dispatch events, retrying.")
+                time.sleep(retry_delay)
+                retry_delay = min(
+                    retry_delay * 2, constants.EVENT_DISPATCH_MAX_RETRY_DELAY_IN_SECONDS
+                )
+                continue
+
+            dispatched += count
+            retry_delay = options["interval"]
+
+            if count:
+                continue
+
+            if options["once"]:
+                self.stdout.write("Dispatched {} events.".format(dispatched))
+                break
+
+            time.sleep(options["interval"])
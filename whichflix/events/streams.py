@@ -0,0 +1,208 @@
+import asyncio
+import json
+import re
+from typing import Callable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs
+
+from whichflix.events import constants
+from whichflix.events.hub import EventMessage, SubscriberQueue, get_event_hub
+from whichflix.events.websockets import (
+    get_device_token,
+    is_device_participating,
+    serve_election_websocket,
+)
+
+# Paths served as event streams, with the format of the channel each one follows.
+EVENT_STREAM_ROUTES: List[Tuple[Pattern, str]] = [
+    (
+        re.compile(r"^/v1/elections/(?P<election_id>[\w-]+)/events/$"),
+        "election-{election_id}",
+    ),
+    (re.compile(r"^/events/$"), "test"),
+]
+
+ELECTION_WEBSOCKET_PATH = "/v1/events/"
+
+EVENT_STREAM_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+class EventStreamRouter:
+    """
+    ASGI application that serves server-sent event streams and the election
+    WebSocket directly, and hands every other request to the wrapped application.
+    """
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "websocket":
+            if scope["path"] == ELECTION_WEBSOCKET_PATH:
+                await serve_election_websocket(scope, receive, send)
+            else:
+                await send({"type": "websocket.close"})
+
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, channel_format in EVENT_STREAM_ROUTES:
+                match = pattern.match(scope["path"])
+
+                if match:
+                    election_id = match.groupdict().get("election_id")
+                    error = None
+
+                    if election_id is not None:
+                        error = await get_election_stream_error(scope, election_id)
+
+                    if error is not None:
+                        await send_error(send, *error)
+                    else:
+                        channel = channel_format.format(**match.groupdict())
+                        await stream_events(scope, channel, receive, send)
+
+                    return
+
+        await self.application(scope, receive, send)
+
+
+async def get_election_stream_error(
+    scope: dict, election_id: str
+) -> Optional[Tuple[int, str]]:
+    """
+    Returns the status and message refusing an election stream to a device that does
+    not participate in the election, the same as the election WebSocket.
+    """
+    device_token = get_device_token(scope)
+
+    if device_token is None:
+        return 401, "Event streams must identify the device."
+
+    if not await is_device_participating(device_token, election_id):
+        return (
+            403,
+            "The device is not participating in election `{}`.".format(election_id),
+        )
+
+    return None
+
+
+async def send_error(send: Callable, status: int, error: str) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"access-control-allow-origin", b"*"),
+            ],
+        }
+    )
+    await send(
+        {"type": "http.response.body", "body": json.dumps({"error": error}).encode()}
+    )
+
+
+async def stream_events(
+    scope: dict, channel: str, receive: Callable, send: Callable
+) -> None:
+    hub = get_event_hub()
+    queue = SubscriberQueue(maxsize=constants.EVENT_SUBSCRIBER_QUEUE_SIZE)
+    # Subscribe before reading the history, so no event falls between the two.
+    hub.subscribe(channel, queue)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    last_event_id = get_last_event_id(scope)
+    last_sent_event_id = None
+
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": EVENT_STREAM_HEADERS,
+            }
+        )
+        await send({"type": "http.response.body", "body": b":\n\n", "more_body": True})
+
+        if last_event_id is not None:
+            history = await asyncio.get_event_loop().run_in_executor(
+                None, hub.backend.get_history, channel, last_event_id
+            )
+
+            for event in history:
+                message = EventMessage(channel, json.loads(event))
+                last_sent_event_id = message.event_id
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": message.server_sent_event,
+                        "more_body": True,
+                    }
+                )
+
+        while True:
+            next_message = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {next_message, disconnected},
+                timeout=constants.EVENT_STREAM_KEEPALIVE_IN_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if disconnected in done:
+                next_message.cancel()
+                break
+
+            if next_message in done:
+                message = next_message.result()
+
+                # Skip events already replayed from the history.
+                if is_event_sent(message, last_sent_event_id):
+                    continue
+
+                body = message.server_sent_event
+            else:
+                next_message.cancel()
+                body = b":\n\n"
+
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe(channel, queue)
+
+
+def is_event_sent(message: EventMessage, last_sent_event_id: Optional[int]) -> bool:
+    return (
+        message.event_id is not None
+        and last_sent_event_id is not None
+        and message.event_id <= last_sent_event_id
+    )
+
+
+def get_last_event_id(scope: dict) -> Optional[str]:
+    """
+    Returns the id of the last event a reconnecting client received, sent by
+    `EventSource` in the `Last-Event-ID` header, or in the `lastEventId` query
+    parameter by clients that cannot set headers.
+    """
+    for name, value in scope["headers"]:
+        if name == b"last-event-id":
+            return value.decode()
+
+    query = parse_qs(scope["query_string"].decode())
+
+    if "lastEventId" in query:
+        return query["lastEventId"][0]
+
+    return None
+
+
+async def _wait_for_disconnect(receive: Callable) -> None:
+    while True:
+        message = await receive()
+
+        if message["type"] == "http.disconnect":
+            return
@@ -0,0 +1,241 @@
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from whichflix.elections import manager as election_manager
+from whichflix.events import constants
+from whichflix.events.hub import EventHub, EventMessage, get_event_hub
+
+ELECTION_CHANNEL = "election-{election_id}"
+ELECTION_CHANNEL_PREFIX = ELECTION_CHANNEL.format(election_id="")
+
+# The event data is already serialized, so it is spliced in rather than re-encoded.
+WEBSOCKET_MESSAGE = (
+    '{{"election_id": {election_id}, "id": {id}, "event": {event}, "data": {data}}}'
+)
+
+
+class ElectionWebSocket:
+    """
+    A WebSocket over which a device follows the events of several elections it
+    participates in.
+
+    The connection holds a single buffer for all of its elections instead of a queue
+    per subscription. The buffer keeps only the latest unsent event of each election
+    and state key, so an idle subscription costs no more than its entry in the hub.
+    """
+
+    def __init__(self, hub: EventHub, send: Callable, device_token: str) -> None:
+        self.hub = hub
+        self.send = send
+        self.device_token = device_token
+        # Subscribed channels, with the id of the last event sent on each.
+        self.channels: Dict[str, Optional[int]] = {}
+        self.pending_messages: "OrderedDict[Tuple[str, str], EventMessage]" = (
+            OrderedDict()
+        )
+        self.has_pending_messages = asyncio.Event()
+
+    def __call__(self, message: EventMessage) -> None:
+        key = (message.channel, message.state_key)
+        pending_message = self.pending_messages.pop(key, None)
+
+        # History read after subscribing can be older than events already received.
+        if (
+            pending_message is not None
+            and pending_message.event_id is not None
+            and message.event_id is not None
+            and message.event_id < pending_message.event_id
+        ):
+            message = pending_message
+
+        self.pending_messages[key] = message
+        self.has_pending_messages.set()
+
+    async def serve(self, receive: Callable) -> None:
+        sender = asyncio.ensure_future(self._send_messages())
+
+        try:
+            while True:
+                message = await receive()
+
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                if message["type"] == "websocket.receive":
+                    await self._handle(message.get("text") or message.get("bytes"))
+        finally:
+            sender.cancel()
+
+            for channel in self.channels:
+                self.hub.unsubscribe(channel, self)
+
+    async def _handle(self, text: Optional[str]) -> None:
+        try:
+            request = json.loads(text)
+            action = request["action"]
+            election_id = str(request["election_id"])
+        except (TypeError, ValueError, KeyError):
+            await self._send_error(
+                "Messages must be JSON objects with an `action` and an `election_id`."
+            )
+            return
+
+        channel = ELECTION_CHANNEL.format(election_id=election_id)
+
+        if action == "subscribe":
+            await self._subscribe(election_id, channel, request.get("last_event_id"))
+        elif action == "unsubscribe":
+            self.channels.pop(channel, None)
+            self.hub.unsubscribe(channel, self)
+        else:
+            await self._send_error("Unknown action `{}`.".format(action))
+
+    async def _subscribe(
+        self, election_id: str, channel: str, last_event_id: Optional[str]
+    ) -> None:
+        if channel in self.channels:
+            return
+
+        if len(self.channels) >= constants.WEBSOCKET_MAX_SUBSCRIPTIONS:
+            await self._send_error(
+                "A connection can follow at most {} elections.".format(
+                    constants.WEBSOCKET_MAX_SUBSCRIPTIONS
+                )
+            )
+            return
+
+        if not await self._is_participating(election_id):
+            await self._send_error(
+                "The device is not participating in election `{}`.".format(election_id)
+            )
+            return
+
+        # The connection may have subscribed while the membership was checked.
+        if channel in self.channels:
+            return
+
+        # Subscribe before reading the history, so no event falls between the two.
+        self.channels[channel] = None
+        self.hub.subscribe(channel, self)
+
+        if last_event_id is None:
+            return
+
+        history = await asyncio.get_event_loop().run_in_executor(
+            None, self.hub.backend.get_history, channel, str(last_event_id)
+        )
+
+        for event in history:
+            self(EventMessage(channel, json.loads(event)))
+
+    async def _is_participating(self, election_id: str) -> bool:
+        return await is_device_participating(self.device_token, election_id)
+
+    async def _send_messages(self) -> None:
+        while True:
+            await self.has_pending_messages.wait()
+            self.has_pending_messages.clear()
+
+            while self.pending_messages:
+                _, message = self.pending_messages.popitem(last=False)
+
+                # Skip events of elections unsubscribed from, or already sent.
+                if message.channel not in self.channels:
+                    continue
+
+                last_sent_event_id = self.channels[message.channel]
+
+                if (
+                    message.event_id is not None
+                    and last_sent_event_id is not None
+                    and message.event_id <= last_sent_event_id
+                ):
+                    continue
+
+                if message.event_id is not None:
+                    self.channels[message.channel] = message.event_id
+
+                await self.send(
+                    {
+                        "type": "websocket.send",
+                        "text": format_websocket_message(message),
+                    }
+                )
+
+    async def _send_error(self, error: str) -> None:
+        await self.send(
+            {"type": "websocket.send", "text": json.dumps({"error": error})}
+        )
+
+
+async def serve_election_websocket(
+    scope: dict, receive: Callable, send: Callable
+) -> None:
+    message = await receive()
+
+    if message["type"] != "websocket.connect":
+        return
+
+    device_token = get_device_token(scope)
+
+    if device_token is None:
+        await send(
+            {"type": "websocket.close", "code": constants.WEBSOCKET_UNAUTHORIZED_CODE}
+        )
+        return
+
+    await send({"type": "websocket.accept"})
+    await ElectionWebSocket(get_event_hub(), send, device_token).serve(receive)
+
+
+async def is_device_participating(device_token: str, election_id: str) -> bool:
+    return await sync_to_async(_check_device_participation, thread_sensitive=True)(
+        device_token, election_id
+    )
+
+
+def _check_device_participation(device_token: str, election_id: str) -> bool:
+    # Long-lived connections never go through Django's request signals, so database
+    # connections past their `CONN_MAX_AGE` or broken by a restart are closed here,
+    # the way `channels.db.database_sync_to_async` does.
+    close_old_connections()
+
+    try:
+        return election_manager.is_device_participating_in_election(
+            device_token, election_id
+        )
+    finally:
+        close_old_connections()
+
+
+def get_device_token(scope: dict) -> Optional[str]:
+    """
+    Returns the device identifying the connection, sent in the `X-Device-ID` header,
+    or in the `deviceId` query parameter by browsers, which cannot set headers on a
+    WebSocket or an `EventSource`.
+    """
+    for name, value in scope["headers"]:
+        if name == b"x-device-id" and value:
+            return value.decode()
+
+    query = parse_qs(scope["query_string"].decode())
+
+    if "deviceId" in query:
+        return query["deviceId"][0]
+
+    return None
+
+
+def format_websocket_message(message: EventMessage) -> str:
+    return WEBSOCKET_MESSAGE.format(
+        election_id=json.dumps(message.channel[len(ELECTION_CHANNEL_PREFIX) :]),
+        id=json.dumps(message.event_id),
+        event=json.dumps(message.event_type),
+        data=message.data,
+    )
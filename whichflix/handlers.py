@@ -0,0 +1,101 @@
+import logging
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.asgi import ASGIHandler
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.wsgi import WSGIHandler
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class APIMiddlewareMixin:
+    """
+    Handler mixin that builds the middleware chain from `API_MIDDLEWARE` instead of
+    `MIDDLEWARE`, following `BaseHandler.load_middleware`, which only reads the latter.
+    """
+
+    def get_middleware(self) -> List[str]:
+        return settings.API_MIDDLEWARE
+
+    def load_middleware(self) -> None:
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        handler = convert_exception_to_response(self._get_response)
+
+        for middleware_path in reversed(self.get_middleware()):
+            middleware = import_string(middleware_path)
+
+            try:
+                middleware_instance = middleware(handler)
+            except MiddlewareNotUsed:
+                logger.debug("MiddlewareNotUsed: %r", middleware_path)
+                continue
+
+            if middleware_instance is None:
+                raise ImproperlyConfigured(
+                    "Middleware factory {} returned None.".format(middleware_path)
+                )
+
+            if hasattr(middleware_instance, "process_view"):
+                self._view_middleware.insert(0, middleware_instance.process_view)
+            if hasattr(middleware_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    middleware_instance.process_template_response
+                )
+            if hasattr(middleware_instance, "process_exception"):
+                self._exception_middleware.append(middleware_instance.process_exception)
+
+            handler = convert_exception_to_response(middleware_instance)
+
+        self._middleware_chain = handler
+
+
+class APIASGIHandler(APIMiddlewareMixin, ASGIHandler):
+    pass
+
+
+class APIWSGIHandler(APIMiddlewareMixin, WSGIHandler):
+    pass
+
+
+def is_api_path(path: str) -> bool:
+    return path.startswith(settings.API_PATH_PREFIX)
+
+
+class APIRouter:
+    """
+    ASGI application that serves requests under `API_PATH_PREFIX` with the API
+    middleware profile, and hands every other request to the wrapped application.
+    """
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+        self.api_application = APIASGIHandler()
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http" and is_api_path(scope["path"]):
+            await self.api_application(scope, receive, send)
+            return
+
+        await self.application(scope, receive, send)
+
+
+class WSGIAPIRouter:
+    """
+    WSGI counterpart of `APIRouter`.
+    """
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+        self.api_application = APIWSGIHandler()
+
+    def __call__(self, environ: dict, start_response: Callable):
+        if is_api_path(environ["PATH_INFO"]):
+            return self.api_application(environ, start_response)
+
+        return self.application(environ, start_response)
@@ -0,0 +1,82 @@
+import time
+from typing import List
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from whichflix.events.management.commands.benchmark_event_fanout import get_percentile
+from whichflix.handlers import APIMiddlewareMixin
+
+
+class ProfileHandler(APIMiddlewareMixin, BaseHandler):
+    def __init__(self, middleware: List[str]) -> None:
+        super().__init__()
+        self.middleware = middleware
+        self.load_middleware()
+
+    def get_middleware(self) -> List[str]:
+        return self.middleware
+
+
+class Command(BaseCommand):
+    help = "Compare the per-request overhead of the full and API middleware profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=5000, help="Requests per profile."
+        )
+        parser.add_argument(
+            "--path",
+            default="/v1/movies/search/?query=ab",
+            help="API path to request. The default answers without Redis or TMDB.",
+        )
+
+    def handle(self, *args, **options):
+        request_factory = RequestFactory(SERVER_NAME=settings.ALLOWED_HOSTS[-1])
+        profiles = [
+            ("none", []),
+            ("full", settings.MIDDLEWARE),
+            ("api", settings.API_MIDDLEWARE),
+        ]
+        baseline = None
+
+        self.stdout.write("profile  middleware  p50 us  p99 us  overhead us")
+
+        for name, middleware in profiles:
+            handler = ProfileHandler(middleware)
+            latencies = self._run(handler, request_factory, options)
+            median = get_percentile(latencies, 50)
+            baseline = median if baseline is None else baseline
+
+            self.stdout.write(
+                "{:<8} {:>10} {:>7.0f} {:>7.0f} {:>12.0f}".format(
+                    name,
+                    len(middleware),
+                    median,
+                    get_percentile(latencies, 99),
+                    median - baseline,
+                )
+            )
+
+    def _run(
+        self, handler: BaseHandler, request_factory: RequestFactory, options: dict
+    ) -> List[float]:
+        # Warm up, so that URL resolution and imports are not measured.
+        handler.get_response(request_factory.get(options["path"]))
+
+        latencies: List[float] = []
+
+        for _ in range(options["requests"]):
+            request = request_factory.get(options["path"])
+            started_at = time.perf_counter()
+            response = handler.get_response(request)
+            latencies.append((time.perf_counter() - started_at) * 1000000)
+
+            if response.status_code != 200:
+                raise RuntimeError(
+                    "{} returned {}.".format(options["path"], response.status_code)
+                )
+
+        return latencies
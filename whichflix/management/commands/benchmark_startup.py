@@ -0,0 +1,117 @@
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand
+
+from whichflix.events.management.commands.benchmark_event_fanout import get_percentile
+
+# Run by each booted worker: loads the ASGI application the way daphne does, then
+# reports its resident memory in bytes. Reads /proc, so it needs Linux, like our dynos.
+BOOT_SCRIPT = """
+import json
+import os
+
+import whichflix.asgi
+
+if {first_request}:
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+with open("/proc/self/statm") as statm:
+    resident_pages = int(statm.read().split()[1])
+
+print(json.dumps({{"rss": resident_pages * os.sysconf("SC_PAGE_SIZE")}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure how long a web worker takes to boot and how much memory it holds."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=10, help="Workers to boot, one at a time."
+        )
+        parser.add_argument(
+            "--first-request",
+            action="store_true",
+            help="Also load the URLconf and views, as the first request does.",
+        )
+        parser.add_argument(
+            "--profile-imports",
+            type=int,
+            default=0,
+            metavar="COUNT",
+            help="Print the COUNT packages that take longest to import.",
+        )
+
+    def handle(self, *args, **options):
+        script = BOOT_SCRIPT.format(first_request=options["first_request"])
+        boot_times: List[float] = []
+        resident_sizes: List[float] = []
+
+        for _ in range(options["runs"]):
+            boot_time, resident_size, _ = boot_worker(script)
+            boot_times.append(boot_time)
+            resident_sizes.append(resident_size)
+
+        self.stdout.write(
+            "boot p50 {:.0f} ms, p99 {:.0f} ms; resident memory p50 {:.1f} MiB".format(
+                get_percentile(boot_times, 50),
+                get_percentile(boot_times, 99),
+                get_percentile(resident_sizes, 50),
+            )
+        )
+
+        if options["profile_imports"]:
+            _, _, import_times = boot_worker(script, profile_imports=True)
+            self.stdout.write("package{:>29}".format("import ms"))
+
+            for package, duration in import_times.most_common(
+                options["profile_imports"]
+            ):
+                self.stdout.write("{:<28} {:>8.1f}".format(package, duration))
+
+
+def boot_worker(
+    script: str, profile_imports: bool = False
+) -> Tuple[float, float, Counter]:
+    """
+    Boots a worker in a fresh interpreter. Returns its boot time in milliseconds, its
+    resident memory in MiB and, when profiled, the milliseconds spent importing
+    each top-level package.
+    """
+    command = [sys.executable]
+
+    if profile_imports:
+        command += ["-X", "importtime"]
+
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        command + ["-c", script], capture_output=True, check=True, text=True
+    )
+    boot_time = (time.perf_counter() - started_at) * 1000
+    resident_size = json.loads(result.stdout.splitlines()[-1])["rss"] / 1024 / 1024
+
+    return boot_time, resident_size, parse_import_times(result.stderr)
+
+
+def parse_import_times(output: str) -> Counter:
+    """
+    Sums the self time reported by `python -X importtime` by top-level package, so that
+    each module is counted once however deeply it was imported.
+    """
+    import_times: Counter = Counter()
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, _, module = line[len("import time:") :].split("|")
+        import_times[module.strip().split(".")[0]] += int(self_time) / 1000
+
+    return import_times
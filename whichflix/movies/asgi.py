@@ -0,0 +1,92 @@
+import asyncio
+import json
+import logging
+from typing import Callable
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+from whichflix.compression import compressed_content_cache, get_accepted_encoding
+from whichflix.movies import async_manager, builders, constants, errors
+
+logger = logging.getLogger(__name__)
+
+MOVIES_SEARCH_PATH = "/v1/movies/search/"
+
+JSON_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+class AsyncMoviesRouter:
+    """
+    ASGI application that serves movie search on the event loop, so requests waiting
+    on TMDB do not hold a thread, and hands every other request to the wrapped
+    application.
+    """
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] == MOVIES_SEARCH_PATH
+        ):
+            await search_movies(scope, send)
+            return
+
+        await self.application(scope, receive, send)
+
+
+async def search_movies(scope: dict, send: Callable) -> None:
+    """
+    Search for movies by genre name or movie title, as `MoviesSearchView` does.
+    """
+    query = parse_qs(scope["query_string"].decode()).get("query", [""])[0]
+
+    if len(query) < constants.MOVIE_QUERY_MINIMUM_LENGTH:
+        await _send_json(scope, send, {"results": []})
+        return
+
+    try:
+        tmdb_movies, tmdb_configuration = await asyncio.gather(
+            async_manager.search_movies(query), async_manager.get_tmdb_configuration()
+        )
+    except errors.TMDBUnavailableError as e:
+        # Logged so the outage is reported, since Django's error handling is bypassed.
+        logger.exception("Failed to search movies for `%s`.", query)
+        await _send_json(scope, send, {"error": e.message}, status=503)
+        return
+
+    response_body = {
+        "results": [
+            builders.build_movie_document(tmdb_movie, tmdb_configuration)
+            for tmdb_movie in tmdb_movies
+        ]
+    }
+
+    await _send_json(scope, send, response_body)
+
+
+async def _send_json(
+    scope: dict, send: Callable, body: dict, status: int = 200
+) -> None:
+    content = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+    headers = list(JSON_HEADERS)
+
+    # Compressed as `CompressionMiddleware` would, since these responses bypass Django.
+    if len(content) >= settings.COMPRESSION_MIN_SIZE_IN_BYTES:
+        headers.append((b"vary", b"Accept-Encoding"))
+        encoding = get_accepted_encoding(
+            dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin1")
+        )
+
+        if encoding is not None:
+            content = compressed_content_cache.compress(content, encoding)
+            headers.append((b"content-encoding", encoding.encode()))
+
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": content})
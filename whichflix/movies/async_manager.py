@@ -0,0 +1,56 @@
+import asyncio
+import functools
+from typing import Any, Callable, List, Optional
+
+from whichflix.movies import errors, manager
+from whichflix.movies.models import TMDBMovie
+from whichflix.movies.tmdb_client import get_async_tmdb_client
+
+
+async def search_movies(query: str) -> List[TMDBMovie]:
+    response = await _get_from_tmdb("/search/movie", {"query": query})
+    tmdb_movies = [
+        TMDBMovie.from_tmdb_movie_result(result) for result in response["results"]
+    ]
+
+    return tmdb_movies
+
+
+async def get_tmdb_configuration() -> dict:
+    response = await _run_in_executor(manager.get_cached_configuration)
+
+    if response is not None:
+        # Cache hit.
+        return response
+
+    # Cache miss.
+    response = await _get_from_tmdb("/configuration")
+
+    # Insert the configuration response into the cache.
+    await _run_in_executor(manager.cache_configuration, response)
+
+    return response
+
+
+async def _get_from_tmdb(path: str, params: Optional[dict] = None) -> dict:
+    """
+    Fetch a TMDB resource. Raises `TMDBUnavailableError` when TMDB cannot answer.
+    """
+    # Imported on first use, like the client itself.
+    from httpx import HTTPError
+
+    try:
+        response = await get_async_tmdb_client().get(path, params=params)
+        response.raise_for_status()
+    except HTTPError as e:
+        raise errors.TMDBUnavailableError from e
+
+    return response.json()
+
+
+async def _run_in_executor(function: Callable, *args: Any) -> Any:
+    # redis-py 3.5 has no asyncio client, so the synchronous one runs in the default
+    # executor. Its round trips are short enough to serve every request this way.
+    return await asyncio.get_event_loop().run_in_executor(
+        None, functools.partial(function, *args)
+    )
@@ -5,6 +5,19 @@
 MOVIE_QUERY_MINIMUM_LENGTH = 3
 
 
+#
+# The Movie Database
+#
+
+
+TMDB_CACHE_TTL_IN_SECONDS = 60 * 60 * 24
+TMDB_MAX_CONCURRENT_REQUESTS = 8
+
+# Connections to TMDB shared by the requests served on one event loop.
+TMDB_MAX_ASYNC_CONNECTIONS = 100
+TMDB_TIMEOUT_IN_SECONDS = 10.0
+
+
 GENRE_ID_TO_NAME = {
     12: "Adventure",
     14: "Fantasy",
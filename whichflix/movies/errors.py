@@ -1,2 +1,6 @@
 class TMDBMovieDoesNotExistError(Exception):
     message = "Movie does not exist in The Movie Database."
+
+
+class TMDBUnavailableError(Exception):
+    message = "The Movie Database could not be reached."
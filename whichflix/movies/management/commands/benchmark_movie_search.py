@@ -0,0 +1,181 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand
+
+from whichflix.events.management.commands.benchmark_event_fanout import get_percentile
+from whichflix.movies import tmdb_client
+from whichflix.movies.asgi import AsyncMoviesRouter
+
+STAND_IN_SEARCH_RESPONSE = {
+    "page": 1,
+    "results": [
+        {
+            "id": 603,
+            "title": "The Matrix",
+            "overview": "Set in the 22nd century, The Matrix tells the story of a computer hacker.",
+            "release_date": "1999-03-30",
+            "poster_path": "/f89U3ADr1oiB1s9GkdPOEpXUk5H.jpg",
+            "genre_ids": [28, 878],
+        }
+    ]
+    * 20,
+}
+
+STAND_IN_CONFIGURATION_RESPONSE = {
+    "images": {
+        "secure_base_url": "https://image.tmdb.org/t/p/",
+        "poster_sizes": ["w92", "w154", "w185", "w342", "w500", "w780", "original"],
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many concurrent movie searches one worker serves on the event "
+        "loop, against a local TMDB stand-in that answers after a fixed latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100, 500],
+            help="Concurrent searches to benchmark.",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=10,
+            help="Searches made by each concurrent client.",
+        )
+        parser.add_argument(
+            "--tmdb-latency",
+            type=float,
+            default=0.1,
+            help="Seconds the TMDB stand-in takes to answer.",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self._benchmark(options))
+
+    async def _benchmark(self, options: dict) -> None:
+        # The stand-in runs in its own process, so it does not compete with the
+        # benchmarked worker for the event loop.
+        ports: multiprocessing.Queue = multiprocessing.Queue()
+        stand_in = multiprocessing.Process(
+            target=run_tmdb_stand_in, args=(ports, options["tmdb_latency"]), daemon=True
+        )
+        stand_in.start()
+
+        # Point the TMDB client at the stand-in before it is first created.
+        tmdb_client.TMDB_API_BASE_URL = "http://127.0.0.1:{}/3".format(ports.get())
+        tmdb_client.get_async_tmdb_client.cache_clear()
+
+        application = AsyncMoviesRouter(self._fail)
+        self.stdout.write("concurrency  searches/s   p50 ms   p99 ms")
+
+        for concurrency in options["concurrency"]:
+            duration, latencies = await self._run(
+                application, concurrency, concurrency * options["rounds"]
+            )
+            self.stdout.write(
+                "{:>11} {:>11.1f} {:>8.1f} {:>8.1f}".format(
+                    concurrency,
+                    len(latencies) / duration,
+                    get_percentile(latencies, 50),
+                    get_percentile(latencies, 99),
+                )
+            )
+
+        await tmdb_client.get_async_tmdb_client().aclose()
+        stand_in.terminate()
+
+    async def _run(
+        self, application: AsyncMoviesRouter, concurrency: int, request_count: int
+    ) -> Tuple[float, List[float]]:
+        latencies: List[float] = []
+        remaining = iter(range(request_count))
+
+        async def search() -> None:
+            for _ in remaining:
+                started_at = time.perf_counter()
+                await self._search(application)
+                latencies.append((time.perf_counter() - started_at) * 1000)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*[search() for _ in range(concurrency)])
+
+        return time.perf_counter() - started_at, latencies
+
+    async def _search(self, application: AsyncMoviesRouter) -> None:
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/v1/movies/search/",
+            "query_string": b"query=The+Matrix",
+            "headers": [],
+        }
+        messages = []
+
+        async def receive() -> dict:
+            return {"type": "http.request"}
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+
+        await application(scope, receive, send)
+
+        if messages[0]["status"] != 200:
+            raise RuntimeError("The search failed.")
+
+    async def _fail(self, scope, receive, send):
+        raise AssertionError("Only movie search is benchmarked.")
+
+
+def run_tmdb_stand_in(ports: multiprocessing.Queue, latency: float) -> None:
+    async def serve() -> None:
+        server = await asyncio.start_server(
+            lambda reader, writer: serve_tmdb_connection(reader, writer, latency),
+            "127.0.0.1",
+            0,
+        )
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+async def serve_tmdb_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float
+) -> None:
+    while True:
+        request_line = await reader.readline()
+
+        if not request_line:
+            break
+
+        # Skip the headers.
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+
+        await asyncio.sleep(latency)
+
+        path = request_line.split()[1].decode()
+
+        if path.startswith("/3/configuration"):
+            body = json.dumps(STAND_IN_CONFIGURATION_RESPONSE).encode()
+        else:
+            body = json.dumps(STAND_IN_SEARCH_RESPONSE).encode()
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+
+    writer.close()
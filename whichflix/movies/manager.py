@@ -1,19 +1,58 @@
 import json
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-import requests
-
-from whichflix.clients import redis_client
+from whichflix.clients import get_many, redis_client, set_many
 from whichflix.movies import builders, constants, errors
 from whichflix.movies.models import TMDBMovie
-from whichflix.movies.tmdb_client import tmdb
+from whichflix.movies.tmdb_client import get_tmdb
+from whichflix.utils import parse_integer
 
 
 def get_movie_document(movie_id: str) -> dict:
-    tmdb_movie = get_tmdb_movie_by_id(movie_id)
-    tmdb_configuration = get_tmdb_configuration()
+    return get_movie_documents([movie_id])[movie_id]
+
+
+def get_movie_documents(movie_ids: List[str]) -> Dict[str, dict]:
+    """
+    Build the documents for several movies. The cached movies and the TMDB
+    configuration are read in a single round trip, and cache misses are fetched from
+    TMDB concurrently.
+    """
+    if not movie_ids:
+        return {}
+
+    tmdb_movie_ids = list(dict.fromkeys(movie_ids))
+    configuration_string, *movie_info_strings = get_many(
+        redis_client,
+        [constants.TMDB_CONFIGURATION_KEY]
+        + [
+            constants.TMDB_MOVIE_INFO_KEY.format(movie_id=tmdb_movie_id)
+            for tmdb_movie_id in tmdb_movie_ids
+        ],
+    )
+    cached_movie_infos = {
+        tmdb_movie_id: json.loads(movie_info_string)
+        for tmdb_movie_id, movie_info_string in zip(tmdb_movie_ids, movie_info_strings)
+        if movie_info_string
+    }
+    movie_infos = _get_movie_infos(tmdb_movie_ids, cached_movie_infos)
+
+    if len(movie_infos) != len(tmdb_movie_ids):
+        raise errors.TMDBMovieDoesNotExistError
+
+    tmdb_configuration = (
+        json.loads(configuration_string)
+        if configuration_string
+        else get_tmdb_configuration()
+    )
 
-    return builders.build_movie_document(tmdb_movie, tmdb_configuration)
+    return {
+        tmdb_movie_id: builders.build_movie_document(
+            TMDBMovie.from_tmdb_movie_info(movie_info), tmdb_configuration
+        )
+        for tmdb_movie_id, movie_info in movie_infos.items()
+    }
 
 
 def get_tmdb_movie_by_id(tmdb_movie_id: str) -> TMDBMovie:
@@ -24,24 +63,109 @@ def get_tmdb_movie_by_id(tmdb_movie_id: str) -> TMDBMovie:
         return TMDBMovie.from_tmdb_movie_info(movie_info)
 
     # Cache miss.
-    movie_request = tmdb.Movies(int(tmdb_movie_id))
+    movie_info = _fetch_movie_info(tmdb_movie_id)
 
-    try:
-        movie_info = movie_request.info()
-    except requests.exceptions.HTTPError:
+    if movie_info is None:
         raise errors.TMDBMovieDoesNotExistError
 
     # Insert the movie info response into the cache.
-    twenty_four_hours_in_seconds = 60 * 60 * 24
     redis_client.set(
         constants.TMDB_MOVIE_INFO_KEY.format(movie_id=tmdb_movie_id),
         json.dumps(movie_info),
-        ex=twenty_four_hours_in_seconds,
+        ex=constants.TMDB_CACHE_TTL_IN_SECONDS,
     )
 
     return TMDBMovie.from_tmdb_movie_info(movie_info)
 
 
+def get_tmdb_movies_by_ids(tmdb_movie_ids: List[str]) -> Dict[str, TMDBMovie]:
+    """
+    Resolve several movies at once. Cached movies are read in a single round trip and
+    cache misses are fetched from TMDB concurrently. Movies that do not exist are
+    omitted from the result.
+    """
+    movie_infos = _get_movie_infos(
+        tmdb_movie_ids, _get_cached_movie_infos(tmdb_movie_ids)
+    )
+
+    return {
+        tmdb_movie_id: TMDBMovie.from_tmdb_movie_info(movie_info)
+        for tmdb_movie_id, movie_info in movie_infos.items()
+    }
+
+
+def _get_movie_infos(
+    tmdb_movie_ids: List[str], cached_movie_infos: Dict[str, dict]
+) -> Dict[str, dict]:
+    """
+    Complete the cached movie infos with those fetched from TMDB, which are cached in
+    turn. Movies that do not exist are omitted.
+    """
+    movie_infos = dict(cached_movie_infos)
+    missing_movie_ids = [
+        tmdb_movie_id
+        for tmdb_movie_id in tmdb_movie_ids
+        if tmdb_movie_id not in movie_infos
+    ]
+
+    if not missing_movie_ids:
+        return movie_infos
+
+    max_workers = min(len(missing_movie_ids), constants.TMDB_MAX_CONCURRENT_REQUESTS)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched_movie_infos = {
+            tmdb_movie_id: movie_info
+            for tmdb_movie_id, movie_info in zip(
+                missing_movie_ids, executor.map(_fetch_movie_info, missing_movie_ids)
+            )
+            if movie_info is not None
+        }
+
+    movie_infos.update(fetched_movie_infos)
+
+    # Insert the movie info responses into the cache.
+    set_many(
+        redis_client,
+        {
+            constants.TMDB_MOVIE_INFO_KEY.format(movie_id=tmdb_movie_id): json.dumps(
+                movie_info
+            )
+            for tmdb_movie_id, movie_info in fetched_movie_infos.items()
+        },
+        ex=constants.TMDB_CACHE_TTL_IN_SECONDS,
+    )
+
+    return movie_infos
+
+
+def _fetch_movie_info(tmdb_movie_id: str) -> Optional[dict]:
+    """
+    Fetch a movie from TMDB, or None if it does not exist. Raises
+    `TMDBUnavailableError` when TMDB cannot answer, so that an outage is not mistaken
+    for a missing movie.
+    """
+    movie_id = parse_integer(tmdb_movie_id)
+
+    if movie_id is None:
+        return None
+
+    # Imported on first use, like `tmdbsimple`, which depends on it.
+    from requests.exceptions import HTTPError, RequestException
+
+    movie_request = get_tmdb().Movies(movie_id)
+
+    try:
+        return movie_request.info()
+    except HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+
+        raise errors.TMDBUnavailableError from e
+    except RequestException as e:
+        raise errors.TMDBUnavailableError from e
+
+
 def _get_cached_movie_info(tmdb_movie_id: str) -> Optional[dict]:
     key = constants.TMDB_MOVIE_INFO_KEY.format(movie_id=tmdb_movie_id)
     response_string = redis_client.get(key)
@@ -49,8 +173,25 @@ def _get_cached_movie_info(tmdb_movie_id: str) -> Optional[dict]:
     return json.loads(response_string) if response_string else None
 
 
+def _get_cached_movie_infos(tmdb_movie_ids: List[str]) -> Dict[str, dict]:
+    if not tmdb_movie_ids:
+        return {}
+
+    keys = [
+        constants.TMDB_MOVIE_INFO_KEY.format(movie_id=tmdb_movie_id)
+        for tmdb_movie_id in tmdb_movie_ids
+    ]
+    response_strings = get_many(redis_client, keys)
+
+    return {
+        tmdb_movie_id: json.loads(response_string)
+        for tmdb_movie_id, response_string in zip(tmdb_movie_ids, response_strings)
+        if response_string
+    }
+
+
 def search_movies(query: str) -> List[TMDBMovie]:
-    search = tmdb.Search()
+    search = get_tmdb().Search()
     response = search.movie(query=query)
     tmdb_movies = [
         TMDBMovie.from_tmdb_movie_result(result) for result in response["results"]
@@ -60,28 +201,31 @@ def search_movies(query: str) -> List[TMDBMovie]:
 
 
 def get_tmdb_configuration() -> dict:
-    response = _get_cached_configuration()
+    response = get_cached_configuration()
 
     if response is not None:
         # Cache hit.
         return response
 
     # Cache miss.
-    config = tmdb.Configuration()
+    config = get_tmdb().Configuration()
     response = config.info()
 
     # Insert the configuration response into the cache.
-    twenty_four_hours_in_seconds = 60 * 60 * 24
-    redis_client.set(
-        constants.TMDB_CONFIGURATION_KEY,
-        json.dumps(response),
-        ex=twenty_four_hours_in_seconds,
-    )
+    cache_configuration(response)
 
     return response
 
 
-def _get_cached_configuration() -> Optional[dict]:
+def get_cached_configuration() -> Optional[dict]:
     response_string = redis_client.get(constants.TMDB_CONFIGURATION_KEY)
 
     return json.loads(response_string) if response_string else None
+
+
+def cache_configuration(response: dict) -> None:
+    redis_client.set(
+        constants.TMDB_CONFIGURATION_KEY,
+        json.dumps(response),
+        ex=constants.TMDB_CACHE_TTL_IN_SECONDS,
+    )
@@ -71,3 +71,16 @@ SEARCH_MOVIES_RESPONSE_BODY = openapi.Schema(
         )
     },
 )
+
+
+#
+# Operations
+#
+
+
+# `swagger_auto_schema` overrides of the views, applied by `swagger_operation`.
+SEARCH_MOVIES_OPERATION = {
+    "operation_id": "Search Movies",
+    "manual_parameters": [SEARCH_QUERY_PARAMETER],
+    "responses": {200: SEARCH_MOVIES_RESPONSE_BODY},
+}
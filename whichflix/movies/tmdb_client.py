@@ -1,5 +1,42 @@
 import os
+from functools import lru_cache
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-import tmdbsimple as tmdb
+from whichflix.movies import constants
 
-tmdb.API_KEY = os.getenv("TMDB_API_KEY")
+if TYPE_CHECKING:
+    import httpx
+
+TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+
+TMDB_API_BASE_URL = os.getenv("TMDB_API_BASE_URL") or "https://api.themoviedb.org/3"
+
+
+@lru_cache(maxsize=None)
+def get_tmdb() -> ModuleType:
+    """
+    Returns `tmdbsimple`, configured with our API key. It and `requests` are imported
+    on first use rather than when a worker boots.
+    """
+    import tmdbsimple
+
+    tmdbsimple.API_KEY = TMDB_API_KEY
+
+    return tmdbsimple
+
+
+@lru_cache(maxsize=None)
+def get_async_tmdb_client() -> "httpx.AsyncClient":
+    """
+    Returns the client for requests to TMDB made from the event loop. Its connections
+    are kept alive and shared by every request the process serves.
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        base_url=TMDB_API_BASE_URL,
+        params={"api_key": TMDB_API_KEY},
+        limits=httpx.Limits(max_connections=constants.TMDB_MAX_ASYNC_CONNECTIONS),
+        timeout=constants.TMDB_TIMEOUT_IN_SECONDS,
+    )
@@ -1,18 +1,14 @@
 from django.http import HttpRequest
-from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from whichflix.movies import builders, constants, manager, schemas
+from whichflix.movies import builders, constants, manager
+from whichflix.openapi.utils import swagger_operation
 
 
 class MoviesSearchView(APIView):
-    @swagger_auto_schema(
-        operation_id="Search Movies",
-        manual_parameters=[schemas.SEARCH_QUERY_PARAMETER],
-        responses={200: schemas.SEARCH_MOVIES_RESPONSE_BODY},
-    )
+    @swagger_operation("whichflix.movies.schemas.SEARCH_MOVIES_OPERATION")
     def get(self, request: HttpRequest) -> Response:
         """
         Search for movies by genre name or movie title.
@@ -0,0 +1,162 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+from functools import lru_cache
+from typing import Callable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from whichflix.compression import PrecompressedContent
+from whichflix.openapi import constants
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaArtifact(NamedTuple):
+    document: PrecompressedContent
+    content_hash: str
+
+    def get_etag(self, encoding: Optional[str]) -> str:
+        """
+        Strong ETag of the representation sent with `encoding`. Each encoding has its
+        own, since the bytes differ.
+        """
+        if encoding is None:
+            return '"{}"'.format(self.content_hash)
+
+        return '"{}-{}"'.format(self.content_hash, encoding)
+
+
+def get_urlconf_fingerprint(urlconf: Optional[str] = None) -> str:
+    """
+    Hash of every route in the URLconf and the view serving it, and of the source of
+    the modules the schema is generated from: those of the views, with their docstrings
+    and `swagger_auto_schema` overrides, and the `schemas` module of their apps.
+    """
+    digest = hashlib.sha256()
+    view_modules: Set[str] = set()
+
+    for route, callback in iter_routes(get_resolver(urlconf).url_patterns):
+        digest.update(
+            "{} {}.{}\n".format(
+                route, callback.__module__, callback.__qualname__
+            ).encode()
+        )
+        view_modules.add(callback.__module__)
+
+    for path in get_schema_source_paths(view_modules):
+        with open(path, "rb") as source_file:
+            digest.update(source_file.read())
+
+    return digest.hexdigest()
+
+
+def iter_routes(patterns: list, prefix: str = "") -> Iterator[Tuple[str, Callable]]:
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            callback = getattr(pattern.callback, "view_class", pattern.callback)
+            yield "{} {}".format(route, pattern.name), callback
+
+
+def get_schema_source_paths(view_modules: Set[str]) -> List[str]:
+    """
+    Source files of the view modules and of the `schemas` module next to each of them.
+    """
+    paths = set()
+
+    for module_name in view_modules:
+        paths.add(sys.modules[module_name].__file__)
+        package_name = module_name.rpartition(".")[0]
+        spec = (
+            importlib.util.find_spec(package_name + ".schemas")
+            if package_name
+            else None
+        )
+
+        if spec is not None and spec.origin:
+            paths.add(spec.origin)
+
+    return sorted(path for path in paths if path and path.endswith(".py"))
+
+
+def build_schema(urlconf: Optional[str] = None) -> bytes:
+    """
+    Introspects every view in the URLconf and renders the resulting schema as JSON.
+    """
+    # drf_yasg and its codecs pull in DRF serializers, YAML and validation libraries
+    # that only schema builds need.
+    from drf_yasg.app_settings import swagger_settings
+    from drf_yasg.codecs import OpenAPICodecJson
+
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(
+        info=swagger_settings.DEFAULT_INFO, url="", urlconf=urlconf
+    )
+    schema = generator.get_schema(request=None, public=True)
+    schema[constants.URLCONF_FINGERPRINT_KEY] = get_urlconf_fingerprint(urlconf)
+
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def build_schema_artifact(content: bytes) -> SchemaArtifact:
+    return SchemaArtifact(
+        document=PrecompressedContent(content),
+        content_hash=hashlib.sha256(content).hexdigest()[:32],
+    )
+
+
+def read_schema(path: str) -> Optional[bytes]:
+    """
+    The schema stored at `path`, unless it is missing or was built from a different
+    URLconf than the one currently loaded.
+    """
+    try:
+        with open(path, "rb") as schema_file:
+            content = schema_file.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        fingerprint = json.loads(content).get(constants.URLCONF_FINGERPRINT_KEY)
+    except ValueError:
+        return None
+
+    return content if fingerprint == get_urlconf_fingerprint() else None
+
+
+def write_schema(path: str, content: bytes) -> None:
+    # Written to a temporary file first so that concurrent readers never see a
+    # partially written schema.
+    temporary_path = "{}.{}.tmp".format(path, os.getpid())
+
+    with open(temporary_path, "wb") as schema_file:
+        schema_file.write(content)
+
+    os.replace(temporary_path, path)
+
+
+@lru_cache(maxsize=None)
+def get_schema_artifact() -> SchemaArtifact:
+    """
+    The schema built by `build_openapi_schema`, regenerated and stored when the URLconf
+    has changed since it was built. Loaded once per process.
+    """
+    path = settings.OPENAPI_SCHEMA_PATH
+    content = read_schema(path)
+
+    if content is None:
+        content = build_schema()
+
+        try:
+            write_schema(path, content)
+        except OSError:
+            logger.warning("Could not store the OpenAPI schema at %s.", path)
+
+    return build_schema_artifact(content)
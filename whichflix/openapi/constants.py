@@ -0,0 +1,3 @@
+# Vendor extension on the root of the schema recording the URLconf and
+# schema sources it was built from.
+URLCONF_FINGERPRINT_KEY = "x-urlconf-fingerprint"
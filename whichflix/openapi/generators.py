@@ -0,0 +1,20 @@
+import copy
+
+from django.utils.module_loading import import_string
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+
+class SwaggerOperationSchemaGenerator(OpenAPISchemaGenerator):
+    """
+    Also applies the overrides attached to view methods by `swagger_operation`.
+    """
+
+    def get_overrides(self, view, method):
+        overrides = super().get_overrides(view, method)
+        action_method = getattr(view, getattr(view, "action", method.lower()), None)
+        operation_path = getattr(action_method, "swagger_operation", None)
+
+        if operation_path:
+            overrides.update(copy.deepcopy(import_string(operation_path)))
+
+        return overrides
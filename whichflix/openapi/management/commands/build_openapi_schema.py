@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from whichflix.openapi.artifact import build_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema served by `openapi/`."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.OPENAPI_SCHEMA_PATH,
+            help="Path to write the schema to.",
+        )
+
+    def handle(self, *args, **options):
+        content = build_schema()
+        write_schema(options["output"], content)
+
+        self.stdout.write(
+            "Wrote {} bytes to {}.".format(len(content), options["output"])
+        )
@@ -0,0 +1,8 @@
+from drf_yasg import openapi
+
+# https://drf-yasg.readthedocs.io/en/latest/readme.html#quickstart
+API_INFO = openapi.Info(
+    title="WhichFlix",
+    description="The premier app for choosing a movie to watch!",
+    default_version="1.0.0",
+)
@@ -0,0 +1,30 @@
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views import View
+
+from whichflix.compression import get_accepted_encoding
+from whichflix.openapi.artifact import get_schema_artifact
+
+
+class OpenAPISchemaView(View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Serve the prebuilt OpenAPI schema, compressed when the client accepts it.
+        """
+        artifact = get_schema_artifact()
+        encoding = get_accepted_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        etag = artifact.get_etag(encoding)
+
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponseNotModified()
+            patch_vary_headers(response, ("Accept-Encoding",))
+        else:
+            response = artifact.document.build_response(
+                request, content_type="application/json"
+            )
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+
+        return response
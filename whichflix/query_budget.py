@@ -0,0 +1,118 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# Collapses "IN (%s, %s, %s)" style placeholder lists so that queries differing only
+# in the number of parameters share a shape.
+PLACEHOLDER_LIST_PATTERN = re.compile(r"%s(\s*,\s*%s)+")
+
+
+class QueryBudgetExceededError(Exception):
+    message = "The request exceeded its query budget."
+
+
+class QueryRecorder:
+    """
+    Execute wrapper that records the shape and duration of every query run while it is
+    installed on a connection.
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[Tuple[str, float]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((get_query_shape(sql), time.monotonic() - start))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for _, duration in self.queries)
+
+    def get_repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        shape_counts = Counter(shape for shape, _ in self.queries)
+
+        return {
+            shape: count for shape, count in shape_counts.items() if count >= threshold
+        }
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts and times the queries issued by each request, flags repeated query shapes
+    (the signature of N+1 access patterns) and enforces the per-view budgets from
+    `QUERY_BUDGETS`. `QUERY_BUDGET_MODE` selects whether violations are logged,
+    reported in response headers, or raised.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        recorder = QueryRecorder()
+
+        # Elections are sharded across databases, so every connection is recorded.
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+
+            response = self.get_response(request)
+
+        view_name = request.resolver_match.url_name if request.resolver_match else None
+        budget = get_query_budget(view_name)
+        repeated_shapes = recorder.get_repeated_shapes(
+            settings.QUERY_BUDGET_REPEATED_SHAPE_THRESHOLD
+        )
+        is_over_budget = budget is not None and recorder.count > budget
+        mode = settings.QUERY_BUDGET_MODE
+
+        if mode == "header":
+            response["X-Query-Count"] = str(recorder.count)
+            response["X-Query-Duration-Ms"] = "{:.2f}".format(recorder.duration * 1000)
+            response["X-Query-Repeated-Shapes"] = str(len(repeated_shapes))
+
+        if repeated_shapes:
+            logger.warning(
+                "Repeated query shapes in %s: %s", view_name, repeated_shapes
+            )
+
+        if is_over_budget:
+            logger.warning(
+                "%s issued %d queries, over its budget of %d.",
+                view_name,
+                recorder.count,
+                budget,
+            )
+
+            if mode == "raise":
+                raise QueryBudgetExceededError(
+                    "{view} issued {count} queries, over its budget of {budget}.".format(
+                        view=view_name, count=recorder.count, budget=budget
+                    )
+                )
+
+        return response
+
+
+def get_query_shape(sql: str) -> str:
+    return PLACEHOLDER_LIST_PATTERN.sub("%s", sql)
+
+
+def get_query_budget(view_name: Optional[str]) -> Optional[int]:
+    return settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
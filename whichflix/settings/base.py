@@ -10,8 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 import os
-from typing import List
-from urllib.parse import quote
+from typing import Dict, List
 
 from corsheaders.defaults import default_headers
 
@@ -42,16 +41,18 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "drf_yasg",
     "corsheaders",
-    "django_eventstream",
     # Local Apps
+    "whichflix",
     "whichflix.users",
     "whichflix.elections",
+    "whichflix.events",
     "whichflix.movies",
+    "whichflix.openapi",
 ]
 
 MIDDLEWARE = [
-    "django_grip.GripMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whichflix.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -59,6 +60,26 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "whichflix.query_budget.QueryBudgetMiddleware",
+]
+
+# Smaller responses are not compressed, since the savings would not cover the cost of
+# compressing them.
+COMPRESSION_MIN_SIZE_IN_BYTES = 1024
+# Compressed responses kept per process, so identical responses are compressed once.
+COMPRESSION_CACHE_SIZE = 256
+
+# Requests under the API prefix are served by a handler of their own with a leaner
+# middleware profile (see `whichflix.handlers`). Devices identify themselves with
+# X-Device-ID, so the API has no use for sessions, messages, CSRF protection or the
+# clickjacking header, which only the admin needs.
+API_PATH_PREFIX = "/v1/"
+API_MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "whichflix.compression.CompressionMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "whichflix.query_budget.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "whichflix.urls"
@@ -108,10 +129,67 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
-    }
+    },
+    # A second local database, so sharding can be exercised without extra setup.
+    "election_shard_1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db_election_shard_1.sqlite3"),
+    },
+}
+
+DATABASE_ROUTERS = ["whichflix.elections.routers.ElectionShardRouter"]
+
+
+#
+# Election shards
+#
+
+
+# Elections, and their participants, candidates and votes, are hash-sharded by election
+# id into logical shards. This assigns logical shards to database aliases explicitly,
+# so adding a database moves no elections until logical shards are assigned to it.
+# Unassigned logical shards, devices and the index of the elections each device
+# participates in stay on the default database.
+ELECTION_LOGICAL_SHARD_MAP: Dict[int, str] = {}
+
+
+#
+# Query budgets
+#
+
+
+# Maximum number of queries per request, keyed by URL name. Violations are logged,
+# reported in `X-Query-*` response headers, or raised depending on the mode. Each
+# budget covers the worst path of its view, measured by `test_query_budgets`: an
+# election on another database than the devices, with every kind of vote change, and
+# listing elections spread over two databases. Listing elections costs more with each
+# election database beyond two.
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE") or "log"
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGET_REPEATED_SHAPE_THRESHOLD = 3
+QUERY_BUDGETS = {
+    "bulk_candidates": 11,
+    "candidates": 12,
+    "elections": 9,
+    "election_close": 9,
+    "election_detail": 9,
+    "election_votes": 15,
+    "participants": 14,
+    "votes": 9,
+    "movies_search": 0,
 }
 
 
+#
+# Vote buffer
+#
+
+
+# When enabled, votes are recorded in Redis and written to the database in batches by
+# the `flush_vote_buffer` worker, for elections that receive bursts of votes.
+VOTE_BUFFER_ENABLED = os.getenv("VOTE_BUFFER_ENABLED") == "true"
+
+
 #
 # django-rest-framework settings
 #
@@ -130,10 +208,18 @@ REST_FRAMEWORK = {
 
 
 SWAGGER_SETTINGS = {
-    "DEFAULT_INFO": "whichflix.urls.api_info",
+    "DEFAULT_GENERATOR_CLASS": (
+        "whichflix.openapi.generators.SwaggerOperationSchemaGenerator"
+    ),
+    "DEFAULT_INFO": "whichflix.openapi.schemas.API_INFO",
     "SECURITY_DEFINITIONS": {},
 }
 
+# Schema artifact written by `build_openapi_schema` and served by `openapi/`.
+OPENAPI_SCHEMA_PATH = os.getenv("OPENAPI_SCHEMA_PATH") or os.path.join(
+    BASE_DIR, "openapi.json"
+)
+
 
 #
 # Redis
@@ -142,6 +228,38 @@ SWAGGER_SETTINGS = {
 
 REDIS_URL = os.getenv("REDIS_URL")
 
+# Connections each process may hold for commands. Requests wait up to the pool timeout
+# for a free connection once they are all in use.
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS") or 50)
+REDIS_POOL_TIMEOUT_IN_SECONDS = 2.0
+REDIS_CONNECT_TIMEOUT_IN_SECONDS = 1.0
+REDIS_SOCKET_TIMEOUT_IN_SECONDS = 2.0
+
+# Connections idle for longer than this are checked with a PING before they are reused.
+REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS = 30
+
+# Commands slower than this are logged.
+REDIS_SLOW_COMMAND_THRESHOLD_IN_MS = 50
+
+# Each process logs the count, mean and maximum latency of its Redis commands with the
+# first command run after this long.
+REDIS_LATENCY_REPORT_INTERVAL_IN_SECONDS = 60
+
+
+#
+# Logging
+#
+
+
+# Without handlers of their own, the app's info logs, such as the Redis latency
+# reports, would be dropped.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"whichflix": {"handlers": ["console"], "level": "INFO"}},
+}
+
 #
 # django-cors-headers
 #
@@ -151,11 +269,14 @@ CORS_ALLOW_HEADERS = list(default_headers) + ["X-Device-ID"]
 
 
 #
-# django-eventstream
+# Events
 #
 
-FANOUT_REALM_ID = "7437f653"
-FANOUT_REALM_KEY = os.getenv("FANOUT_REALM_KEY") or "dGVzdA=="
-GRIP_URL = "https://api.fanout.io/realm/{realm_id}?iss={realm_id}&key=base64:{key}".format(
-    realm_id=FANOUT_REALM_ID, key=quote(FANOUT_REALM_KEY)
+EVENT_BACKEND = (
+    os.getenv("EVENT_BACKEND") or "whichflix.events.backends.QueuedEventBackend"
+)
+
+# Bursts of events for an election within the window collapse into the latest event.
+EVENT_COALESCING_WINDOW_IN_SECONDS = float(
+    os.getenv("EVENT_COALESCING_WINDOW_IN_SECONDS") or 0.2
 )
@@ -1,6 +1,10 @@
 import dj_database_url
 
 from whichflix.settings.base import *  # noqa
+from whichflix.settings.shards import (
+    get_election_logical_shard_map,
+    get_election_shard_databases,
+)
 
 #
 # django settings
@@ -9,4 +13,14 @@ from whichflix.settings.base import *  # noqa
 DEBUG = True
 
 db_from_environment = dj_database_url.config()
-DATABASES = {"default": db_from_environment}
+DATABASES = {"default": db_from_environment, **get_election_shard_databases()}
+
+# Without configured shards, a second database on the same server lets the tests
+# exercise sharding. No logical shards are assigned to it.
+if len(DATABASES) == 1 and db_from_environment:
+    DATABASES["election_shard_1"] = {
+        **db_from_environment,
+        "NAME": "{}_election_shard_1".format(db_from_environment["NAME"]),
+    }
+
+ELECTION_LOGICAL_SHARD_MAP = get_election_logical_shard_map()
@@ -3,6 +3,10 @@ import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
 from whichflix.settings.base import *  # noqa
+from whichflix.settings.shards import (
+    get_election_logical_shard_map,
+    get_election_shard_databases,
+)
 
 #
 # django settings
@@ -11,7 +15,9 @@ from whichflix.settings.base import *  # noqa
 ADMINS = [("Alex", "alex.kurihara@gmail.com")]
 
 db_from_environment = dj_database_url.config()
-DATABASES = {"default": db_from_environment}
+DATABASES = {"default": db_from_environment, **get_election_shard_databases()}
+
+ELECTION_LOGICAL_SHARD_MAP = get_election_logical_shard_map()
 
 
 #
@@ -0,0 +1,35 @@
+import os
+from typing import Dict
+
+import dj_database_url
+
+
+def get_election_shard_databases() -> Dict[str, dict]:
+    """
+    Database settings for the election shards in `ELECTION_SHARD_DATABASE_URLS`, as
+    space-separated database URLs, keyed by alias.
+    """
+    return {
+        "election_shard_{}".format(shard_index): dj_database_url.parse(shard_url)
+        for shard_index, shard_url in enumerate(
+            os.getenv("ELECTION_SHARD_DATABASE_URLS", "").split(), start=1
+        )
+    }
+
+
+def get_election_logical_shard_map() -> Dict[int, str]:
+    """
+    Logical shards assigned to other databases than the default one in
+    `ELECTION_LOGICAL_SHARDS`, as space-separated `<alias>:<first>-<last>` ranges,
+    e.g. `election_shard_1:32-63`.
+    """
+    logical_shard_map = {}
+
+    for assignment in os.getenv("ELECTION_LOGICAL_SHARDS", "").split():
+        alias, logical_shards = assignment.split(":")
+        first, _, last = logical_shards.partition("-")
+
+        for logical_shard in range(int(first), int(last or first) + 1):
+            logical_shard_map[logical_shard] = alias
+
+    return logical_shard_map
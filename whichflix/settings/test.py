@@ -0,0 +1,16 @@
+from whichflix.settings.local import *  # noqa
+
+#
+# Events
+#
+
+# Events are delivered within the test process, so the tests do not need Redis.
+EVENT_BACKEND = "whichflix.events.backends.LocalEventBackend"
+
+
+#
+# Query budgets
+#
+
+# Requests over their query budget fail the tests that make them.
+QUERY_BUDGET_MODE = "raise"
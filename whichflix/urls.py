@@ -1,30 +1,21 @@
-import django_eventstream
-from django.conf.urls import include
 from django.contrib import admin
 from django.http import JsonResponse
 from django.urls import path
 from django.views.generic import TemplateView
-from django_eventstream import send_event
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
 
 from whichflix.elections.views import (
+    BulkCandidatesView,
     CandidatesView,
     ElectionsView,
+    ElectionCloseView,
     ElectionDetailView,
+    ElectionVotesView,
     ParticipantsView,
     VotesView,
 )
+from whichflix.events import send_event
 from whichflix.movies.views import MoviesSearchView
-
-# https://drf-yasg.readthedocs.io/en/latest/readme.html#quickstart
-api_info = openapi.Info(
-    title="WhichFlix",
-    description="The premier app for choosing a movie to watch!",
-    default_version="1.0.0",
-)
-schema_view = get_schema_view(public=True, permission_classes=(permissions.AllowAny,))
+from whichflix.openapi.views import OpenAPISchemaView
 
 
 def trigger_error(request):
@@ -49,11 +40,26 @@ urlpatterns = [
         ElectionDetailView.as_view(),
         name="election_detail",
     ),
+    path(
+        "v1/elections/<slug:election_id>/candidates/bulk/",
+        BulkCandidatesView.as_view(),
+        name="bulk_candidates",
+    ),
+    path(
+        "v1/elections/<slug:election_id>/close/",
+        ElectionCloseView.as_view(),
+        name="election_close",
+    ),
     path(
         "v1/elections/<slug:election_id>/candidates/",
         CandidatesView.as_view(),
         name="candidates",
     ),
+    path(
+        "v1/elections/<slug:election_id>/votes/",
+        ElectionVotesView.as_view(),
+        name="election_votes",
+    ),
     path(
         "v1/elections/<slug:election_id>/participants/",
         ParticipantsView.as_view(),
@@ -61,16 +67,10 @@ urlpatterns = [
     ),
     # Movies
     path("v1/movies/search/", MoviesSearchView.as_view(), name="movies_search"),
-    # django-eventstream
-    path(
-        "v1/elections/<slug:election_id>/events/",
-        include(django_eventstream.urls),
-        {"format-channels": ["election-{election_id}"]},
-    ),
-    path("events/", include(django_eventstream.urls), {"channels": ["test"]}),
+    # Events, streamed by `whichflix.events.streams.EventStreamRouter`
     path("events-debug/", send_test_event),  # TODO: remove eventually
-    # Open API schema
-    path("openapi/", schema_view.without_ui(cache_timeout=0), name="openapi_schema"),
+    # Open API schema, prebuilt by the `build_openapi_schema` command
+    path("openapi/", OpenAPISchemaView.as_view(), name="openapi_schema"),
     path(
         "redoc/",
         TemplateView.as_view(
@@ -1,16 +1,19 @@
 from whichflix.users.models import Device
 
 
-def get_or_create_device(device_token: str) -> Device:
-    try:
-        device = Device.objects.get(device_token=device_token)
-    except Device.DoesNotExist:
-        device = _create_device(device_token)
-
-    return device
+# Resolves the device in a single round trip. The no-op update on conflict makes
+# Postgres return the existing row, so concurrent registrations of the same token
+# never race on the unique constraint.
+_UPSERT_DEVICE_SQL = """
+    INSERT INTO users_device (device_token)
+    VALUES (%s)
+    ON CONFLICT (device_token) DO UPDATE
+        SET device_token = EXCLUDED.device_token
+    RETURNING *
+"""
 
 
-def _create_device(device_token: str) -> Device:
-    device = Device.objects.create(device_token=device_token)
+def get_or_create_device(device_token: str) -> Device:
+    device = list(Device.objects.raw(_UPSERT_DEVICE_SQL, [device_token]))[0]
 
     return device
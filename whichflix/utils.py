@@ -1,5 +1,12 @@
+import re
+from typing import Optional
+
 from hashids import Hashids
 
+# ASCII digits only. `str.isdigit` also accepts characters such as "²", which `int`
+# then rejects.
+INTEGER_PATTERN = re.compile(r"[0-9]+")
+
 
 hashids = Hashids(
     alphabet="abcdefghijklmnopqrstuvwxyz1234567890",
@@ -10,3 +17,15 @@ hashids = Hashids(
 
 def generate_external_id(internal_id):
     return hashids.encode(internal_id)
+
+
+def decode_external_id(external_id):
+    # Hashids only accepts the canonical encoding of a single ID, so malformed or
+    # tampered values are rejected here without touching the database.
+    internal_ids = hashids.decode(external_id)
+
+    return internal_ids[0] if len(internal_ids) == 1 else None
+
+
+def parse_integer(value: str) -> Optional[int]:
+    return int(value) if INTEGER_PATTERN.fullmatch(value) else None
@@ -2,6 +2,7 @@
 WSGI config for whichflix project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+Requests to the API are handled with a leaner middleware profile.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/wsgi/
@@ -13,4 +14,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "whichflix.settings.production")
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+from whichflix.handlers import WSGIAPIRouter  # noqa: E402
+
+application = WSGIAPIRouter(django_application)